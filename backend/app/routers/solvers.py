@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 from typing import List, Dict, Optional, Any
 import logging
 import time
@@ -10,6 +10,8 @@ import time
 # this module via the package path.
 from backend.app.solvers.graph_solver import SolverRequest as GraphSolverRequest, solve_floor_plan as graph_solve
 from backend.app.solvers.constraint_solver import SolverRequest as ConstraintSolverRequest, solve_floor_plan as constraint_solve
+from backend.app.solvers.feasibility import FEASIBILITY_POLICIES
+from backend.app.solvers.warm_start import DEFAULT_IMPACT_RADIUS
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -37,6 +39,19 @@ class GenerationRequest(BaseModel):
     outdoorFixtures: Optional[List[str]] = None
     solver_type: str = "graph"  # "graph" or "constraint"
     seed: Optional[int] = None
+    deadline_ms: Optional[int] = Field(None, gt=0)  # Solver time budget; best layout so far is returned
+    feasibility: str = "shrink"  # Pre-solve check: report, shrink (rooms to minimum size), pack (to MAX_FILL) or ignore
+    # Edited layout: re-optimize only around the change (rooms as previously returned)
+    priorLayout: Optional[List[Dict[str, Any]]] = None
+    lockedRoomIds: Optional[List[str]] = None
+    changedRoomIds: Optional[List[str]] = None
+    impactRadius: float = Field(DEFAULT_IMPACT_RADIUS, ge=0)
+
+    @validator('feasibility')
+    def validate_feasibility(cls, v: str) -> str:
+        if v not in FEASIBILITY_POLICIES:
+            raise ValueError(f"feasibility must be one of {FEASIBILITY_POLICIES}, got {v!r}")
+        return v
 
 class GenerationResponse(BaseModel):
     rooms: List[Room]
@@ -45,6 +60,8 @@ class GenerationResponse(BaseModel):
     score: Optional[float] = None
     solver_type: Optional[str] = None
     warnings: Optional[List[str]] = None
+    stopped_reason: Optional[str] = None
+    feasibility: Optional[Dict[str, Any]] = None
 
 @router.post("/generate", response_model=GenerationResponse)
 async def generate_floor_plan(request: GenerationRequest):
@@ -73,6 +90,12 @@ async def generate_floor_plan(request: GenerationRequest):
                 outdoor_fixtures=request.outdoorFixtures or (request.constraints or {}).get("outdoor_fixtures"),
                 constraints=request.constraints,
                 seed=request.seed,
+                deadline_ms=request.deadline_ms,
+                feasibility=request.feasibility,
+                prior_layout=request.priorLayout,
+                locked_room_ids=request.lockedRoomIds,
+                changed_room_ids=request.changedRoomIds,
+                impact_radius=request.impactRadius,
             )
             logger.info("[generate] invoking graph solver")
             result = graph_solve(solver_req)
@@ -88,6 +111,12 @@ async def generate_floor_plan(request: GenerationRequest):
                 outdoor_fixtures=request.outdoorFixtures or (request.constraints or {}).get("outdoor_fixtures"),
                 constraints=request.constraints,
                 seed=request.seed,
+                deadline_ms=request.deadline_ms,
+                feasibility=request.feasibility,
+                prior_layout=request.priorLayout,
+                locked_room_ids=request.lockedRoomIds,
+                changed_room_ids=request.changedRoomIds,
+                impact_radius=request.impactRadius,
             )
             logger.info("[generate] invoking constraint solver")
             result = constraint_solve(solver_req)
@@ -109,13 +138,16 @@ async def generate_floor_plan(request: GenerationRequest):
             for r in result.rooms
         ]
 
+        infeasible = getattr(result, "stopped_reason", None) == "infeasible"
         resp = GenerationResponse(
             rooms=rooms,
-            success=True,
-            message="Floor plan generated successfully",
+            success=not infeasible,
+            message="Requested rooms cannot fit the plot" if infeasible else "Floor plan generated successfully",
             score=getattr(result, "score", None),
             solver_type=getattr(result, "solver_type", None),
             warnings=getattr(result, "warnings", []),
+            stopped_reason=getattr(result, "stopped_reason", None),
+            feasibility=getattr(result, "feasibility", None),
         )
         logger.info(
             "[generate] success: rooms=%d, time=%.2fs, score=%s, solver=%s",
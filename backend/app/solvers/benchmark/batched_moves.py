@@ -0,0 +1,66 @@
+"""
+Micro-benchmark of constraint-solver move evaluation: candidate moves scored
+per second with one-at-a-time incremental updates vs batched scoring
+(IncrementalMetrics.score_moves), at 10, 30 and 60 rooms.
+"""
+import sys
+import time
+import logging
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent))
+
+from backend.app.solvers.constraint_solver import EnhancedConstraintSolver, IncrementalMetrics
+
+ROOM_TYPES = ["living", "kitchen", "master_bedroom", "bedroom", "bathroom", "dining", "pooja_room", "study", "entrance", "store"]
+ROOM_COUNTS = [10, 30, 60]
+BATCH_SIZES = [16, 64]
+DURATION = 0.5  # Seconds per measurement
+
+
+def _setup(n, batch_size):
+    rooms = [{"id": f"r{i}", "name": f"Room {i}", "type": ROOM_TYPES[i % len(ROOM_TYPES)]} for i in range(n)]
+    side = 6.0 * n ** 0.5
+    solver = EnhancedConstraintSolver(plot_width=side, plot_length=side, seed=0, batch_size=batch_size)
+    state = solver._initial_state(rooms)
+    return solver, state, IncrementalMetrics(solver, state)
+
+
+def single_rate(n):
+    """Candidates per second: apply one translation, update, revert"""
+    solver, state, scorer = _setup(n, 1)
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        changed = solver._try_translation(state, 1.0)
+        scorer.update(state, changed)
+        state.undo()
+        scorer.revert()
+        count += 1
+    return count / (time.perf_counter() - start)
+
+
+def batched_rate(n, batch_size):
+    """Candidates per second: propose and score batch_size translations in one pass"""
+    solver, state, scorer = _setup(n, batch_size)
+    count, start = 0, time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        rooms, x, y, width, height = solver._propose_batch(state, "translate", 1.0)
+        scorer.score_moves(state, rooms, x, y, width, height)
+        count += len(rooms)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    logging.disable(logging.INFO)
+    header = " ".join(f"{f'K={k} /s':>12} {'speedup':>8}" for k in BATCH_SIZES)
+    print(f"{'rooms':>6} {'single /s':>12} {header}")
+    for n in ROOM_COUNTS:
+        single = single_rate(n)
+        cols = []
+        for k in BATCH_SIZES:
+            rate = batched_rate(n, k)
+            cols.append(f"{rate:>12.0f} {rate / single:>7.1f}x")
+        print(f"{n:>6} {single:>12.0f} {' '.join(cols)}")
+
+
+if __name__ == "__main__":
+    main()
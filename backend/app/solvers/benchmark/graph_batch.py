@@ -0,0 +1,53 @@
+"""
+Graph solver batch mode: B seeds in one (B, N, 2) simulation vs B solves.
+
+For each plot and batch size, reports the wall time of B sequential
+solve_floor_plan calls (seeds 0..B-1), the time of one batched call with
+batch_size=B (which returns the same B layouts, ranked), the speedup, and the
+score of the single seed-0 layout vs the best of the batch.
+"""
+import sys
+import time
+import logging
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent))
+
+from backend.app.solvers.graph_solver import SolverRequest, solve_floor_plan
+
+ROOM_TYPES = ["living", "kitchen", "master_bedroom", "bedroom", "bedroom", "bathroom",
+              "bathroom", "dining", "pooja_room", "entrance", "study", "toilet"]
+L_SHAPE = [[0, 0], [24, 0], [24, 10], [12, 10], [12, 24], [0, 24]]
+CASES = [
+    ("rect-6", 6, 20.0, 18.0, "rectangular", None),
+    ("rect-12", 12, 24.0, 24.0, "rectangular", None),
+    ("rect-25", 25, 34.0, 34.0, "rectangular", None),
+    ("triangle-5", 5, 24.0, 20.0, "triangular", None),
+    ("circle-6", 6, 24.0, 24.0, "circular", None),
+    ("L-6", 6, 24.0, 24.0, "irregular", {"plot_polygon": L_SHAPE}),
+]
+BATCH_SIZES = [4, 16]
+
+
+def _request(n, width, length, shape, constraints, **kwargs):
+    rooms = [{"id": f"r{i}", "name": f"Room {i}", "type": ROOM_TYPES[i % len(ROOM_TYPES)]} for i in range(n)]
+    return SolverRequest(rooms=rooms, plot_width=width, plot_length=length, plot_shape=shape,
+                         constraints=constraints, feasibility="ignore", **kwargs)
+
+
+def main():
+    logging.disable(logging.WARNING)
+    print(f"{'case':>11} {'B':>3} {'seq ms':>8} {'batch ms':>9} {'speedup':>8} {'seed 0':>7} {'best':>7}")
+    for name, *case in CASES:
+        for batch in BATCH_SIZES:
+            start = time.perf_counter()
+            single = [solve_floor_plan(_request(*case, seed=seed)) for seed in range(batch)]
+            sequential = time.perf_counter() - start
+            start = time.perf_counter()
+            best = solve_floor_plan(_request(*case, seed=0, batch_size=batch))
+            batched = time.perf_counter() - start
+            print(f"{name:>11} {batch:>3} {sequential * 1000:>8.1f} {batched * 1000:>9.1f} "
+                  f"{sequential / batched:>7.2f}x {single[0].score:>7.2f} {best.score:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
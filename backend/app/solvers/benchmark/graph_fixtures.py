@@ -0,0 +1,50 @@
+"""
+Graph solver two-phase cost: indoor placement vs outdoor-fixture placement.
+
+Phase 2 simulates only the fixtures; the phase-1 indoor rooms stay fixed and
+act on them as static repulsors (a prebuilt grid above grid_threshold rooms).
+For growing houses with the same 4 fixtures, reports the wall time of each
+phase's simulation: phase 2 should stay nearly flat while phase 1 grows.
+"""
+import sys
+import time
+import logging
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent))
+
+from backend.app.solvers.graph_solver import GraphBasedLayoutSolver, SolverRequest
+
+ROOM_TYPES = ["living", "kitchen", "master_bedroom", "bedroom", "bedroom", "bathroom",
+              "bathroom", "dining", "pooja_room", "entrance", "study", "toilet"]
+FIXTURES = ["garden", "car_parking", "water_tank", "swimming_pool"]
+CASES = [(20, 30.0), (60, 50.0), (140, 75.0), (300, 110.0)]
+
+
+class TimedSolver(GraphBasedLayoutSolver):
+    """Records the wall time of every simulation run (phase 1, phase 2)"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.phase_seconds = []
+
+    def _run_simulation(self, G):
+        start = time.perf_counter()
+        result = super()._run_simulation(G)
+        self.phase_seconds.append(time.perf_counter() - start)
+        return result
+
+
+def main():
+    logging.disable(logging.WARNING)
+    print(f"{'indoor':>7} {'fixtures':>9} {'phase 1 ms':>11} {'phase 2 ms':>11}")
+    for n, side in CASES:
+        rooms = [{"id": f"r{i}", "name": f"Room {i}", "type": ROOM_TYPES[i % len(ROOM_TYPES)]} for i in range(n)]
+        rooms += [{"id": f"o{k}", "name": fixture, "type": fixture} for k, fixture in enumerate(FIXTURES)]
+        solver = TimedSolver(plot_width=side, plot_length=side, seed=0, feasibility="ignore")
+        solver.solve(SolverRequest(rooms=rooms, plot_width=side, plot_length=side, seed=0, feasibility="ignore"))
+        phase1, phase2 = solver.phase_seconds
+        print(f"{n:>7} {len(FIXTURES):>9} {phase1 * 1000:>11.1f} {phase2 * 1000:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
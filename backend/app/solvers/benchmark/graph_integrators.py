@@ -0,0 +1,62 @@
+"""
+Graph solver integrators: steps to converge per PhysicsParams.integrator.
+
+Runs every integrator (damped Euler, FIRE, velocity Verlet) on rectangular,
+triangular, circular and L-shaped plots over several seeds with a raised
+iteration cap, and reports mean steps to reach convergence_threshold, how many
+runs converged, mean final score and mean wall time.
+"""
+import sys
+import time
+import logging
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent))
+
+import numpy as np
+
+from backend.app.solvers.graph_solver import INTEGRATORS, GraphBasedLayoutSolver, SolverRequest
+
+ROOM_TYPES = ["living", "kitchen", "master_bedroom", "bedroom", "bedroom", "bathroom",
+              "bathroom", "dining", "pooja_room", "entrance", "study", "toilet"]
+L_SHAPE = [[0, 0], [24, 0], [24, 10], [12, 10], [12, 24], [0, 24]]
+CASES = [
+    ("rect-6", 6, 20.0, 18.0, "rectangular", None),
+    ("rect-12", 12, 24.0, 24.0, "rectangular", None),
+    ("rect-25", 25, 34.0, 34.0, "rectangular", None),
+    ("triangle-5", 5, 24.0, 20.0, "triangular", None),
+    ("circle-6", 6, 24.0, 24.0, "circular", None),
+    ("L-6", 6, 24.0, 24.0, "irregular", {"plot_polygon": L_SHAPE}),
+]
+SEEDS = range(8)
+MAX_ITERATIONS = 300
+
+
+def run_case(integrator, n, width, length, shape, constraints):
+    rooms = [{"id": f"r{i}", "name": f"Room {i}", "type": ROOM_TYPES[i % len(ROOM_TYPES)]} for i in range(n)]
+    steps, scores, converged, seconds = [], [], 0, 0.0
+    for seed in SEEDS:
+        solver = GraphBasedLayoutSolver(plot_width=width, plot_length=length, plot_shape=shape,
+                                        seed=seed, feasibility="ignore", integrator=integrator)
+        solver.params.max_iterations = MAX_ITERATIONS
+        start = time.perf_counter()
+        res = solver.solve(SolverRequest(rooms=rooms, plot_width=width, plot_length=length, plot_shape=shape,
+                                         constraints=constraints, seed=seed, feasibility="ignore"))
+        seconds += time.perf_counter() - start
+        steps.append(res.iterations)
+        scores.append(res.score)
+        converged += res.converged
+    return np.mean(steps), converged, np.mean(scores), seconds / len(SEEDS)
+
+
+def main():
+    logging.disable(logging.WARNING)
+    print(f"{'case':>11} {'integrator':>10} {'steps':>7} {'converged':>10} {'score':>7} {'ms':>7}")
+    for name, *case in CASES:
+        for integrator in INTEGRATORS:
+            steps, converged, score, seconds = run_case(integrator, *case)
+            print(f"{name:>11} {integrator:>10} {steps:>7.1f} {f'{converged}/{len(SEEDS)}':>10} "
+                  f"{score:>7.2f} {seconds * 1000:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Graph solver repulsion kernels: exact all-pairs vs grid near/far field.
+
+For 100, 200 and 300 rooms reports, per kernel, the time per force
+evaluation, the grid kernel's relative repulsion error against the exact one
+(on spread-out positions), and the final score, overlapping room pairs and
+wall time of a full solve (large programs often bottom out at score 0, so the
+overlap count is the finer comparison).
+"""
+import sys
+import time
+import logging
+from pathlib import Path
+sys.path.append(str(Path(__file__).parent.parent.parent.parent.parent))
+
+import numpy as np
+
+from backend.app.solvers.graph_solver import GraphBasedLayoutSolver, SolverRequest
+
+ROOM_TYPES = ["living", "kitchen", "master_bedroom", "bedroom", "bedroom", "bathroom",
+              "bathroom", "dining", "pooja_room", "entrance", "study", "toilet", "garden"]
+ROOM_COUNTS = [100, 200, 300]
+THETAS = [1.0, 0.5]
+REPEATS = 10
+
+
+def _setup(n, mode, theta=1.0):
+    rooms = [{"id": f"r{i}", "name": f"Room {i}", "type": ROOM_TYPES[i % len(ROOM_TYPES)]} for i in range(n)]
+    side = 8.0 * n ** 0.5
+    solver = GraphBasedLayoutSolver(plot_width=side, plot_length=side, seed=0, feasibility="ignore")
+    solver.params.repulsion = mode
+    solver.params.repulsion_theta = theta
+    G = solver._build_adjacency_graph(rooms)
+    solver._initialize_positions(rooms)
+    # Spread rooms over the plot so the far field matters
+    for room_id in solver.positions:
+        solver.positions[room_id] = solver.rng.uniform(0, side, 2)
+    solver._pack_state(G)
+    return solver, rooms, side
+
+
+def _repulsion(solver):
+    if solver.use_grid:
+        return solver._calculate_grid_repulsive_forces()
+    delta = solver.pos[:, None, :, :] - solver.pos[:, :, None, :]
+    distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+    return solver._calculate_repulsive_forces(delta, distance)
+
+
+def _step_ms(solver):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        solver._calculate_all_forces()
+    return (time.perf_counter() - start) / REPEATS * 1000
+
+
+def _solve(rooms, side, mode, theta=1.0):
+    solver = GraphBasedLayoutSolver(plot_width=side, plot_length=side, seed=0, feasibility="ignore")
+    solver.params.repulsion = mode
+    solver.params.repulsion_theta = theta
+    start = time.perf_counter()
+    res = solver.solve(SolverRequest(rooms=rooms, plot_width=side, plot_length=side, seed=0, feasibility="ignore"))
+    seconds = time.perf_counter() - start
+    x, y = np.array([r.x for r in res.rooms]), np.array([r.y for r in res.rooms])
+    w, h = np.array([r.width for r in res.rooms]), np.array([r.height for r in res.rooms])
+    overlaps = ((x[:, None] < x[None, :] + w[None, :]) & (x[:, None] + w[:, None] > x[None, :]) &
+                (y[:, None] < y[None, :] + h[None, :]) & (y[:, None] + h[:, None] > y[None, :]))
+    return res.score, int(np.triu(overlaps, k=1).sum()), seconds
+
+
+def main():
+    logging.disable(logging.WARNING)
+    print(f"{'rooms':>6} {'kernel':>14} {'ms/step':>8} {'err med':>8} {'err p95':>8} {'score':>7} {'overlaps':>8} {'solve s':>8}")
+    for n in ROOM_COUNTS:
+        exact, rooms, side = _setup(n, "exact")
+        reference = _repulsion(exact)
+        ref_norm = np.linalg.norm(reference, axis=-1)
+        score, overlaps, seconds = _solve(rooms, side, "exact")
+        print(f"{n:>6} {'exact':>14} {_step_ms(exact):>8.2f} {'-':>8} {'-':>8} {score:>7.2f} {overlaps:>8} {seconds:>8.2f}")
+        for theta in THETAS:
+            grid, _, _ = _setup(n, "grid", theta)
+            err = np.linalg.norm(_repulsion(grid) - reference, axis=-1) / ref_norm
+            score, overlaps, seconds = _solve(rooms, side, "grid", theta)
+            print(f"{n:>6} {f'grid theta={theta}':>14} {_step_ms(grid):>8.2f} {np.median(err):>8.4f} "
+                  f"{np.percentile(err, 95):>8.4f} {score:>7.2f} {overlaps:>8} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -86,7 +86,8 @@ class BenchmarkRunner:
                 for run in range(runs_per_case):
                     try:
                         result = self._run_single_case(
-                            case, config, timeout_seconds)
+                            case, config, timeout_seconds,
+                            rng=np.random.default_rng(run))
                         results.append(result)
                         
                     except Exception as e:
@@ -99,7 +100,8 @@ class BenchmarkRunner:
     def _run_single_case(self,
                         case: BenchmarkCase,
                         solver_config: Dict,
-                        timeout_seconds: int) -> BenchmarkResult:
+                        timeout_seconds: int,
+                        rng: Optional[np.random.Generator] = None) -> BenchmarkResult:
         """Run single benchmark case with given solver config."""
         start_time = time.time()
         
@@ -113,7 +115,8 @@ class BenchmarkRunner:
              for r in case.rooms],
             case.plot,
             case.adjacency,
-            params=graph_params
+            params=graph_params,
+            rng=rng
         )
         
         # Initial solution from graph solver
@@ -126,7 +129,8 @@ class BenchmarkRunner:
                 solution,
                 case.get_solver_request(),
                 phi_grid,
-                solver_config['sa_params']
+                solver_config['sa_params'],
+                rng=rng
             )
             metrics['sa_final_temp'] = solver_config['sa_params'].min_temp
             
@@ -2,7 +2,6 @@
 # Production-grade constraint solver with advanced optimization
 
 from typing import List, Dict, Any, Optional, Tuple, Set
-import random
 import math
 import numpy as np
 from pydantic import BaseModel, Field, validator
@@ -10,8 +9,14 @@ from dataclasses import dataclass, field
 from enum import Enum
 import logging
 from functools import lru_cache
-from collections import defaultdict
+from collections import defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+import os
 from ..utils import geometry_utils as gu
+from ..utils.plot_raster import PlotRaster
+from ..utils.deadline import Deadline
+from . import feasibility as fz
+from . import warm_start as ws
 
 logger = logging.getLogger(__name__)
 
@@ -48,6 +53,34 @@ class RoomType(str, Enum):
     STORE = "store"
     BALCONY = "balcony"
 
+# Integer codes for room types, used by the array-based layout state (-1 = unknown type)
+ROOM_TYPE_CODES: Dict[str, int] = {rt.value: code for code, rt in enumerate(RoomType)}
+
+# Integer codes for directions (rows of the per-plot region table)
+DIRECTION_CODES: Dict[Direction, int] = {d: code for code, d in enumerate(Direction)}
+
+# Plot split into a 3x3 grid of Vastu zones, [row][col] from the top-left (northeast)
+DIRECTION_GRID = [
+    [Direction.NORTHEAST, Direction.NORTH, Direction.NORTHWEST],
+    [Direction.EAST, Direction.CENTER, Direction.WEST],
+    [Direction.SOUTHEAST, Direction.SOUTH, Direction.SOUTHWEST],
+]
+
+@lru_cache(maxsize=128)
+def direction_region_table(plot_width: float, plot_length: float) -> np.ndarray:
+    """
+    Region (x, y, width, height) of every direction for a plot, as a read-only
+    9 x 4 array indexed by DIRECTION_CODES. Shared by all solvers on the same plot.
+    """
+    band_w = plot_width / 3
+    band_h = plot_length / 3
+    table = np.empty((len(Direction), 4))
+    for row, directions in enumerate(DIRECTION_GRID):
+        for col, direction in enumerate(directions):
+            table[DIRECTION_CODES[direction]] = (col * band_w, row * band_h, band_w, band_h)
+    table.setflags(write=False)
+    return table
+
 # ============================================================================
 # PYDANTIC MODELS
 # ============================================================================
@@ -108,6 +141,20 @@ class SolverRequest(BaseModel):
     vastu_school: str = "modern"  # classical, modern, or flexible
     optimization_level: int = Field(2, ge=1, le=3)  # 1=fast, 2=balanced, 3=thorough
     seed: Optional[int] = None  # For reproducible results
+    chains: int = Field(1, ge=1, le=64)  # Independent annealing chains (run in a process pool)
+    strategy: str = "anneal"  # anneal (SA with restarts) or tempering (replica exchange)
+    raster_resolution: float = Field(0.5, gt=0, le=5)  # Plot raster cell size (m) for polygon checks
+    exact_geometry: bool = False  # Skip the raster; exact polygon math for every boundary check
+    deadline_ms: Optional[int] = Field(None, gt=0)  # Wall-clock budget; best layout so far is returned
+    batch_size: int = Field(1, ge=1, le=256)  # Candidate moves scored per annealing step
+    batch_select: str = "best"  # best (best-of-K) or metropolis (Boltzmann-weighted pick)
+    feasibility: str = "shrink"  # Pre-solve check: report, shrink (rooms to minimum size), pack (to MAX_FILL) or ignore
+    # Incremental re-solve of an edited layout (see warm_start): prior rooms as returned
+    # (id, x, y, width, height), rooms held in place and rooms the user changed
+    prior_layout: Optional[List[Dict[str, Any]]] = None
+    locked_room_ids: Optional[List[str]] = None
+    changed_room_ids: Optional[List[str]] = None
+    impact_radius: float = Field(ws.DEFAULT_IMPACT_RADIUS, ge=0)  # Re-optimized neighbourhood of the change (m)
     
     @validator('plot_shape')
     def validate_plot_shape(cls, v):
@@ -122,6 +169,24 @@ class SolverRequest(BaseModel):
             return "rectangular"
         return v_norm
 
+    @validator('strategy')
+    def validate_strategy(cls, v):
+        if v not in ("anneal", "tempering"):
+            raise ValueError(f"strategy must be 'anneal' or 'tempering', got {v!r}")
+        return v
+
+    @validator('batch_select')
+    def validate_batch_select(cls, v):
+        if v not in ("best", "metropolis"):
+            raise ValueError(f"batch_select must be 'best' or 'metropolis', got {v!r}")
+        return v
+
+    @validator('feasibility')
+    def validate_feasibility(cls, v):
+        if v not in fz.FEASIBILITY_POLICIES:
+            raise ValueError(f"feasibility must be one of {fz.FEASIBILITY_POLICIES}, got {v!r}")
+        return v
+
 class SolverResponse(BaseModel):
     """Enhanced solver response with detailed metrics"""
     rooms: List[Room]
@@ -132,6 +197,9 @@ class SolverResponse(BaseModel):
     warnings: List[str] = []
     suggestions: List[str] = []
     convergence_history: List[float] = []  # Track score over time
+    chain_histories: List[List[float]] = []  # Per-chain convergence (multi-chain mode)
+    stopped_reason: str = "max_iterations"  # max_iterations, converged, deadline or infeasible
+    feasibility: Optional[Dict[str, Any]] = None  # Pre-solve FeasibilityReport (when checked)
 
 # ============================================================================
 # VASTU CONFIGURATION (Enhanced with weights and priorities)
@@ -264,6 +332,40 @@ ROOM_SIZE_CONSTRAINTS = {
     ),
 }
 
+# Per-type-code lookup tables (indexed by ROOM_TYPE_CODES values)
+VASTU_BY_CODE: List[Optional[VastuPreference]] = [VASTU_PREFERENCES.get(rt) for rt in RoomType]
+SIZE_CONSTRAINTS_BY_CODE: List[Optional[RoomSizeConstraint]] = [ROOM_SIZE_CONSTRAINTS.get(rt) for rt in RoomType]
+
+def _vastu_grid_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """Vastu (penalty, violation) per type code and direction-grid cell (row * 3 + col)"""
+    # One extra all-zero row: unknown types have code -1, which indexes it
+    penalty = np.zeros((len(RoomType) + 1, 9))
+    violation = np.zeros((len(RoomType) + 1, 9), dtype=np.int64)
+    for code, pref in enumerate(VASTU_BY_CODE):
+        if pref is None:
+            continue
+        for cell, direction in enumerate(d for row in DIRECTION_GRID for d in row):
+            if direction in pref.avoid:
+                penalty[code, cell], violation[code, cell] = pref.weight * 4.0, 1
+            elif direction not in pref.preferred and direction not in pref.acceptable:
+                penalty[code, cell], violation[code, cell] = pref.weight * 1.5, 1
+    return penalty, violation
+
+def _size_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """Size constraint columns per type code (plus a last row for unknown types)"""
+    has_constraint = np.zeros(len(RoomType) + 1, dtype=bool)
+    # min_width, max_width, min_height, max_height, ideal_aspect_ratio, aspect_ratio_tolerance
+    limits = np.zeros((len(RoomType) + 1, 6))
+    for code, c in enumerate(SIZE_CONSTRAINTS_BY_CODE):
+        if c is not None:
+            has_constraint[code] = True
+            limits[code] = (c.min_width, c.max_width, c.min_height, c.max_height,
+                            c.ideal_aspect_ratio, c.aspect_ratio_tolerance)
+    return has_constraint, limits
+
+VASTU_GRID_PENALTY, VASTU_GRID_VIOLATION = _vastu_grid_tables()
+HAS_SIZE_CONSTRAINT, SIZE_LIMITS = _size_tables()
+
 # Adjacency preferences (which rooms should be near each other)
 ADJACENCY_PREFERENCES = [
     ("kitchen", "dining", 5.0, 3.0),  # (type1, type2, ideal_distance, weight)
@@ -314,43 +416,645 @@ class OptimizationMetrics:
 # ============================================================================
 
 class SpatialIndex:
-    """Simple spatial index for fast overlap queries"""
+    """
+    Uniform-grid spatial index for fast overlap queries.
+
+    Only occupied cells are stored (cell -> set of room indices), so rooms
+    can be moved or removed by touching just the cells they enter or leave.
+    """
     
     def __init__(self, cell_size: float = 5.0):
         self.cell_size = cell_size
-        self.grid: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self.grid: Dict[Tuple[int, int], Set[int]] = {}
     
     def _get_cells(self, x: float, y: float, width: float, height: float) -> Set[Tuple[int, int]]:
         """Get all grid cells a room occupies"""
-        cells = set()
-        min_cell_x = int(x / self.cell_size)
-        max_cell_x = int((x + width) / self.cell_size)
-        min_cell_y = int(y / self.cell_size)
-        max_cell_y = int((y + height) / self.cell_size)
+        min_cell_x = math.floor(x / self.cell_size)
+        max_cell_x = math.floor((x + width) / self.cell_size)
+        min_cell_y = math.floor(y / self.cell_size)
+        max_cell_y = math.floor((y + height) / self.cell_size)
         
-        for cx in range(min_cell_x, max_cell_x + 1):
-            for cy in range(min_cell_y, max_cell_y + 1):
-                cells.add((cx, cy))
-        return cells
+        return {
+            (cx, cy)
+            for cx in range(min_cell_x, max_cell_x + 1)
+            for cy in range(min_cell_y, max_cell_y + 1)
+        }
+    
+    def _discard(self, cell: Tuple[int, int], room_idx: int):
+        rooms = self.grid.get(cell)
+        if rooms is not None:
+            rooms.discard(room_idx)
+            if not rooms:
+                del self.grid[cell]
     
     def insert(self, room_idx: int, room: Dict):
         """Insert a room into the spatial index"""
-        cells = self._get_cells(room["x"], room["y"], room["width"], room["height"])
-        for cell in cells:
-            self.grid[cell].append(room_idx)
+        self.insert_bounds(room_idx, room["x"], room["y"], room["width"], room["height"])
     
-    def query_potential_overlaps(self, room: Dict) -> Set[int]:
-        """Get rooms that potentially overlap with given room"""
-        cells = self._get_cells(room["x"], room["y"], room["width"], room["height"])
+    def insert_bounds(self, room_idx: int, x: float, y: float, width: float, height: float):
+        """Insert a room given its bounds"""
+        for cell in self._get_cells(x, y, width, height):
+            self.grid.setdefault(cell, set()).add(room_idx)
+    
+    def remove(self, room_idx: int, bounds: Tuple[float, float, float, float]):
+        """Remove a room previously inserted with `bounds` (x, y, width, height)"""
+        for cell in self._get_cells(*bounds):
+            self._discard(cell, room_idx)
+    
+    def move(self, room_idx: int,
+             old_bounds: Tuple[float, float, float, float],
+             new_bounds: Tuple[float, float, float, float]):
+        """Re-index a room, touching only the cells it leaves or enters"""
+        old_cells = self._get_cells(*old_bounds)
+        new_cells = self._get_cells(*new_bounds)
+        if old_cells == new_cells:
+            return
+        for cell in old_cells - new_cells:
+            self._discard(cell, room_idx)
+        for cell in new_cells - old_cells:
+            self.grid.setdefault(cell, set()).add(room_idx)
+    
+    def query_bounds(self, x: float, y: float, width: float, height: float, margin: float = 0.0) -> Set[int]:
+        """Get rooms in any cell touched by the bounds grown by `margin` on every side"""
         candidates = set()
-        for cell in cells:
-            candidates.update(self.grid.get(cell, []))
+        for cell in self._get_cells(x - margin, y - margin, width + 2 * margin, height + 2 * margin):
+            candidates.update(self.grid.get(cell, ()))
         return candidates
     
+    def query_potential_overlaps(self, room: Dict) -> Set[int]:
+        """Get rooms that potentially overlap with given room"""
+        return self.query_bounds(room["x"], room["y"], room["width"], room["height"])
+    
     def clear(self):
         """Clear the index"""
         self.grid.clear()
 
+class EdgeIndex:
+    """
+    Bucketed edge coordinates for circulation queries.
+
+    The circulation gap compares one room's right/top edge with another's
+    left/bottom edge, however far apart the rooms are on the other axis, so
+    a window around the room misses pairs that share an edge line across the
+    plot. Each edge coordinate is hashed into buckets of `bucket_size`; two
+    edges closer than that always land in the same or an adjacent bucket.
+    """
+    
+    def __init__(self, bucket_size: float):
+        self.bucket_size = bucket_size
+        # left, right, bottom and top edges: bucket -> set of room indices
+        self.edges: Tuple[Dict[int, Set[int]], ...] = ({}, {}, {}, {})
+    
+    def _buckets(self, x: float, y: float, width: float, height: float) -> Tuple[int, int, int, int]:
+        return tuple(math.floor(v / self.bucket_size) for v in (x, x + width, y, y + height))
+    
+    def insert_bounds(self, room_idx: int, x: float, y: float, width: float, height: float):
+        """Insert a room given its bounds"""
+        for edges, bucket in zip(self.edges, self._buckets(x, y, width, height)):
+            edges.setdefault(bucket, set()).add(room_idx)
+    
+    def remove(self, room_idx: int, bounds: Tuple[float, float, float, float]):
+        """Remove a room previously inserted with `bounds` (x, y, width, height)"""
+        for edges, bucket in zip(self.edges, self._buckets(*bounds)):
+            rooms = edges.get(bucket)
+            if rooms is not None:
+                rooms.discard(room_idx)
+                if not rooms:
+                    del edges[bucket]
+    
+    def move(self, room_idx: int,
+             old_bounds: Tuple[float, float, float, float],
+             new_bounds: Tuple[float, float, float, float]):
+        """Re-index a room whose bounds changed"""
+        if self._buckets(*old_bounds) != self._buckets(*new_bounds):
+            self.remove(room_idx, old_bounds)
+            self.insert_bounds(room_idx, *new_bounds)
+    
+    def query_bounds(self, x: float, y: float, width: float, height: float) -> Set[int]:
+        """Get rooms with a facing edge possibly closer than `bucket_size` to the bounds"""
+        left, right, bottom, top = self.edges
+        x0, x1, y0, y1 = self._buckets(x, y, width, height)
+        candidates = set()
+        # My right edge against their left edge, my left edge against their right edge, ...
+        for edges, bucket in ((left, x1), (right, x0), (bottom, y1), (top, y0)):
+            for b in (bucket - 1, bucket, bucket + 1):
+                candidates.update(edges.get(b, ()))
+        return candidates
+
+# ============================================================================
+# VECTORIZED PAIR KERNELS
+# ============================================================================
+
+CIRCULATION_CLEARANCE = 0.5  # Minimum comfortable gap between neighbouring rooms (m)
+
+def pair_overlap_gap(x1: np.ndarray, y1: np.ndarray, w1: np.ndarray, h1: np.ndarray,
+                     x2: np.ndarray, y2: np.ndarray, w2: np.ndarray, h2: np.ndarray
+                     ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Broadcasted intersection area and minimum edge gap between two sets of rooms.
+
+    Arguments broadcast against each other, so column vectors for one side and
+    row vectors for the other yield a full (k, N) block. Element-wise this is
+    the same arithmetic as the scalar overlap/circulation pair checks.
+    """
+    right1, bottom1 = x1 + w1, y1 + h1
+    right2, bottom2 = x2 + w2, y2 + h2
+    
+    intersects = (x1 < right2) & (right1 > x2) & (y1 < bottom2) & (bottom1 > y2)
+    x_overlap = np.minimum(right1, right2) - np.maximum(x1, x2)
+    y_overlap = np.minimum(bottom1, bottom2) - np.maximum(y1, y2)
+    overlap = np.where(intersects, np.maximum(0, x_overlap) * np.maximum(0, y_overlap), 0.0)
+    
+    x_gap = np.maximum(0, np.minimum(np.abs(right1 - x2), np.abs(right2 - x1)))
+    y_gap = np.maximum(0, np.minimum(np.abs(bottom1 - y2), np.abs(bottom2 - y1)))
+    
+    return overlap, np.minimum(x_gap, y_gap)
+
+def pairwise_overlap_gap(x: np.ndarray, y: np.ndarray, w: np.ndarray, h: np.ndarray
+                         ) -> Tuple[np.ndarray, np.ndarray]:
+    """Full symmetric N x N intersection-area and minimum-gap matrices (zero diagonal)"""
+    overlap, gap = pair_overlap_gap(
+        x[:, None], y[:, None], w[:, None], h[:, None],
+        x[None, :], y[None, :], w[None, :], h[None, :]
+    )
+    np.fill_diagonal(overlap, 0.0)
+    np.fill_diagonal(gap, 0.0)
+    return overlap, gap
+
+def circulation_penalty(gap: np.ndarray) -> np.ndarray:
+    """Penalty for room pairs closer than 0.5m (but not touching)"""
+    return np.where((gap > 0) & (gap < CIRCULATION_CLEARANCE), (CIRCULATION_CLEARANCE - gap) * 20, 0.0)
+
+# ============================================================================
+# ADJACENCY INDEX
+# ============================================================================
+
+@dataclass
+class AdjacencyIndex:
+    """
+    ADJACENCY_PREFERENCES resolved once against a concrete room list.
+
+    Every room whose type contains a preference's first type is paired with
+    every room whose type contains the second (same substring matching as
+    before, but all matches instead of the first). Each first-type room
+    scores its best partner, and a preference's rewards are averaged over
+    its first-type rooms so its maximum stays weight * 10.
+    """
+    first: np.ndarray  # Room index per candidate pair
+    second: np.ndarray
+    ideal: np.ndarray  # Ideal center distance per pair
+    max_reward: np.ndarray  # weight * 10 per pair
+    group_starts: np.ndarray  # Offsets of the (preference, first room) groups
+    group_scale: np.ndarray  # 1 / number of groups in the group's preference
+
+    @classmethod
+    def compile(cls, types: List[str]) -> "AdjacencyIndex":
+        first, second, ideal, max_reward = [], [], [], []
+        group_starts, group_scale = [], []
+        
+        for type1, type2, ideal_dist, weight in ADJACENCY_PREFERENCES:
+            rooms2 = [k for k, t in enumerate(types) if type2 in t]
+            groups = [
+                (i, [j for j in rooms2 if j != i])
+                for i, t in enumerate(types) if type1 in t
+            ]
+            groups = [(i, partners) for i, partners in groups if partners]
+            
+            for i, partners in groups:
+                group_starts.append(len(first))
+                group_scale.append(1.0 / len(groups))
+                first.extend([i] * len(partners))
+                second.extend(partners)
+                ideal.extend([ideal_dist] * len(partners))
+                max_reward.extend([weight * 10] * len(partners))
+        
+        return cls(
+            first=np.array(first, dtype=np.intp),
+            second=np.array(second, dtype=np.intp),
+            ideal=np.array(ideal, dtype=np.float64),
+            max_reward=np.array(max_reward, dtype=np.float64),
+            group_starts=np.array(group_starts, dtype=np.intp),
+            group_scale=np.array(group_scale, dtype=np.float64),
+        )
+
+    def score(self, x: np.ndarray, y: np.ndarray, width: np.ndarray, height: np.ndarray) -> float:
+        """Unscaled adjacency reward for the given geometry"""
+        if not len(self.group_starts):
+            return 0.0
+        
+        cx = x + width / 2
+        cy = y + height / 2
+        dist = np.hypot(cx[self.first] - cx[self.second], cy[self.first] - cy[self.second])
+        
+        # Full reward within the ideal distance, falling off as ideal / dist beyond it
+        reward = self.max_reward * (self.ideal / np.maximum(dist, self.ideal))
+        best = np.maximum.reduceat(reward, self.group_starts)
+        return float((best * self.group_scale).sum())
+
+    def score_moves(self, x: np.ndarray, y: np.ndarray, width: np.ndarray, height: np.ndarray,
+                    rooms: np.ndarray, new_cx: np.ndarray, new_cy: np.ndarray) -> np.ndarray:
+        """Reward for each of K candidate layouts where room rooms[k] is centred at (new_cx[k], new_cy[k])"""
+        if not len(self.group_starts):
+            return np.zeros(len(rooms))
+        
+        cx = x + width / 2
+        cy = y + height / 2
+        moved = rooms[:, None]
+        x1 = np.where(self.first == moved, new_cx[:, None], cx[self.first])
+        y1 = np.where(self.first == moved, new_cy[:, None], cy[self.first])
+        x2 = np.where(self.second == moved, new_cx[:, None], cx[self.second])
+        y2 = np.where(self.second == moved, new_cy[:, None], cy[self.second])
+        dist = np.hypot(x1 - x2, y1 - y2)
+        
+        reward = self.max_reward * (self.ideal / np.maximum(dist, self.ideal))
+        best = np.maximum.reduceat(reward, self.group_starts, axis=1)
+        return best @ self.group_scale
+
+# ============================================================================
+# LAYOUT STATE (struct-of-arrays)
+# ============================================================================
+
+class LayoutState:
+    """
+    Compact struct-of-arrays layout used inside the optimizer.
+
+    Geometry lives in parallel float64 arrays (x, y, width, height) and room
+    types in an int code array. Moves edit the arrays in place after calling
+    `save(i)`, which journals the old values of room i; `undo()` restores a
+    rejected trial and `commit()` keeps it, so no per-trial copies are made.
+    """
+
+    def __init__(self,
+                 ids: List[str],
+                 names: List[str],
+                 types: List[str],
+                 x: Any,
+                 y: Any,
+                 width: Any,
+                 height: Any,
+                 directions: Optional[List[Optional[str]]] = None):
+        self.ids = list(ids)
+        self.names = list(names)
+        self.types = list(types)
+        self.directions = list(directions) if directions is not None else [None] * len(self.ids)
+        self.type_codes = np.array([ROOM_TYPE_CODES.get(t, -1) for t in self.types], dtype=np.int64)
+        self.adjacency = AdjacencyIndex.compile(self.types)
+        self.x = np.array(x, dtype=np.float64)
+        self.y = np.array(y, dtype=np.float64)
+        self.width = np.array(width, dtype=np.float64)
+        self.height = np.array(height, dtype=np.float64)
+        self._journal: List[Tuple[int, float, float, float, float]] = []
+
+    @classmethod
+    def from_rooms(cls, rooms: List[Dict]) -> "LayoutState":
+        """Build from positioned room dicts"""
+        return cls(
+            ids=[r["id"] for r in rooms],
+            names=[r["name"] for r in rooms],
+            types=[r["type"] for r in rooms],
+            x=[r["x"] for r in rooms],
+            y=[r["y"] for r in rooms],
+            width=[r["width"] for r in rooms],
+            height=[r["height"] for r in rooms],
+            directions=[r.get("direction") for r in rooms],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def copy(self) -> "LayoutState":
+        """Copy geometry arrays; room metadata is shared (never mutated)"""
+        state = LayoutState.__new__(LayoutState)
+        state.ids = self.ids
+        state.names = self.names
+        state.types = self.types
+        state.directions = self.directions
+        state.type_codes = self.type_codes
+        state.adjacency = self.adjacency
+        state.x = self.x.copy()
+        state.y = self.y.copy()
+        state.width = self.width.copy()
+        state.height = self.height.copy()
+        state._journal = []
+        return state
+
+    def save(self, i: int):
+        """Journal room i before a move modifies it"""
+        self._journal.append((i, self.x[i], self.y[i], self.width[i], self.height[i]))
+
+    def undo(self):
+        """Restore every room journaled since the last commit"""
+        for i, x, y, width, height in reversed(self._journal):
+            self.x[i], self.y[i], self.width[i], self.height[i] = x, y, width, height
+        self._journal.clear()
+
+    def commit(self):
+        """Keep the journaled changes"""
+        self._journal.clear()
+
+    def to_dicts(self) -> List[Dict]:
+        """Export as positioned room dicts"""
+        return [
+            {
+                "id": self.ids[i],
+                "name": self.names[i],
+                "type": self.types[i],
+                "x": float(self.x[i]),
+                "y": float(self.y[i]),
+                "width": float(self.width[i]),
+                "height": float(self.height[i]),
+                "direction": self.directions[i],
+            }
+            for i in range(len(self))
+        ]
+
+# ============================================================================
+# INCREMENTAL METRICS (delta scoring for annealing moves)
+# ============================================================================
+
+class IncrementalMetrics:
+    """
+    Cached decomposition of `_calculate_metrics` for delta evaluation.
+
+    Keeps symmetric per-pair overlap/circulation matrices and per-room
+    vastu/aspect/boundary terms. A spatial index (overlaps) and an edge
+    index (circulation gaps) over the current layout find every room a move
+    can interact with, so a move touching k rooms only recomputes the pairs
+    with those rooms (plus the pairs they used to interact with) and k room
+    entries.
+
+    Usage per trial move: `update(state, changed)` returns the new metrics,
+    then either `commit()` (accept) or `revert()` (reject).
+    """
+
+    def __init__(self, solver: "EnhancedConstraintSolver", state: LayoutState, verify: bool = False):
+        self.solver = solver
+        self.verify = verify
+        self._undo: Optional[Tuple] = None
+        self.rebuild(state)
+
+    def rebuild(self, state: LayoutState) -> OptimizationMetrics:
+        """Recompute every cached term from scratch"""
+        n = len(state)
+        x, y, w, h = state.x, state.y, state.width, state.height
+        self.overlap, gap = pairwise_overlap_gap(x, y, w, h)
+        self.circulation = circulation_penalty(gap)
+        self.room_terms = np.array([self.solver._room_terms(state, i) for i in range(n)], dtype=float).reshape(n, 6)
+        self.areas = w * h
+        
+        # Bounds as currently indexed, and the rooms each room has non-zero pair terms with
+        self.bounds = np.stack([x, y, w, h], axis=1)
+        self.index = SpatialIndex(cell_size=5.0)
+        self.edges = EdgeIndex(bucket_size=CIRCULATION_CLEARANCE)
+        for i in range(n):
+            self.index.insert_bounds(i, *self.bounds[i])
+            self.edges.insert_bounds(i, *self.bounds[i])
+        interacting = (self.overlap > 0) | (self.circulation > 0)
+        self.neighbors: List[Set[int]] = [set(np.flatnonzero(interacting[i]).tolist()) for i in range(n)]
+        self._undo = None
+
+        self.current = self._compose(state)
+        return self.current
+
+    def update(self, state: LayoutState, changed: List[int]) -> OptimizationMetrics:
+        """Recompute the terms touched by rooms in `changed` and return new metrics"""
+        changed = sorted(set(changed))
+        pair_writes = []  # (i, js, old overlap, old circulation) in write order
+        old_neighbors: Dict[int, Set[int]] = {}
+        self._undo = (
+            changed,
+            pair_writes,
+            old_neighbors,
+            self.bounds[changed].copy(),
+            self.room_terms[changed].copy(),
+            self.areas[changed].copy(),
+            self.current,
+        )
+        
+        # Move the changed rooms in the index first so they see each other's new bounds
+        for i in changed:
+            new_bounds = (state.x[i], state.y[i], state.width[i], state.height[i])
+            self.index.move(i, tuple(self.bounds[i]), new_bounds)
+            self.edges.move(i, tuple(self.bounds[i]), new_bounds)
+            self.bounds[i] = new_bounds
+        
+        x, y, w, h = state.x, state.y, state.width, state.height
+        for i in changed:
+            # Rooms overlapping or facing the new position, plus everything i interacted with before
+            candidates = self.index.query_bounds(*self.bounds[i])
+            candidates |= self.edges.query_bounds(*self.bounds[i])
+            candidates |= self.neighbors[i]
+            candidates.discard(i)
+            js = np.fromiter(sorted(candidates), dtype=np.intp, count=len(candidates))
+            
+            overlap, gap = pair_overlap_gap(x[i], y[i], w[i], h[i], x[js], y[js], w[js], h[js])
+            circulation = circulation_penalty(gap)
+            
+            pair_writes.append((i, js, self.overlap[i, js].copy(), self.circulation[i, js].copy()))
+            self.overlap[i, js] = self.overlap[js, i] = overlap
+            self.circulation[i, js] = self.circulation[js, i] = circulation
+            
+            for j in [i, *js.tolist()]:
+                if j not in old_neighbors:
+                    old_neighbors[j] = set(self.neighbors[j])
+            interacting = js[(overlap > 0) | (circulation > 0)].tolist()
+            for j in self.neighbors[i]:
+                self.neighbors[j].discard(i)
+            for j in interacting:
+                self.neighbors[j].add(i)
+            self.neighbors[i] = set(interacting)
+        
+        for i in changed:
+            self.room_terms[i] = self.solver._room_terms(state, i)
+            self.areas[i] = state.width[i] * state.height[i]
+
+        self.current = self._compose(state)
+        if self.verify:
+            self._check(state)
+        return self.current
+
+    def score_moves(self,
+                    state: LayoutState,
+                    rooms: np.ndarray,
+                    x: np.ndarray,
+                    y: np.ndarray,
+                    width: np.ndarray,
+                    height: np.ndarray) -> np.ndarray:
+        """
+        Total score of K single-room candidate moves in one vectorized pass.
+        Candidate k places room rooms[k] at (x[k], y[k], width[k], height[k]);
+        the layout and the cached terms are left untouched.
+        """
+        n = len(state)
+        
+        # Pair terms of every candidate against every room (K x N), excluding itself
+        overlap, gap = pair_overlap_gap(
+            x[:, None], y[:, None], width[:, None], height[:, None],
+            state.x[None, :], state.y[None, :], state.width[None, :], state.height[None, :]
+        )
+        circulation = circulation_penalty(gap)
+        itself = rooms[:, None] == np.arange(n)
+        overlap[itself] = 0.0
+        circulation[itself] = 0.0
+        
+        # Swap each candidate room's old row (and room terms) for the new one
+        old_overlap = self.overlap[rooms]
+        total_overlap = float(self.overlap.sum()) / 2 - old_overlap.sum(axis=1) + overlap.sum(axis=1)
+        overlap_count = (int(np.count_nonzero(self.overlap > 0)) // 2
+                         - np.count_nonzero(old_overlap > 0, axis=1) + np.count_nonzero(overlap > 0, axis=1))
+        total_circulation = (float(self.circulation.sum()) / 2
+                             - self.circulation[rooms].sum(axis=1) + circulation.sum(axis=1))
+        room_totals = (self.room_terms.sum(axis=0) - self.room_terms[rooms]
+                       + self.solver._room_terms_batch(state.type_codes[rooms], x, y, width, height))
+        total_area = float(self.areas.sum()) - self.areas[rooms] + width * height
+        adjacency = state.adjacency.score_moves(
+            state.x, state.y, state.width, state.height, rooms, x + width / 2, y + height / 2
+        )
+        
+        return self.solver._score_components(
+            total_overlap, overlap_count, room_totals.T, total_area, adjacency, total_circulation
+        )[-1]
+
+    def commit(self):
+        """Accept the last update"""
+        self._undo = None
+
+    def revert(self):
+        """Roll back the last update"""
+        if self._undo is None:
+            return
+        changed, pair_writes, old_neighbors, bounds, room_terms, areas, metrics = self._undo
+        for i, js, overlap, circulation in reversed(pair_writes):
+            self.overlap[i, js] = self.overlap[js, i] = overlap
+            self.circulation[i, js] = self.circulation[js, i] = circulation
+        for j, neighbors in old_neighbors.items():
+            self.neighbors[j] = neighbors
+        for k, i in enumerate(changed):
+            self.index.move(i, tuple(self.bounds[i]), tuple(bounds[k]))
+            self.edges.move(i, tuple(self.bounds[i]), tuple(bounds[k]))
+        self.bounds[changed] = bounds
+        self.room_terms[changed] = room_terms
+        self.areas[changed] = areas
+        self.current = metrics
+        self._undo = None
+
+    def _compose(self, state: LayoutState) -> OptimizationMetrics:
+        # Matrices are symmetric with a zero diagonal: each pair is counted twice
+        totals = self.room_terms.sum(axis=0)
+        return self.solver._compose_metrics(
+            float(self.overlap.sum()) / 2,
+            int(np.count_nonzero(self.overlap > 0)) // 2,
+            tuple(totals),
+            float(self.areas.sum()),
+            self.solver._adjacency_raw(state),
+            float(self.circulation.sum()) / 2
+        )
+
+    def _check(self, state: LayoutState):
+        """Compare against a full recompute (debug only)"""
+        full = self.solver._calculate_metrics(state)
+        incremental = self.current.to_dict()
+        for key, value in full.to_dict().items():
+            if abs(incremental[key] - value) > 1e-6:
+                raise RuntimeError(
+                    f"Incremental metrics diverged on {key}: {incremental[key]} != {value}"
+                )
+
+# ============================================================================
+# ADAPTIVE MOVE SELECTION
+# ============================================================================
+
+MOVE_TYPES = ("translate", "swap", "resize", "rotate")
+MOVE_PRIOR = (0.5, 0.25, 0.15, 0.1)  # Selection probabilities before any evidence
+
+class MoveScheduler:
+    """
+    Online move-operator selection by probability matching.
+    
+    Each operator keeps a sliding window of outcomes (1 if the proposal
+    improved the score, else 0). Operators are drawn in proportion to their
+    windowed improvement rate, smoothed towards MOVE_PRIOR by a few pseudo
+    observations, with a probability floor so none is starved and a
+    currently useless one can recover.
+    """
+    
+    def __init__(self,
+                 rng: np.random.Generator,
+                 window: int = 30,
+                 min_probability: float = 0.05,
+                 prior_weight: float = 5.0,
+                 prior_rate: float = 0.25):
+        self.rng = rng
+        self.min_probability = min_probability
+        self.windows = [deque(maxlen=window) for _ in MOVE_TYPES]
+        # Pseudo-successes chosen so that, without data, rates are proportional to the prior
+        self.prior_weight = prior_weight
+        self.prior_successes = [prior_weight * prior_rate * len(MOVE_TYPES) * p for p in MOVE_PRIOR]
+        self.attempts = [0] * len(MOVE_TYPES)
+        self.accepts = [0] * len(MOVE_TYPES)
+        self.total_gain = [0.0] * len(MOVE_TYPES)
+    
+    def probabilities(self) -> np.ndarray:
+        rates = np.array([
+            (sum(w) + prior) / (len(w) + self.prior_weight)
+            for w, prior in zip(self.windows, self.prior_successes)
+        ])
+        return self.min_probability + (1 - len(MOVE_TYPES) * self.min_probability) * rates / rates.sum()
+    
+    def choose(self) -> int:
+        return int(self.rng.choice(len(MOVE_TYPES), p=self.probabilities()))
+    
+    def record(self, move: int, delta: float, accepted: bool):
+        self.windows[move].append(1 if delta > 0 else 0)
+        self.attempts[move] += 1
+        self.accepts[move] += accepted
+        self.total_gain[move] += max(delta, 0.0)
+    
+    def stats(self) -> Dict[str, float]:
+        """Per-operator attempts, acceptance rate, mean gain and final selection probability"""
+        stats = {}
+        for k, (name, p) in enumerate(zip(MOVE_TYPES, self.probabilities())):
+            attempts = self.attempts[k]
+            stats[f"move_{name}_attempts"] = float(attempts)
+            stats[f"move_{name}_acceptance"] = self.accepts[k] / attempts if attempts else 0.0
+            stats[f"move_{name}_mean_gain"] = self.total_gain[k] / attempts if attempts else 0.0
+            stats[f"move_{name}_probability"] = float(p)
+        return stats
+
+# ============================================================================
+# PARALLEL TEMPERING
+# ============================================================================
+
+TEMPERING_MIN_TEMP = 0.05  # Coldest rung of the replica-exchange ladder
+TEMPERING_SWAP_INTERVAL = 10  # Lockstep moves between exchange attempts
+
+@dataclass
+class ChainTask:
+    """Inputs of one optimizer chain (sent to process-pool workers instead of the solver)"""
+    rooms: List[Dict[str, Any]]
+    solver_args: Dict[str, Any]  # Constructor arguments: plot geometry and optimizer settings
+    seed: np.random.SeedSequence
+    deadline: Deadline
+    warm_start: Optional["ws.WarmStart"]
+    size_overrides: Dict[str, Tuple[float, float]]
+
+@dataclass
+class ChainResult:
+    """Outcome of one optimizer run (returned from process-pool workers)"""
+    state: LayoutState
+    metrics: OptimizationMetrics
+    history: List[float]
+    stopped_reason: str
+    stats: Dict[str, float]
+    iterations: int
+
+@dataclass
+class TemperingReplica:
+    """One rung of the replica-exchange ladder: a layout and its scorer"""
+    state: LayoutState
+    scorer: IncrementalMetrics
+    metrics: OptimizationMetrics
+
 # ============================================================================
 # ENHANCED CONSTRAINT SOLVER
 # ============================================================================
@@ -361,6 +1065,7 @@ class EnhancedConstraintSolver:
     - Multi-objective optimization (Vastu + Space + Adjacency + Circulation)
     - Adaptive simulated annealing with restart
     - Spatial indexing for fast overlap detection
+    - Incremental delta scoring of annealing moves
     - Priority-based placement
     - Detailed metrics and suggestions
     """
@@ -371,7 +1076,18 @@ class EnhancedConstraintSolver:
                  plot_polygon: Optional[List[List[float]]] = None,
                  optimization_level: int = 2,
                  vastu_school: str = "modern",
-                 seed: Optional[int] = None):
+                 seed: Optional[int] = None,
+                 verify_incremental: bool = False,
+                 chains: int = 1,
+                 max_workers: Optional[int] = None,
+                 strategy: str = "anneal",
+                 rng: Optional[np.random.Generator] = None,
+                 raster_resolution: float = 0.5,
+                 exact_geometry: bool = False,
+                 deadline_ms: Optional[float] = None,
+                 batch_size: int = 1,
+                 batch_select: str = "best",
+                 feasibility: str = "shrink"):
         
         self.plot_width = plot_width
         self.plot_length = plot_length
@@ -384,20 +1100,62 @@ class EnhancedConstraintSolver:
                 self.plot_area = plot_width * plot_length
         else:
             self.plot_area = plot_width * plot_length
+        # Rasterized plot for O(1) containment/projection (exact_geometry: always ray cast)
+        self.raster_resolution = raster_resolution
+        self.exact_geometry = exact_geometry
+        self.plot_raster = (
+            PlotRaster(self.plot_polygon, resolution=raster_resolution, exact=exact_geometry)
+            if self.plot_polygon else None
+        )
         self.optimization_level = optimization_level
         self.vastu_school = vastu_school
+        # Direction regions for this plot (shared table, computed once per plot size)
+        self.region_table = direction_region_table(float(plot_width), float(plot_length))
         self.grid_size = 0.1  # Fine grid for precision
-        
-        # Set random seed for reproducibility
-        if seed is not None:
-            random.seed(seed)
-            np.random.seed(seed)
+        # Debug: cross-check every incremental score against a full recompute
+        self.verify_incremental = verify_incremental
+        
+        # Multi-chain mode: independent chains seeded from one SeedSequence
+        if chains < 1:
+            raise ValueError("chains must be >= 1")
+        self.seed = seed
+        self.chains = chains
+        self.max_workers = max_workers
+        if strategy not in ("anneal", "tempering"):
+            raise ValueError(f"Unknown strategy: {strategy}")
+        self.strategy = strategy
+        # Batched proposals: score batch_size single-room candidates per step in one pass
+        if batch_size < 1:
+            raise ValueError("batch_size must be >= 1")
+        if batch_select not in ("best", "metropolis"):
+            raise ValueError(f"Unknown batch_select: {batch_select}")
+        self.batch_size = batch_size
+        self.batch_select = batch_select
+        # Pre-solve feasibility policy; shrunk rooms start at their minimum size
+        if feasibility not in fz.FEASIBILITY_POLICIES:
+            raise ValueError(f"Unknown feasibility policy: {feasibility}")
+        self.feasibility = feasibility
+        self.size_overrides: Dict[str, Tuple[float, float]] = {}
+        
+        # Warm start: prior geometry of an edited layout; moves only pick the movable rooms
+        self.warm_start: Optional[ws.WarmStart] = None
+        self.movable = np.zeros(0, dtype=np.int64)
+        
+        # Per-instance RNG: concurrent solvers never share or reseed global state
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
         
         # Optimization parameters based on level
         self.max_iterations = {1: 50, 2: 200, 3: 500}[optimization_level]
         self.initial_temp = {1: 0.5, 2: 1.5, 3: 3.0}[optimization_level]
         self.cooling_rate = {1: 0.90, 2: 0.95, 3: 0.98}[optimization_level]
         self.restart_threshold = {1: 30, 2: 50, 3: 80}[optimization_level]
+        self.tempering_replicas = {1: 4, 2: 6, 3: 8}[optimization_level]
+        
+        # Anytime mode: the clock starts when solve() is called
+        self.deadline_ms = deadline_ms
+        self.deadline = Deadline(None)
+        self.stopped_reason = "max_iterations"
+        self.iterations_run = 0  # Move evaluations the last optimizer run actually made
         
         # Vastu strictness based on school
         self.vastu_weight = {
@@ -411,6 +1169,8 @@ class EnhancedConstraintSolver:
         
         # Track convergence
         self.convergence_history: List[float] = []
+        self.chain_histories: List[List[float]] = []
+        self.optimizer_stats: Dict[str, float] = {}  # Move-operator and tempering statistics
         
         logger.info(f"Solver initialized: {plot_width}x{plot_length}m, level={optimization_level}, vastu={vastu_school}")
     
@@ -418,42 +1178,22 @@ class EnhancedConstraintSolver:
     # DIRECTION & REGION MANAGEMENT
     # ========================================================================
     
-    @lru_cache(maxsize=32)
     def _get_direction_region(self, direction: Direction) -> Tuple[float, float, float, float]:
-        """Get precise region boundaries for a Vastu direction (cached)"""
-        band_w = self.plot_width / 3
-        band_h = self.plot_length / 3
-        
-        regions = {
-            Direction.NORTHEAST: (0, 0, band_w, band_h),
-            Direction.NORTH: (band_w, 0, band_w, band_h),
-            Direction.NORTHWEST: (2 * band_w, 0, band_w, band_h),
-            Direction.EAST: (0, band_h, band_w, band_h),
-            Direction.CENTER: (band_w, band_h, band_w, band_h),
-            Direction.WEST: (2 * band_w, band_h, band_w, band_h),
-            Direction.SOUTHEAST: (0, 2 * band_h, band_w, band_h),
-            Direction.SOUTH: (band_w, 2 * band_h, band_w, band_h),
-            Direction.SOUTHWEST: (2 * band_w, 2 * band_h, band_w, band_h),
-        }
-        
-        return regions.get(direction, (band_w, band_h, band_w, band_h))
+        """Get precise region boundaries for a Vastu direction"""
+        x, y, width, height = self.region_table[DIRECTION_CODES[direction]]
+        return float(x), float(y), float(width), float(height)
     
     def _get_room_direction(self, x: float, y: float, width: float, height: float) -> Direction:
         """Determine which Vastu direction a room is in (based on center)"""
         center_x = x + width / 2
         center_y = y + height / 2
+        band_w, band_h = self.region_table[DIRECTION_CODES[Direction.CENTER], 2:]
         
         # Determine column and row
-        col = min(2, int(center_x / (self.plot_width / 3)))
-        row = min(2, int(center_y / (self.plot_length / 3)))
+        col = min(2, int(center_x / band_w))
+        row = min(2, int(center_y / band_h))
         
-        direction_map = [
-            [Direction.NORTHEAST, Direction.NORTH, Direction.NORTHWEST],
-            [Direction.EAST, Direction.CENTER, Direction.WEST],
-            [Direction.SOUTHEAST, Direction.SOUTH, Direction.SOUTHWEST]
-        ]
-        
-        return direction_map[row][col]
+        return DIRECTION_GRID[row][col]
     
     # ========================================================================
     # ROOM SIZING (Enhanced with aspect ratio control)
@@ -469,8 +1209,8 @@ class EnhancedConstraintSolver:
             return 4.0, 4.0
         
         # Start with preferred size and add variation
-        width = constraint.preferred_width + random.gauss(0, 0.25)
-        height = constraint.preferred_height + random.gauss(0, 0.25)
+        width = constraint.preferred_width + self.rng.normal(0, 0.25)
+        height = constraint.preferred_height + self.rng.normal(0, 0.25)
         
         # Clamp to min/max
         width = np.clip(width, constraint.min_width, constraint.max_width)
@@ -522,8 +1262,8 @@ class EnhancedConstraintSolver:
         vastu_pref = VASTU_PREFERENCES.get(room_type)
         if not vastu_pref:
             # Random placement for unknown types
-            return (random.uniform(0, max(0.1, self.plot_width - width)),
-                    random.uniform(0, max(0.1, self.plot_length - height)))
+            return (self.rng.uniform(0, max(0.1, self.plot_width - width)),
+                    self.rng.uniform(0, max(0.1, self.plot_length - height)))
         
         preferred_dirs = vastu_pref.preferred
         acceptable_dirs = vastu_pref.acceptable
@@ -534,8 +1274,8 @@ class EnhancedConstraintSolver:
             
             # Try multiple random positions within this region
             for _ in range(15):
-                x = x_region + random.uniform(0, max(0.1, w_region - width))
-                y = y_region + random.uniform(0, max(0.1, h_region - height))
+                x = x_region + self.rng.uniform(0, max(0.1, w_region - width))
+                y = y_region + self.rng.uniform(0, max(0.1, h_region - height))
                 
                 # Clamp to plot boundaries
                 x = np.clip(x, 0, self.plot_width - width)
@@ -559,8 +1299,8 @@ class EnhancedConstraintSolver:
         min_overlap = float('inf')
         
         for _ in range(30):
-            x = random.uniform(0, self.plot_width - width)
-            y = random.uniform(0, self.plot_length - height)
+            x = self.rng.uniform(0, self.plot_width - width)
+            y = self.rng.uniform(0, self.plot_length - height)
             
             test_room = {"x": x, "y": y, "width": width, "height": height}
             candidates = self.spatial_index.query_potential_overlaps(test_room)
@@ -620,200 +1360,246 @@ class EnhancedConstraintSolver:
     # SCORING SYSTEM (Enhanced multi-objective)
     # ========================================================================
     
-    def _calculate_metrics(self, positioned_rooms: List[Dict]) -> OptimizationMetrics:
-        """Calculate comprehensive optimization metrics"""
-        
-        metrics = OptimizationMetrics()
+    def _room_terms(self, state: LayoutState, i: int) -> Tuple[float, int, float, int, float, int]:
+        """Per-room score terms: (vastu penalty, vastu violation, aspect penalty,
+        poor ratio, boundary penalty, out-of-bounds count)"""
+        x, y, width, height = state.x[i], state.y[i], state.width[i], state.height[i]
+        code = state.type_codes[i]
+        vastu_penalty, vastu_violation = 0.0, 0
+        aspect_penalty, poor_ratio = 0.0, 0
+        boundary_penalty, out_of_bounds = 0.0, 0
+        
+        # Vastu compliance
+        vastu_pref = VASTU_BY_CODE[code] if code >= 0 else None
+        if vastu_pref:
+            actual_dir = self._get_room_direction(x, y, width, height)
+            if actual_dir in vastu_pref.avoid:
+                vastu_violation = 1
+                vastu_penalty = vastu_pref.weight * 4.0  # Strong penalty
+            elif actual_dir not in vastu_pref.preferred and actual_dir not in vastu_pref.acceptable:
+                vastu_violation = 1
+                vastu_penalty = vastu_pref.weight * 1.5  # Moderate penalty
+        
+        # Aspect ratio
+        constraint = SIZE_CONSTRAINTS_BY_CODE[code] if code >= 0 else None
+        if constraint:
+            ratio = width / height if height > 0 else 1.0
+            deviation = abs(ratio - constraint.ideal_aspect_ratio)
+            if deviation > constraint.aspect_ratio_tolerance:
+                poor_ratio = 1
+                aspect_penalty = (deviation - constraint.aspect_ratio_tolerance) * 10
+        else:
+            # Generic aspect ratio check
+            ratio = max(width, height) / min(width, height)
+            if ratio > 2.5:
+                poor_ratio = 1
+                aspect_penalty = (ratio - 2.5) * 3
+        
+        # Boundary: if a polygon is provided, check center containment; otherwise use rectangular bounds
+        if self.plot_raster is not None:
+            cx = float(x + width / 2.0)
+            cy = float(y + height / 2.0)
+            if not self.plot_raster.contains(cx, cy):
+                proj = self.plot_raster.project(cx, cy)
+                # penalty proportional to distance from valid region
+                d = math.hypot(cx - proj[0], cy - proj[1])
+                boundary_penalty += d * 10
+                out_of_bounds += 1
+        else:
+            if x < 0:
+                boundary_penalty += abs(x) * 10
+                out_of_bounds += 1
+            if y < 0:
+                boundary_penalty += abs(y) * 10
+                out_of_bounds += 1
+            if x + width > self.plot_width:
+                boundary_penalty += (x + width - self.plot_width) * 10
+                out_of_bounds += 1
+            if y + height > self.plot_length:
+                boundary_penalty += (y + height - self.plot_length) * 10
+                out_of_bounds += 1
+        
+        return vastu_penalty, vastu_violation, aspect_penalty, poor_ratio, boundary_penalty, out_of_bounds
+    
+    def _room_terms_batch(self,
+                          codes: np.ndarray,
+                          x: np.ndarray,
+                          y: np.ndarray,
+                          width: np.ndarray,
+                          height: np.ndarray) -> np.ndarray:
+        """`_room_terms` for K rooms at once; returns a (K, 6) array"""
+        # Vastu: direction-grid cell of the center (negative indices wrap like list indexing)
+        band_w, band_h = self.region_table[DIRECTION_CODES[Direction.CENTER], 2:]
+        col = np.minimum(2, np.trunc((x + width / 2) / band_w).astype(np.int64)) % 3
+        row = np.minimum(2, np.trunc((y + height / 2) / band_h).astype(np.int64)) % 3
+        cell = row * 3 + col
+        vastu_penalty = VASTU_GRID_PENALTY[codes, cell]
+        vastu_violation = VASTU_GRID_VIOLATION[codes, cell]
+        
+        # Aspect ratio (per-type tolerance, else the generic 2.5 limit)
+        constrained = HAS_SIZE_CONSTRAINT[codes]
+        ideal, tolerance = SIZE_LIMITS[codes, 4], SIZE_LIMITS[codes, 5]
+        deviation = np.abs(np.where(height > 0, width / np.where(height > 0, height, 1.0), 1.0) - ideal)
+        generic = np.maximum(width, height) / np.minimum(width, height)
+        poor_ratio = np.where(constrained, deviation > tolerance, generic > 2.5)
+        aspect_penalty = np.where(
+            poor_ratio, np.where(constrained, (deviation - tolerance) * 10, (generic - 2.5) * 3), 0.0
+        )
         
-        # 1. OVERLAP PENALTY (highest priority)
-        total_overlap = 0.0
-        overlap_count = 0
+        # Boundary
+        if self.plot_raster is not None:
+            boundary_penalty = np.zeros(len(codes))
+            out_of_bounds = np.zeros(len(codes), dtype=np.int64)
+            for k, (cx, cy) in enumerate(zip((x + width / 2.0).tolist(), (y + height / 2.0).tolist())):
+                if not self.plot_raster.contains(cx, cy):
+                    proj = self.plot_raster.project(cx, cy)
+                    boundary_penalty[k] = math.hypot(cx - proj[0], cy - proj[1]) * 10
+                    out_of_bounds[k] = 1
+        else:
+            right = x + width - self.plot_width
+            bottom = y + height - self.plot_length
+            boundary_penalty = (np.maximum(-x, 0) + np.maximum(-y, 0) + np.maximum(right, 0) + np.maximum(bottom, 0)) * 10
+            out_of_bounds = (x < 0).astype(np.int64) + (y < 0) + (right > 0) + (bottom > 0)
         
-        for i in range(len(positioned_rooms)):
-            for j in range(i + 1, len(positioned_rooms)):
-                overlap = self._calculate_overlap_area(positioned_rooms[i], positioned_rooms[j])
-                if overlap > 0:
-                    total_overlap += overlap
-                    overlap_count += 1
+        return np.stack([vastu_penalty, vastu_violation, aspect_penalty, poor_ratio,
+                         boundary_penalty, out_of_bounds], axis=1).astype(float)
+    
+    def _adjacency_raw(self, state: LayoutState) -> float:
+        """Unscaled adjacency reward summed over ADJACENCY_PREFERENCES"""
+        return state.adjacency.score(state.x, state.y, state.width, state.height)
+    
+    def _score_components(self,
+                          total_overlap,
+                          overlap_count,
+                          room_totals,
+                          total_room_area,
+                          adjacency_raw,
+                          circulation_penalty) -> Tuple:
+        """
+        Weighted sub-scores and total from aggregated score terms.
+        Works element-wise on scalars or on arrays of candidate layouts.
+        """
+        vastu_penalty, _, aspect_penalties, _, boundary_penalty, _ = room_totals
         
-        metrics.total_overlap_area = total_overlap
-        metrics.overlap_score = max(0, 100 - total_overlap * 25 - overlap_count * 5)
+        # 1. OVERLAP PENALTY (highest priority)
+        overlap_score = np.maximum(0, 100 - total_overlap * 25 - overlap_count * 5)
         
         # 2. VASTU COMPLIANCE
-        vastu_violations = 0
-        vastu_penalty = 0.0
-        
-        for room in positioned_rooms:
-            room_type = room["type"]
-            vastu_pref = VASTU_PREFERENCES.get(room_type)
-            
-            if not vastu_pref:
-                continue
-            
-            # Get room's actual direction
-            actual_dir = self._get_room_direction(
-                room["x"], room["y"], room["width"], room["height"]
-            )
-            
-            # Check compliance
-            if actual_dir in vastu_pref.avoid:
-                vastu_violations += 1
-                vastu_penalty += vastu_pref.weight * 4.0  # Strong penalty
-            elif actual_dir not in vastu_pref.preferred and actual_dir not in vastu_pref.acceptable:
-                vastu_violations += 1
-                vastu_penalty += vastu_pref.weight * 1.5  # Moderate penalty
-        
-        metrics.vastu_violations = vastu_violations
-        metrics.vastu_score = max(0, 100 - vastu_penalty * self.vastu_weight * 8)
+        vastu_score = np.maximum(0, 100 - vastu_penalty * self.vastu_weight * 8)
         
         # 3. SPACE UTILIZATION
-        total_room_area = sum(r["width"] * r["height"] for r in positioned_rooms)
         utilization = (total_room_area / self.plot_area) * 100
         # Target 65-75% utilization
-        if 65 <= utilization <= 75:
-            metrics.space_utilization = 100
-        else:
-            metrics.space_utilization = max(0, 100 - abs(utilization - 70) * 2)
+        space_utilization = np.where(
+            (65 <= utilization) & (utilization <= 75), 100, np.maximum(0, 100 - np.abs(utilization - 70) * 2)
+        )
         
         # 4. ASPECT RATIO SCORE
-        aspect_penalties = 0.0
-        poor_ratios = 0
-        
-        for room in positioned_rooms:
-            constraint = ROOM_SIZE_CONSTRAINTS.get(room["type"])
-            if constraint:
-                ratio = room["width"] / room["height"] if room["height"] > 0 else 1.0
-                ideal = constraint.ideal_aspect_ratio
-                tolerance = constraint.aspect_ratio_tolerance
-                
-                deviation = abs(ratio - ideal)
-                if deviation > tolerance:
-                    poor_ratios += 1
-                    aspect_penalties += (deviation - tolerance) * 10
-            else:
-                # Generic aspect ratio check
-                ratio = max(room["width"], room["height"]) / min(room["width"], room["height"])
-                if ratio > 2.5:
-                    poor_ratios += 1
-                    aspect_penalties += (ratio - 2.5) * 3
-        
-        metrics.poor_aspect_ratios = poor_ratios
-        metrics.aspect_ratio_score = max(0, 100 - aspect_penalties)
+        aspect_ratio_score = np.maximum(0, 100 - aspect_penalties)
         
         # 5. ADJACENCY SCORE
-        adjacency_score = 0.0
-        
-        for type1, type2, ideal_dist, weight in ADJACENCY_PREFERENCES:
-            room1 = next((r for r in positioned_rooms if type1 in r["type"]), None)
-            room2 = next((r for r in positioned_rooms if type2 in r["type"]), None)
-            
-            if room1 and room2:
-                dist = self._calculate_distance(room1, room2)
-                # Score based on how close to ideal distance
-                if dist <= ideal_dist:
-                    adjacency_score += weight * 10
-                else:
-                    # Penalty increases with distance
-                    penalty = min(weight * 10, weight * 10 * (ideal_dist / dist))
-                    adjacency_score += penalty
-        
-        metrics.adjacency_score = min(100, adjacency_score * 2)
+        adjacency_score = np.minimum(100, adjacency_raw * 2)
         
         # 6. BOUNDARY SCORE (rooms within plot)
-        out_of_bounds = 0
-        boundary_penalty = 0.0
-        
-        for room in positioned_rooms:
-            # If a polygon is provided, check center containment; otherwise use rectangular bounds
-            if getattr(self, "plot_polygon", None):
-                cx = room["x"] + room["width"] / 2.0
-                cy = room["y"] + room["height"] / 2.0
-                if not gu.point_in_polygon((float(cx), float(cy)), self.plot_polygon):
-                    proj = gu.project_point_inside((float(cx), float(cy)), self.plot_polygon)
-                    # penalty proportional to distance from valid region
-                    d = math.hypot(cx - proj[0], cy - proj[1])
-                    boundary_penalty += d * 10
-                    out_of_bounds += 1
-            else:
-                if room["x"] < 0:
-                    boundary_penalty += abs(room["x"]) * 10
-                    out_of_bounds += 1
-                if room["y"] < 0:
-                    boundary_penalty += abs(room["y"]) * 10
-                    out_of_bounds += 1
-                if room["x"] + room["width"] > self.plot_width:
-                    boundary_penalty += (room["x"] + room["width"] - self.plot_width) * 10
-                    out_of_bounds += 1
-                if room["y"] + room["height"] > self.plot_length:
-                    boundary_penalty += (room["y"] + room["height"] - self.plot_length) * 10
-                    out_of_bounds += 1
-        
-        metrics.out_of_bounds_count = out_of_bounds
-        metrics.boundary_score = max(0, 100 - boundary_penalty)
+        boundary_score = np.maximum(0, 100 - boundary_penalty)
         
         # 7. CIRCULATION SCORE (space for corridors/movement)
-        # Check if there's reasonable spacing between rooms
-        circulation_penalty = 0.0
-        tight_spaces = 0
-        
-        for i in range(len(positioned_rooms)):
-            for j in range(i + 1, len(positioned_rooms)):
-                r1, r2 = positioned_rooms[i], positioned_rooms[j]
-                
-                # Calculate minimum gap
-                x_gap = max(0, min(
-                    abs(r1["x"] + r1["width"] - r2["x"]),
-                    abs(r2["x"] + r2["width"] - r1["x"])
-                ))
-                y_gap = max(0, min(
-                    abs(r1["y"] + r1["height"] - r2["y"]),
-                    abs(r2["y"] + r2["height"] - r1["y"])
-                ))
-                
-                min_gap = min(x_gap, y_gap)
-                
-                # Penalize if rooms are too close (less than 0.5m apart)
-                if 0 < min_gap < 0.5:
-                    tight_spaces += 1
-                    circulation_penalty += (0.5 - min_gap) * 20
-        
-        metrics.circulation_score = max(0, 100 - circulation_penalty)
+        circulation_score = np.maximum(0, 100 - circulation_penalty)
         
         # TOTAL SCORE (weighted combination)
-        metrics.total_score = (
-            metrics.overlap_score * 0.35 +       # 35% - most critical
-            metrics.boundary_score * 0.20 +      # 20% - must fit in plot
-            metrics.vastu_score * 0.20 +         # 20% - vastu compliance
-            metrics.space_utilization * 0.10 +   # 10% - efficient use
-            metrics.aspect_ratio_score * 0.07 +  # 7% - good proportions
-            metrics.adjacency_score * 0.05 +     # 5% - functional layout
-            metrics.circulation_score * 0.03     # 3% - movement space
+        total_score = (
+            overlap_score * 0.35 +       # 35% - most critical
+            boundary_score * 0.20 +      # 20% - must fit in plot
+            vastu_score * 0.20 +         # 20% - vastu compliance
+            space_utilization * 0.10 +   # 10% - efficient use
+            aspect_ratio_score * 0.07 +  # 7% - good proportions
+            adjacency_score * 0.05 +     # 5% - functional layout
+            circulation_score * 0.03     # 3% - movement space
         )
         
+        return (overlap_score, vastu_score, space_utilization, aspect_ratio_score,
+                adjacency_score, boundary_score, circulation_score, total_score)
+    
+    def _compose_metrics(self,
+                         total_overlap: float,
+                         overlap_count: int,
+                         room_totals: Tuple[float, int, float, int, float, int],
+                         total_room_area: float,
+                         adjacency_raw: float,
+                         circulation_penalty: float) -> OptimizationMetrics:
+        """Turn aggregated score terms into weighted metrics"""
+        _, vastu_violations, _, poor_ratios, _, out_of_bounds = room_totals
+        scores = self._score_components(
+            total_overlap, overlap_count, room_totals, total_room_area, adjacency_raw, circulation_penalty
+        )
+        
+        metrics = OptimizationMetrics()
+        (metrics.overlap_score, metrics.vastu_score, metrics.space_utilization, metrics.aspect_ratio_score,
+         metrics.adjacency_score, metrics.boundary_score, metrics.circulation_score,
+         metrics.total_score) = (float(score) for score in scores)
+        metrics.total_overlap_area = total_overlap
+        metrics.vastu_violations = int(vastu_violations)
+        metrics.poor_aspect_ratios = int(poor_ratios)
+        metrics.out_of_bounds_count = int(out_of_bounds)
+        
         return metrics
     
+    def _calculate_metrics(self, state: LayoutState) -> OptimizationMetrics:
+        """Calculate comprehensive optimization metrics (full recompute)"""
+        n = len(state)
+        
+        # Pairwise terms: overlap and circulation from the N x N matrices
+        # (symmetric with a zero diagonal, so every pair appears twice)
+        x, y, w, h = state.x, state.y, state.width, state.height
+        overlap, gap = pairwise_overlap_gap(x, y, w, h)
+        total_overlap = float(overlap.sum()) / 2
+        overlap_count = int(np.count_nonzero(overlap > 0)) // 2
+        total_circulation = float(circulation_penalty(gap).sum()) / 2
+        
+        # Per-room terms: vastu, aspect ratio, boundary
+        room_totals = [0.0, 0, 0.0, 0, 0.0, 0]
+        for i in range(n):
+            for k, value in enumerate(self._room_terms(state, i)):
+                room_totals[k] += value
+        
+        total_room_area = float(np.sum(state.width * state.height))
+        
+        return self._compose_metrics(
+            total_overlap,
+            overlap_count,
+            tuple(room_totals),
+            total_room_area,
+            self._adjacency_raw(state),
+            total_circulation
+        )
+    
     # ========================================================================
     # OPTIMIZATION (Advanced Simulated Annealing with Restart)
     # ========================================================================
     
-    def _optimize_layout(self, rooms: List[Dict[str, Any]]) -> Tuple[List[Dict], OptimizationMetrics]:
-        """
-        Optimize layout using adaptive simulated annealing with:
-        - Temperature decay
-        - Adaptive step sizes
-        - Multiple move types
-        - Automatic restart on stagnation
-        """
-        
-        logger.info(f"Starting optimization: {len(rooms)} rooms, {self.max_iterations} iterations")
-        
+    def _initial_state(self, rooms: List[Dict[str, Any]]) -> LayoutState:
+        """Priority-ordered smart placement of all rooms"""
         # Sort rooms by priority (high priority rooms placed first)
         sorted_rooms = sorted(rooms, key=lambda r: VASTU_PREFERENCES.get(r["type"], VastuPreference([], [], [], 0.5, 999)).priority)
         
         # Initialize rooms with smart placement
+        self.spatial_index.clear()
         positioned_rooms = []
+        warm = self.warm_start
+        if warm is not None:
+            # Edited layout: rooms of the prior layout go first, where they were
+            for room in sorted_rooms:
+                if room["id"] in warm.positions:
+                    x, y = warm.positions[room["id"]]
+                    width, height = warm.sizes[room["id"]]
+                    positioned_rooms.append({"id": room["id"], "name": room["name"], "type": room["type"],
+                                             "x": x, "y": y, "width": width, "height": height,
+                                             "direction": room.get("direction")})
+                    self.spatial_index.insert(len(positioned_rooms) - 1, positioned_rooms[-1])
+            sorted_rooms = [room for room in sorted_rooms if room["id"] not in warm.positions]
         for room in sorted_rooms:
-            width, height = self._get_room_size(room["type"])
+            override = self.size_overrides.get(room["id"])
+            width, height = override if override else self._get_room_size(room["type"])
             x, y = self._get_initial_position(room["type"], width, height, positioned_rooms)
             
             positioned_rooms.append({
@@ -830,93 +1616,173 @@ class EnhancedConstraintSolver:
             # Update spatial index
             self.spatial_index.insert(len(positioned_rooms) - 1, positioned_rooms[-1])
         
-        # Initial metrics
-        best_metrics = self._calculate_metrics(positioned_rooms)
-        best_layout = [r.copy() for r in positioned_rooms]
+        # From here on the layout lives in parallel arrays; moves edit it in place
+        state = LayoutState.from_rooms(positioned_rooms)
+        frozen = warm.frozen_rooms(state.ids, state.x, state.y, state.width, state.height) if warm is not None else set()
+        self.movable = np.array([i for i, room_id in enumerate(state.ids) if room_id not in frozen], dtype=np.int64)
+        if warm is not None:
+            logger.info(f"Warm start: re-optimizing {len(self.movable)} of {len(state)} rooms")
+        return state
+    
+    def _apply_move(self, state: LayoutState, move_type: str, temperature: float) -> List[int]:
+        """Apply a move in place (journaled for undo); returns indices of changed rooms"""
+        if move_type == "translate":
+            return self._try_translation(state, temperature)
+        elif move_type == "swap":
+            return self._try_swap(state)
+        elif move_type == "resize":
+            return self._try_resize(state)
+        else:  # rotate
+            return self._try_rotate(state)
+    
+    def _propose(self, state: LayoutState, scorer: IncrementalMetrics, move_type: str, temperature: float) -> List[int]:
+        """
+        Apply the next trial move in place. In batched mode single-room moves
+        draw batch_size candidates, score them together and apply the one
+        picked by batch_select; swaps always go through `_apply_move`.
+        """
+        if not len(self.movable):
+            return []
+        if self.batch_size == 1 or move_type == "swap":
+            return self._apply_move(state, move_type, temperature)
+        
+        rooms, x, y, width, height = self._propose_batch(state, move_type, temperature)
+        if not len(rooms):
+            return []
+        totals = scorer.score_moves(state, rooms, x, y, width, height)
+        if self.batch_select == "best":
+            k = int(np.argmax(totals))
+        else:
+            weights = np.exp((totals - totals.max()) / max(temperature, 1e-9))
+            k = int(self.rng.choice(len(rooms), p=weights / weights.sum()))
+        
+        i = int(rooms[k])
+        state.save(i)
+        state.x[i], state.y[i], state.width[i], state.height[i] = x[k], y[k], width[k], height[k]
+        return [i]
+    
+    def _propose_batch(self, state: LayoutState, move_type: str, temperature: float) -> Tuple[np.ndarray, ...]:
+        """batch_size candidates of one single-room move type: (rooms, x, y, width, height)"""
+        k = self.batch_size
+        rooms = self.movable[self.rng.integers(len(self.movable), size=k)]
+        x, y = state.x[rooms].copy(), state.y[rooms].copy()
+        width, height = state.width[rooms].copy(), state.height[rooms].copy()
+        
+        if move_type == "translate":
+            max_displacement = min(3.0, 1.5 * temperature)
+            x += self.rng.normal(0, max_displacement, k)
+            y += self.rng.normal(0, max_displacement, k)
+        elif move_type == "resize":
+            codes = state.type_codes[rooms]
+            keep = HAS_SIZE_CONSTRAINT[codes]
+            rooms, x, y, width, height, codes = (a[keep] for a in (rooms, x, y, width, height, codes))
+            limits = SIZE_LIMITS[codes]
+            width = np.clip(width + self.rng.normal(0, 0.2, len(rooms)), limits[:, 0], limits[:, 1])
+            height = np.clip(height + self.rng.normal(0, 0.2, len(rooms)), limits[:, 2], limits[:, 3])
+        else:  # rotate
+            width, height = height, width
+            if self.plot_raster is None:
+                # Rotation only pulls rooms back from the far edges
+                x = np.minimum(x, self.plot_width - width)
+                y = np.minimum(y, self.plot_length - height)
+                return rooms, x, y, width, height
+        
+        self._project_batch_inside(x, y, width, height)
+        return rooms, x, y, width, height
+    
+    def _project_batch_inside(self, x: np.ndarray, y: np.ndarray, width: np.ndarray, height: np.ndarray):
+        """`_project_room_inside` for candidate arrays (in place)"""
+        if self.plot_raster is not None:
+            for k in range(len(x)):
+                cx = float(x[k] + width[k] / 2.0)
+                cy = float(y[k] + height[k] / 2.0)
+                if not self.plot_raster.contains(cx, cy):
+                    proj = self.plot_raster.project(cx, cy)
+                    x[k] = proj[0] - width[k] / 2.0
+                    y[k] = proj[1] - height[k] / 2.0
+        else:
+            x[:] = np.minimum(np.maximum(x, 0), self.plot_width - width)
+            y[:] = np.minimum(np.maximum(y, 0), self.plot_length - height)
+    
+    def _optimize_layout(self, rooms: List[Dict[str, Any]]) -> Tuple[LayoutState, OptimizationMetrics]:
+        """
+        Optimize layout using adaptive simulated annealing with:
+        - Temperature decay
+        - Adaptive step sizes
+        - Multiple move types
+        - Automatic restart on stagnation
+        """
+        
+        logger.info(f"Starting optimization: {len(rooms)} rooms, {self.max_iterations} iterations")
+        
+        state = self._initial_state(rooms)
+        
+        # Initial metrics (incremental engine keeps per-pair/per-room terms)
+        scorer = IncrementalMetrics(self, state, verify=self.verify_incremental)
+        best_metrics = scorer.current
+        best_state = state.copy()
         current_metrics = best_metrics
-        current_layout = [r.copy() for r in positioned_rooms]
         
         self.convergence_history = [best_metrics.total_score]
         
         logger.info(f"Initial score: {best_metrics.total_score:.2f} (overlap: {best_metrics.overlap_score:.1f}, vastu: {best_metrics.vastu_score:.1f})")
         
         # Simulated annealing
+        scheduler = MoveScheduler(self.rng)
         temperature = self.initial_temp
         no_improvement_count = 0
         restart_count = 0
         
+        self.stopped_reason = "max_iterations"
+        self.iterations_run = 0
         for iteration in range(self.max_iterations):
+            if self.deadline.expired():
+                logger.info(f"Deadline reached at iteration {iteration}")
+                self.stopped_reason = "deadline"
+                break
+            self.iterations_run = iteration + 1
+            
             # Check for restart condition
             if no_improvement_count > self.restart_threshold and restart_count < 2:
                 logger.info(f"Restarting optimization at iteration {iteration} (restart #{restart_count + 1})")
                 # Restart with perturbation of best layout
-                current_layout = [r.copy() for r in best_layout]
-                for room in current_layout:
-                    room["x"] += random.gauss(0, 1.0)
-                    room["y"] += random.gauss(0, 1.0)
-                    room["x"] = np.clip(room["x"], 0, self.plot_width - room["width"])
-                    room["y"] = np.clip(room["y"], 0, self.plot_length - room["height"])
+                state = best_state.copy()
+                for i in self.movable:
+                    state.x[i] += self.rng.normal(0, 1.0)
+                    state.y[i] += self.rng.normal(0, 1.0)
+                    state.x[i] = min(max(state.x[i], 0), self.plot_width - state.width[i])
+                    state.y[i] = min(max(state.y[i], 0), self.plot_length - state.height[i])
                 
-                current_metrics = self._calculate_metrics(current_layout)
+                current_metrics = scorer.rebuild(state)
                 temperature = self.initial_temp * 0.5
                 no_improvement_count = 0
                 restart_count += 1
             
-            # Adaptive move strategy
-            if no_improvement_count > 30:
-                # More aggressive exploration
-                move_type = random.choices(
-                    ["translate", "swap", "resize", "rotate"],
-                    weights=[0.4, 0.3, 0.2, 0.1]
-                )[0]
-            elif best_metrics.overlap_score < 80:
-                # Focus on resolving overlaps
-                move_type = random.choices(
-                    ["translate", "swap"],
-                    weights=[0.7, 0.3]
-                )[0]
-            else:
-                # Balanced exploration
-                move_type = random.choices(
-                    ["translate", "swap", "resize", "rotate"],
-                    weights=[0.5, 0.25, 0.15, 0.1]
-                )[0]
-            
-            # Make a copy for trial move
-            trial_layout = [r.copy() for r in current_layout]
+            # Adaptively scheduled move, applied in place (journaled for undo)
+            move = scheduler.choose()
+            changed = self._propose(state, scorer, MOVE_TYPES[move], temperature)
             
-            # Apply move
-            if move_type == "translate":
-                success = self._try_translation(trial_layout, temperature)
-            elif move_type == "swap":
-                success = self._try_swap(trial_layout)
-            elif move_type == "resize":
-                success = self._try_resize(trial_layout)
-            else:  # rotate
-                success = self._try_rotate(trial_layout)
-            
-            if not success:
+            if not changed:
+                scheduler.record(move, 0.0, False)
                 continue
             
-            # Rebuild spatial index for new layout
-            self.spatial_index.clear()
-            for idx, room in enumerate(trial_layout):
-                self.spatial_index.insert(idx, room)
-            
-            # Evaluate new layout
-            new_metrics = self._calculate_metrics(trial_layout)
+            # Evaluate new layout (only terms touched by the moved rooms)
+            new_metrics = scorer.update(state, changed)
             
             # Accept or reject based on Metropolis criterion
             delta = new_metrics.total_score - current_metrics.total_score
+            accepted = delta > 0 or (temperature > 0 and self.rng.random() < math.exp(delta / temperature))
+            scheduler.record(move, delta, accepted)
             
-            if delta > 0 or (temperature > 0 and random.random() < math.exp(delta / temperature)):
+            if accepted:
                 # Accept move
-                current_layout = trial_layout
+                state.commit()
+                scorer.commit()
                 current_metrics = new_metrics
                 
                 if new_metrics.total_score > best_metrics.total_score:
                     best_metrics = new_metrics
-                    best_layout = [r.copy() for r in current_layout]
+                    best_state = state.copy()
                     no_improvement_count = 0
                     
                     if iteration % 20 == 0:
@@ -924,7 +1790,9 @@ class EnhancedConstraintSolver:
                 else:
                     no_improvement_count += 1
             else:
-                # Reject move - keep current layout
+                # Reject move - restore the journaled rooms
+                state.undo()
+                scorer.revert()
                 no_improvement_count += 1
             
             # Track convergence
@@ -939,141 +1807,224 @@ class EnhancedConstraintSolver:
                 best_metrics.boundary_score > 98 and 
                 best_metrics.vastu_score > 85):
                 logger.info(f"Excellent solution found at iteration {iteration}")
+                self.stopped_reason = "converged"
                 break
         
+        self.optimizer_stats = scheduler.stats()
         logger.info(f"Optimization complete: Final score = {best_metrics.total_score:.2f}")
         logger.info(f"  Overlap: {best_metrics.overlap_score:.1f}, Vastu: {best_metrics.vastu_score:.1f}, Boundary: {best_metrics.boundary_score:.1f}")
         
-        return best_layout, best_metrics
+        return best_state, best_metrics
+    
+    def _optimize_tempering(self, rooms: List[Dict[str, Any]]) -> Tuple[LayoutState, OptimizationMetrics]:
+        """
+        Optimize layout with replica exchange (parallel tempering):
+        - A geometric ladder of fixed temperatures, one replica per rung
+        - Replicas advance in lockstep using the annealing move set
+        - Neighbouring rungs periodically try to swap configurations, so
+          cold replicas escape local minima through hotter ones
+        
+        max_iterations budgets move evaluations, as in annealing: each
+        lockstep step costs one evaluation per replica.
+        """
+        n_replicas = self.tempering_replicas
+        temperatures = [float(t) for t in np.geomspace(TEMPERING_MIN_TEMP, self.initial_temp, n_replicas)]
+        n_steps = max(1, self.max_iterations // n_replicas)
+        
+        logger.info(f"Starting parallel tempering: {len(rooms)} rooms, {n_replicas} replicas, {n_steps} steps")
+        
+        replicas = []
+        for _ in range(n_replicas):
+            state = self._initial_state(rooms)
+            scorer = IncrementalMetrics(self, state, verify=self.verify_incremental)
+            replicas.append(TemperingReplica(state, scorer, scorer.current))
+        
+        best_replica = max(replicas, key=lambda r: r.metrics.total_score)
+        best_metrics = best_replica.metrics
+        best_state = best_replica.state.copy()
+        self.convergence_history = [best_metrics.total_score]
+        
+        swap_attempts = 0
+        swap_accepts = 0
+        evaluations = 0
+        scheduler = MoveScheduler(self.rng)  # Shared by all rungs
+        
+        self.stopped_reason = "max_iterations"
+        for step in range(n_steps):
+            if self.deadline.expired():
+                logger.info(f"Deadline reached at step {step}")
+                self.stopped_reason = "deadline"
+                break
+            
+            # One Metropolis move per replica at its rung's temperature
+            for replica, temperature in zip(replicas, temperatures):
+                evaluations += 1
+                move = scheduler.choose()
+                changed = self._propose(replica.state, replica.scorer, MOVE_TYPES[move], temperature)
+                if not changed:
+                    scheduler.record(move, 0.0, False)
+                    continue
+                
+                new_metrics = replica.scorer.update(replica.state, changed)
+                delta = new_metrics.total_score - replica.metrics.total_score
+                accepted = delta > 0 or self.rng.random() < math.exp(delta / temperature)
+                scheduler.record(move, delta, accepted)
+                
+                if accepted:
+                    replica.state.commit()
+                    replica.scorer.commit()
+                    replica.metrics = new_metrics
+                    
+                    if new_metrics.total_score > best_metrics.total_score:
+                        best_metrics = new_metrics
+                        best_state = replica.state.copy()
+                else:
+                    replica.state.undo()
+                    replica.scorer.revert()
+            
+            # Exchange configurations between neighbouring rungs (even/odd pairs alternate)
+            if (step + 1) % TEMPERING_SWAP_INTERVAL == 0:
+                parity = ((step + 1) // TEMPERING_SWAP_INTERVAL) % 2
+                for k in range(parity, n_replicas - 1, 2):
+                    cold, hot = replicas[k], replicas[k + 1]
+                    log_ratio = ((hot.metrics.total_score - cold.metrics.total_score) *
+                                 (1.0 / temperatures[k] - 1.0 / temperatures[k + 1]))
+                    swap_attempts += 1
+                    if log_ratio >= 0 or self.rng.random() < math.exp(log_ratio):
+                        replicas[k], replicas[k + 1] = hot, cold
+                        swap_accepts += 1
+            
+            # Track convergence
+            if step % 5 == 0:
+                self.convergence_history.append(best_metrics.total_score)
+            
+            # Early stopping if excellent solution found
+            if (best_metrics.overlap_score > 98 and 
+                best_metrics.boundary_score > 98 and 
+                best_metrics.vastu_score > 85):
+                logger.info(f"Excellent solution found at step {step}")
+                self.stopped_reason = "converged"
+                break
+        
+        self.optimizer_stats = {
+            **scheduler.stats(),
+            "tempering_replicas": float(n_replicas),
+            "move_evaluations": float(evaluations),
+            "swap_acceptance_rate": swap_accepts / swap_attempts if swap_attempts else 0.0,
+        }
+        self.iterations_run = evaluations
+        logger.info(f"Parallel tempering complete: Final score = {best_metrics.total_score:.2f}")
+        
+        return best_state, best_metrics
+    
+    def _optimize(self, rooms: List[Dict[str, Any]]) -> Tuple[LayoutState, OptimizationMetrics]:
+        """Run a single optimizer chain with the configured strategy"""
+        if self.strategy == "tempering":
+            return self._optimize_tempering(rooms)
+        return self._optimize_layout(rooms)
+    
+    def _project_room_inside(self, state: LayoutState, i: int):
+        """Pull room i back inside the plot (polygon-aware if available, else rectangular clip)"""
+        if self.plot_raster is not None:
+            # Project center into polygon if needed
+            cx = float(state.x[i] + state.width[i] / 2.0)
+            cy = float(state.y[i] + state.height[i] / 2.0)
+            if not self.plot_raster.contains(cx, cy):
+                proj = self.plot_raster.project(cx, cy)
+                state.x[i] = proj[0] - state.width[i] / 2.0
+                state.y[i] = proj[1] - state.height[i] / 2.0
+        else:
+            state.x[i] = min(max(state.x[i], 0), self.plot_width - state.width[i])
+            state.y[i] = min(max(state.y[i], 0), self.plot_length - state.height[i])
+    
+    def _random_room(self) -> int:
+        """Index of a random movable room (every room unless a warm start froze some)"""
+        return int(self.movable[self.rng.integers(len(self.movable))])
     
-    def _try_translation(self, rooms: List[Dict], temperature: float) -> bool:
-        """Try translating a random room"""
-        room_idx = random.randint(0, len(rooms) - 1)
-        room = rooms[room_idx]
+    def _try_translation(self, state: LayoutState, temperature: float) -> List[int]:
+        """Try translating a random room; returns indices of changed rooms"""
+        room_idx = self._random_room()
+        state.save(room_idx)
         
         # Adaptive step size based on temperature
         max_displacement = min(3.0, 1.5 * temperature)
-        dx = random.gauss(0, max_displacement)
-        dy = random.gauss(0, max_displacement)
+        dx = self.rng.normal(0, max_displacement)
+        dy = self.rng.normal(0, max_displacement)
         
         # Apply move
-        room["x"] = room["x"] + dx
-        room["y"] = room["y"] + dy
-
-        # Enforce boundaries: polygon-aware if available, else rectangular clip
-        if getattr(self, "plot_polygon", None):
-            # Project center into polygon if needed
-            cx = room["x"] + room["width"] / 2.0
-            cy = room["y"] + room["height"] / 2.0
-            if not gu.point_in_polygon((float(cx), float(cy)), self.plot_polygon):
-                proj = gu.project_point_inside((float(cx), float(cy)), self.plot_polygon)
-                room["x"] = proj[0] - room["width"] / 2.0
-                room["y"] = proj[1] - room["height"] / 2.0
-        else:
-            room["x"] = np.clip(room["x"], 0, self.plot_width - room["width"])
-            room["y"] = np.clip(room["y"], 0, self.plot_length - room["height"])
+        state.x[room_idx] += dx
+        state.y[room_idx] += dy
+        self._project_room_inside(state, room_idx)
         
-        return True
+        return [room_idx]
     
-    def _try_swap(self, rooms: List[Dict]) -> bool:
-        """Try swapping positions of two rooms"""
-        if len(rooms) < 2:
-            return False
+    def _try_swap(self, state: LayoutState) -> List[int]:
+        """Try swapping positions of two rooms; returns indices of changed rooms"""
+        if len(self.movable) < 2:
+            return []
         
-        idx1, idx2 = random.sample(range(len(rooms)), 2)
-        room1, room2 = rooms[idx1], rooms[idx2]
-        
-        # Save original positions
-        orig_x1, orig_y1 = room1["x"], room1["y"]
+        idx1, idx2 = self.movable[self.rng.choice(len(self.movable), size=2, replace=False)].tolist()
+        state.save(idx1)
+        state.save(idx2)
         
         # Swap positions
-        room1["x"], room2["x"] = room2["x"], orig_x1
-        room1["y"], room2["y"] = room2["y"], orig_y1
-        
-        # Ensure both rooms fit (polygon-aware if available)
-        for r in (room1, room2):
-            if getattr(self, "plot_polygon", None):
-                cx = r["x"] + r["width"] / 2.0
-                cy = r["y"] + r["height"] / 2.0
-                if not gu.point_in_polygon((float(cx), float(cy)), self.plot_polygon):
-                    proj = gu.project_point_inside((float(cx), float(cy)), self.plot_polygon)
-                    r["x"] = proj[0] - r["width"] / 2.0
-                    r["y"] = proj[1] - r["height"] / 2.0
-            else:
-                r["x"] = np.clip(r["x"], 0, self.plot_width - r["width"])
-                r["y"] = np.clip(r["y"], 0, self.plot_length - r["height"])
+        state.x[idx1], state.x[idx2] = state.x[idx2], state.x[idx1]
+        state.y[idx1], state.y[idx2] = state.y[idx2], state.y[idx1]
+        
+        # Ensure both rooms fit
+        self._project_room_inside(state, idx1)
+        self._project_room_inside(state, idx2)
         
-        return True
+        return [idx1, idx2]
     
-    def _try_resize(self, rooms: List[Dict]) -> bool:
-        """Try resizing a room slightly"""
-        room_idx = random.randint(0, len(rooms) - 1)
-        room = rooms[room_idx]
+    def _try_resize(self, state: LayoutState) -> List[int]:
+        """Try resizing a room slightly; returns indices of changed rooms"""
+        room_idx = self._random_room()
         
         # Get constraints
-        constraint = ROOM_SIZE_CONSTRAINTS.get(room["type"])
+        code = state.type_codes[room_idx]
+        constraint = SIZE_CONSTRAINTS_BY_CODE[code] if code >= 0 else None
         if not constraint:
-            return False
+            return []
+        state.save(room_idx)
         
         # Small resize with aspect ratio preservation
-        delta_w = random.gauss(0, 0.2)
-        delta_h = random.gauss(0, 0.2)
+        delta_w = self.rng.normal(0, 0.2)
+        delta_h = self.rng.normal(0, 0.2)
         
-        room["width"] = np.clip(
-            room["width"] + delta_w,
-            constraint.min_width,
-            constraint.max_width
-        )
-        room["height"] = np.clip(
-            room["height"] + delta_h,
-            constraint.min_height,
-            constraint.max_height
-        )
+        state.width[room_idx] = min(max(state.width[room_idx] + delta_w, constraint.min_width), constraint.max_width)
+        state.height[room_idx] = min(max(state.height[room_idx] + delta_h, constraint.min_height), constraint.max_height)
         
-        # Ensure still within plot (polygon-aware if available)
-        if getattr(self, "plot_polygon", None):
-            cx = room["x"] + room["width"] / 2.0
-            cy = room["y"] + room["height"] / 2.0
-            if not gu.point_in_polygon((float(cx), float(cy)), self.plot_polygon):
-                proj = gu.project_point_inside((float(cx), float(cy)), self.plot_polygon)
-                room["x"] = proj[0] - room["width"] / 2.0
-                room["y"] = proj[1] - room["height"] / 2.0
-        else:
-            room["x"] = np.clip(room["x"], 0, self.plot_width - room["width"])
-            room["y"] = np.clip(room["y"], 0, self.plot_length - room["height"])
+        # Ensure still within plot
+        self._project_room_inside(state, room_idx)
         
-        return True
+        return [room_idx]
     
-    def _try_rotate(self, rooms: List[Dict]) -> bool:
-        """Try rotating a room (swap width and height)"""
-        room_idx = random.randint(0, len(rooms) - 1)
-        room = rooms[room_idx]
+    def _try_rotate(self, state: LayoutState) -> List[int]:
+        """Try rotating a room (swap width and height); returns indices of changed rooms"""
+        room_idx = self._random_room()
+        state.save(room_idx)
         
         # Swap dimensions
-        room["width"], room["height"] = room["height"], room["width"]
+        state.width[room_idx], state.height[room_idx] = state.height[room_idx], state.width[room_idx]
         
         # Ensure still within plot
-        if getattr(self, "plot_polygon", None):
-            cx = room["x"] + room["width"] / 2.0
-            cy = room["y"] + room["height"] / 2.0
-            if not gu.point_in_polygon((float(cx), float(cy)), self.plot_polygon):
-                proj = gu.project_point_inside((float(cx), float(cy)), self.plot_polygon)
-                room["x"] = proj[0] - room["width"] / 2.0
-                room["y"] = proj[1] - room["height"] / 2.0
+        if self.plot_raster is not None:
+            self._project_room_inside(state, room_idx)
         else:
-            if room["x"] + room["width"] > self.plot_width:
-                room["x"] = self.plot_width - room["width"]
-            if room["y"] + room["height"] > self.plot_length:
-                room["y"] = self.plot_length - room["height"]
+            if state.x[room_idx] + state.width[room_idx] > self.plot_width:
+                state.x[room_idx] = self.plot_width - state.width[room_idx]
+            if state.y[room_idx] + state.height[room_idx] > self.plot_length:
+                state.y[room_idx] = self.plot_length - state.height[room_idx]
         
-        return True
+        return [room_idx]
     
     # ========================================================================
     # SUGGESTIONS & WARNINGS
     # ========================================================================
     
     def _generate_suggestions(self, 
-                              positioned_rooms: List[Dict], 
+                              state: LayoutState, 
                               metrics: OptimizationMetrics) -> Tuple[List[str], List[str]]:
         """Generate actionable suggestions and warnings"""
         
@@ -1097,17 +2048,18 @@ class EnhancedConstraintSolver:
         # 3. Vastu compliance
         if metrics.vastu_score < 70:
             vastu_issues = []
-            for room in positioned_rooms:
-                vastu_pref = VASTU_PREFERENCES.get(room["type"])
+            for i in range(len(state)):
+                code = state.type_codes[i]
+                vastu_pref = VASTU_BY_CODE[code] if code >= 0 else None
                 if not vastu_pref:
                     continue
                 
                 actual_dir = self._get_room_direction(
-                    room["x"], room["y"], room["width"], room["height"]
+                    state.x[i], state.y[i], state.width[i], state.height[i]
                 )
                 
                 if actual_dir in vastu_pref.avoid:
-                    vastu_issues.append((room["name"], actual_dir, vastu_pref.preferred))
+                    vastu_issues.append((state.names[i], actual_dir, vastu_pref.preferred))
             
             if vastu_issues:
                 warnings.append(f"{len(vastu_issues)} room(s) in non-compliant Vastu directions.")
@@ -1117,7 +2069,7 @@ class EnhancedConstraintSolver:
                     )
         
         # 4. Space utilization
-        utilization = (sum(r["width"] * r["height"] for r in positioned_rooms) / self.plot_area) * 100
+        utilization = (float(np.sum(state.width * state.height)) / self.plot_area) * 100
         
         if utilization > 85:
             warnings.append(f"Very high space utilization ({utilization:.1f}%). Limited circulation space.")
@@ -1141,6 +2093,114 @@ class EnhancedConstraintSolver:
         
         return warnings, suggestions
     
+    # ========================================================================
+    # MULTI-CHAIN ANNEALING
+    # ========================================================================
+    
+    def _chain_seeds(self) -> List[np.random.SeedSequence]:
+        """Independent per-chain seeds spawned from the solver seed (reproducible), or from the solver RNG"""
+        if self.seed is None:
+            return self.rng.bit_generator.seed_seq.spawn(self.chains)
+        return np.random.SeedSequence(self.seed).spawn(self.chains)
+    
+    def _chain_tasks(self, rooms: List[Dict[str, Any]]) -> List[ChainTask]:
+        """Per-chain inputs: room specs, plot geometry and settings, never the solver itself"""
+        solver_args = dict(
+            plot_width=self.plot_width,
+            plot_length=self.plot_length,
+            plot_polygon=self.plot_polygon,
+            optimization_level=self.optimization_level,
+            vastu_school=self.vastu_school,
+            verify_incremental=self.verify_incremental,
+            strategy=self.strategy,
+            raster_resolution=self.raster_resolution,
+            exact_geometry=self.exact_geometry,
+            batch_size=self.batch_size,
+            batch_select=self.batch_select,
+            feasibility=self.feasibility
+        )
+        return [
+            ChainTask(rooms, solver_args, chain_seed, self.deadline, self.warm_start, self.size_overrides)
+            for chain_seed in self._chain_seeds()
+        ]
+    
+    def _optimize_chains(self, rooms: List[Dict[str, Any]]) -> Tuple[LayoutState, OptimizationMetrics]:
+        """
+        Run independent annealing chains (in a process pool when possible)
+        and keep the best layout. Ties go to the lowest chain index, so the
+        result only depends on the seed, not on scheduling.
+        """
+        tasks = self._chain_tasks(rooms)
+        workers = min(self.chains, self.max_workers or os.cpu_count() or 1)
+        
+        results = None
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(_run_chain, tasks))
+            except Exception as e:
+                logger.warning(f"Process pool unavailable ({e}); running {self.chains} chains sequentially")
+        if results is None:
+            results = [_run_chain(task) for task in tasks]
+        
+        best_idx = 0
+        for idx, result in enumerate(results):
+            if result.metrics.total_score > results[best_idx].metrics.total_score:
+                best_idx = idx
+        
+        best = results[best_idx]
+        best_state, best_metrics = best.state, best.metrics
+        self.stopped_reason = best.stopped_reason
+        if any(result.stopped_reason == "deadline" for result in results):
+            # Some chain was cut short, so the pooled result is time-limited too
+            self.stopped_reason = "deadline"
+        self.chain_histories = [result.history for result in results]
+        self.optimizer_stats = best.stats  # Reported for the winning chain
+        self.iterations_run = best.iterations
+        self.convergence_history = best.history
+        logger.info(f"{self.chains} chains complete: best chain {best_idx} with score {best_metrics.total_score:.2f}")
+        
+        return best_state, best_metrics
+    
+    # ========================================================================
+    # FEASIBILITY PRE-CHECK
+    # ========================================================================
+    
+    def _room_footprints(self, rooms: List[Dict[str, Any]]) -> List[fz.RoomFootprint]:
+        """Preferred and minimum sizes (from ROOM_SIZE_CONSTRAINTS) of the requested rooms"""
+        footprints = []
+        for room in rooms:
+            constraint = ROOM_SIZE_CONSTRAINTS.get(room["type"])
+            if constraint:
+                preferred = (constraint.preferred_width, constraint.preferred_height)
+                minimum = (constraint.min_width, constraint.min_height)
+                if minimum[0] * minimum[1] < constraint.min_area:
+                    minimum = fz.scale_to_area(*minimum, constraint.min_area)
+            else:
+                preferred = minimum = (4.0, 4.0)  # Default size of unconstrained types
+            vastu_pref = VASTU_PREFERENCES.get(room["type"])
+            zone = vastu_pref.preferred[0].value if vastu_pref and len(vastu_pref.preferred) == 1 else None
+            footprints.append(fz.RoomFootprint(room["id"], room["type"], preferred, minimum, zone))
+        return footprints
+    
+    def _infeasible_response(self, report: fz.FeasibilityReport) -> SolverResponse:
+        """Early exit: no layout, just the report"""
+        logger.info(f"Infeasible room program: {'; '.join(report.issues) or 'rooms exceed the plot at preferred size'}")
+        issues = report.issues or [
+            f"Rooms do not fit the plot at their preferred sizes "
+            f"({report.preferred_area:.1f} m² requested, plot has {report.plot_area:.1f} m²)"
+        ]
+        return SolverResponse(
+            rooms=[],
+            score=0.0,
+            iterations=0,
+            solver_type="enhanced_constraint",
+            warnings=issues + report.warnings,
+            suggestions=["Reduce the number or size of rooms, or use a larger plot"],
+            stopped_reason="infeasible",
+            feasibility=report.to_dict()
+        )
+    
     # ========================================================================
     # MAIN SOLVE METHOD
     # ========================================================================
@@ -1159,30 +2219,50 @@ class EnhancedConstraintSolver:
             if request.plot_width <= 0 or request.plot_length <= 0:
                 raise ValueError("Invalid plot dimensions")
             
+            self.deadline = Deadline(self.deadline_ms)
+            self.warm_start = ws.WarmStart.from_request(request.rooms, request.prior_layout, request.locked_room_ids,
+                                                        request.changed_room_ids, request.impact_radius)
+            
+            # Cheap lower bounds first: never anneal a program that cannot fit
+            report = None
+            self.size_overrides = {}
+            if self.feasibility != "ignore":
+                footprints = self._room_footprints(request.rooms)
+                report = fz.analyze(footprints, self.plot_width, self.plot_length,
+                                    polygon=self.plot_polygon, raster=self.plot_raster,
+                                    max_fill=fz.MAX_FILL if self.feasibility == "pack" else 1.0)
+                if not report.feasible or (self.feasibility == "report" and not report.fits_preferred):
+                    return self._infeasible_response(report)
+                if self.feasibility in ("shrink", "pack"):
+                    self.size_overrides = {f.id: f.minimum for f in footprints if f.id in report.shrink}
+            
             # Run optimization
-            positioned_rooms, metrics = self._optimize_layout(request.rooms)
+            if self.chains > 1:
+                state, metrics = self._optimize_chains(request.rooms)
+            else:
+                state, metrics = self._optimize(request.rooms)
             
             # Generate suggestions and warnings
-            warnings, suggestions = self._generate_suggestions(positioned_rooms, metrics)
+            warnings, suggestions = self._generate_suggestions(state, metrics)
+            if report is not None:
+                warnings = report.warnings + warnings
+                if self.size_overrides:
+                    warnings.insert(0, f"Shrunk {len(self.size_overrides)} rooms to their minimum size to fit the plot")
             
-            # Create response with positioned rooms
+            # Create response with positioned rooms (the only conversion to Room models)
             result_rooms = []
-            for room_data in positioned_rooms:
+            for i in range(len(state)):
+                x, y = float(state.x[i]), float(state.y[i])
+                width, height = float(state.width[i]), float(state.height[i])
                 room = Room(
-                    id=room_data["id"],
-                    name=room_data["name"],
-                    type=room_data["type"],
-                    x=round(room_data["x"], 2),
-                    y=round(room_data["y"], 2),
-                    width=round(room_data["width"], 2),
-                    height=round(room_data["height"], 2),
-                    direction=self._get_room_direction(
-                        room_data["x"], 
-                        room_data["y"], 
-                        room_data["width"], 
-                        room_data["height"]
-                    ).value,
-                    floor=room_data.get("floor", 0)
+                    id=state.ids[i],
+                    name=state.names[i],
+                    type=state.types[i],
+                    x=round(x, 2),
+                    y=round(y, 2),
+                    width=round(width, 2),
+                    height=round(height, 2),
+                    direction=self._get_room_direction(x, y, width, height).value
                 )
                 room.calculate_area()
                 result_rooms.append(room)
@@ -1190,12 +2270,15 @@ class EnhancedConstraintSolver:
             return SolverResponse(
                 rooms=result_rooms,
                 score=round(metrics.total_score, 2),
-                iterations=self.max_iterations,
+                iterations=self.iterations_run,
                 solver_type="enhanced_constraint",
-                metrics=metrics.to_dict(),
+                metrics={**metrics.to_dict(), **self.optimizer_stats},
                 warnings=warnings,
                 suggestions=suggestions,
-                convergence_history=self.convergence_history
+                convergence_history=self.convergence_history,
+                chain_histories=self.chain_histories,
+                stopped_reason=self.stopped_reason,
+                feasibility=report.to_dict() if report is not None else None
             )
         
         except Exception as e:
@@ -1203,6 +2286,17 @@ class EnhancedConstraintSolver:
             raise
 
 
+def _run_chain(task: ChainTask) -> ChainResult:
+    """Process-pool worker: rebuild a solver from the task and run one chain with its own RNG"""
+    chain = EnhancedConstraintSolver(**task.solver_args, rng=np.random.default_rng(task.seed))
+    chain.deadline = task.deadline
+    chain.warm_start = task.warm_start
+    chain.size_overrides = task.size_overrides
+    state, metrics = chain._optimize(task.rooms)
+    return ChainResult(state, metrics, chain.convergence_history, chain.stopped_reason, chain.optimizer_stats,
+                       chain.iterations_run)
+
+
 # ============================================================================
 # CONVENIENCE FUNCTION
 # ============================================================================
@@ -1223,6 +2317,14 @@ def solve_floor_plan(request: SolverRequest) -> SolverResponse:
         plot_polygon=getattr(request, "plot_polygon", None) or (request.constraints or {}).get("plot_polygon"),
         optimization_level=request.optimization_level,
         vastu_school=request.vastu_school,
-        seed=request.seed
+        seed=request.seed,
+        chains=request.chains,
+        strategy=request.strategy,
+        raster_resolution=request.raster_resolution,
+        exact_geometry=request.exact_geometry,
+        deadline_ms=request.deadline_ms,
+        batch_size=request.batch_size,
+        batch_select=request.batch_select,
+        feasibility=request.feasibility
     )
     return solver.solve(request)
\ No newline at end of file
@@ -0,0 +1,183 @@
+"""
+Pre-solve feasibility analysis shared by the constraint and graph solvers.
+
+Before spending hundreds of iterations on a layout, compare cheap lower bounds
+against the plot:
+- total room area at minimum size vs the plot area
+- each room's minimum footprint vs the plot's inscribed rectangle / circle
+- rooms whose Vastu preference names a single zone vs that zone's area
+
+Each solver describes its rooms as RoomFootprints (from its own size tables)
+and applies the resulting report according to its feasibility policy:
+"report" stops when the rooms do not fit at their preferred sizes, "shrink"
+places rooms at their minimum sizes where needed and stops only when even
+that cannot fit, "pack" also shrinks rooms until they fill at most MAX_FILL
+of the plot, "ignore" skips the analysis. Fitting at preferred sizes means
+the same for every policy: no room has to shrink under the fill limit in use
+(the whole plot, or MAX_FILL for "pack").
+"""
+from typing import List, Dict, Any, Optional, Tuple
+from dataclasses import dataclass, field, asdict
+import math
+
+from ..utils import geometry_utils as gu
+from ..utils.plot_raster import PlotRaster
+
+FEASIBILITY_POLICIES = ("report", "shrink", "pack", "ignore")
+MAX_FILL = 0.75  # "pack" shrinks until rooms fill at most this much (top of the 65-75% utilization target)
+ZONES = 9  # 3 x 3 Vastu direction grid
+
+
+@dataclass
+class RoomFootprint:
+    """Size bounds of one requested room"""
+    id: str
+    type: str
+    preferred: Tuple[float, float]
+    minimum: Tuple[float, float]
+    zone: Optional[str] = None  # The only preferred Vastu zone, if there is exactly one
+
+    @property
+    def preferred_area(self) -> float:
+        return self.preferred[0] * self.preferred[1]
+
+    @property
+    def min_area(self) -> float:
+        return self.minimum[0] * self.minimum[1]
+
+
+@dataclass
+class FeasibilityReport:
+    """Lower-bound checks of a room program against a plot"""
+    feasible: bool  # Could fit with every room at its minimum size
+    fits_preferred: bool  # Could fit with every room at its preferred size
+    plot_area: float
+    preferred_area: float
+    min_area: float
+    inscribed_radius: float
+    largest_room: Optional[str]
+    mandatory_zones: int
+    shrink: List[str] = field(default_factory=list)  # Rooms to place at minimum size
+    issues: List[str] = field(default_factory=list)  # Why the program cannot fit
+    warnings: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def plot_shape_fits(width: float,
+                    height: float,
+                    plot_width: float,
+                    plot_length: float,
+                    polygon: Optional[List[List[float]]] = None,
+                    circle: Optional[Dict[str, Any]] = None,
+                    inscribed_radius: Optional[float] = None) -> Optional[bool]:
+    """Whether a width x height room fits in the plot (either orientation); None if undecided"""
+    diagonal = math.hypot(width, height)
+    if circle:
+        return diagonal <= 2 * circle["radius"]
+    if polygon:
+        if inscribed_radius is not None and diagonal <= 2 * inscribed_radius:
+            return True
+        xs = [p[0] for p in polygon]
+        ys = [p[1] for p in polygon]
+        box_w, box_h = max(xs) - min(xs), max(ys) - min(ys)
+        if not ((width <= box_w and height <= box_h) or (height <= box_w and width <= box_h)):
+            return False
+        return None
+    return (width <= plot_width and height <= plot_length) or (height <= plot_width and width <= plot_length)
+
+
+def analyze(rooms: List[RoomFootprint],
+            plot_width: float,
+            plot_length: float,
+            polygon: Optional[List[List[float]]] = None,
+            circle: Optional[Dict[str, Any]] = None,
+            raster: Optional[PlotRaster] = None,
+            max_fill: float = 1.0) -> FeasibilityReport:
+    """Compute the lower bounds and decide which rooms must shrink to fill at most max_fill of the plot"""
+    if circle:
+        plot_area = math.pi * circle["radius"] ** 2
+        inscribed_radius = circle["radius"]
+    elif polygon:
+        plot_area = float(gu.calculate_polygon_area(polygon))
+        if raster is None or raster.signed_distance is None:
+            raster = PlotRaster(polygon)
+        # Deepest interior cell (conservative by up to half a cell diagonal)
+        inscribed_radius = max(0.0, float(-raster.signed_distance.min()) - raster.resolution * math.sqrt(2) / 2)
+    else:
+        plot_area = plot_width * plot_length
+        inscribed_radius = min(plot_width, plot_length) / 2
+
+    def fits(size: Tuple[float, float]) -> Optional[bool]:
+        return plot_shape_fits(size[0], size[1], plot_width, plot_length, polygon, circle, inscribed_radius)
+
+    preferred_area = sum(r.preferred_area for r in rooms)
+    min_area = sum(r.min_area for r in rooms)
+    issues: List[str] = []
+    warnings: List[str] = []
+
+    # Total area at minimum sizes is a hard lower bound
+    if min_area > plot_area:
+        issues.append(
+            f"Rooms need at least {min_area:.1f} m² at minimum size but the plot has {plot_area:.1f} m²"
+        )
+
+    # Individual footprints vs the plot's inscribed shape
+    shrink: List[str] = []
+    for room in rooms:
+        min_fit = fits(room.minimum)
+        if min_fit is False:
+            issues.append(
+                f"{room.id} ({room.type}) needs at least {room.minimum[0]:.1f} x {room.minimum[1]:.1f} m, "
+                f"which does not fit inside the plot"
+            )
+        elif min_fit is None:
+            warnings.append(f"{room.id} ({room.type}) may not fit inside the plot even at minimum size")
+        elif fits(room.preferred) is not True:
+            shrink.append(room.id)
+    # Shrink the rooms with the most slack first until the program leaves room to pack
+    area = preferred_area - sum(r.preferred_area - r.min_area for r in rooms if r.id in shrink)
+    for room in sorted(rooms, key=lambda r: r.min_area - r.preferred_area):
+        if area <= max_fill * plot_area:
+            break
+        if room.id not in shrink and room.preferred_area > room.min_area:
+            shrink.append(room.id)
+            area -= room.preferred_area - room.min_area
+    fits_preferred = not issues and not shrink and preferred_area <= max_fill * plot_area
+    if not issues and area > MAX_FILL * plot_area:
+        warnings.append(f"Rooms fill {100 * area / plot_area:.0f}% of the plot; expect overlaps")
+
+    # Rooms tied to a single Vastu zone compete for a ninth of the plot
+    zone_demand: Dict[str, float] = {}
+    for room in rooms:
+        if room.zone:
+            zone_demand[room.zone] = zone_demand.get(room.zone, 0.0) + room.min_area
+    for zone, demand in sorted(zone_demand.items()):
+        if demand > plot_area / ZONES:
+            warnings.append(
+                f"Rooms preferring the {zone} zone need {demand:.1f} m² but it has {plot_area / ZONES:.1f} m²"
+            )
+
+    largest = max(rooms, key=lambda r: r.min_area, default=None)
+    return FeasibilityReport(
+        feasible=not issues,
+        fits_preferred=fits_preferred,
+        plot_area=round(plot_area, 2),
+        preferred_area=round(preferred_area, 2),
+        min_area=round(min_area, 2),
+        inscribed_radius=round(inscribed_radius, 2),
+        largest_room=largest.id if largest else None,
+        mandatory_zones=len(zone_demand),
+        shrink=shrink if not issues else [],
+        issues=issues,
+        warnings=warnings,
+    )
+
+
+def scale_to_area(width: float, height: float, area: float) -> Tuple[float, float]:
+    """(width, height) rescaled to the given area, keeping the aspect ratio"""
+    if width <= 0 or height <= 0:
+        return width, height
+    scale = math.sqrt(area / (width * height))
+    return round(width * scale, 2), round(height * scale, 2)
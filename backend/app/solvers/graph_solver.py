@@ -6,8 +6,13 @@ import networkx as nx
 import numpy as np
 from pydantic import BaseModel, Field, validator
 from ..utils import geometry_utils as gu
-from dataclasses import dataclass
+from ..utils.deadline import Deadline
+from ..utils.plot_raster import PlotRaster
+from . import feasibility as fz
+from . import warm_start as ws
+from dataclasses import dataclass, field
 from enum import Enum
+from functools import lru_cache
 import logging
 import math
 
@@ -82,6 +87,17 @@ class SolverRequest(BaseModel):
     outdoor_fixtures: Optional[List[str]] = None
     constraints: Optional[Dict[str, Any]] = None
     seed: Optional[int] = None
+    deadline_ms: Optional[int] = Field(None, gt=0)  # Wall-clock budget; best layout so far is returned
+    feasibility: str = "shrink"  # Pre-solve check: report, shrink (rooms to minimum size), pack (to MAX_FILL) or ignore
+    integrator: str = "euler"  # Physics integrator: euler, fire or verlet (see PhysicsParams)
+    batch_size: int = Field(1, ge=1, le=256)  # Seeds simulated together (seed, seed + 1, ...); the best layout wins
+    top_k: int = Field(1, ge=1, le=256)  # Layouts returned: the best one plus top_k - 1 alternatives
+    # Incremental re-solve of an edited layout (see warm_start): prior rooms as returned
+    # (id, x, y, width, height), rooms held in place and rooms the user changed
+    prior_layout: Optional[List[Dict[str, Any]]] = None
+    locked_room_ids: Optional[List[str]] = None
+    changed_room_ids: Optional[List[str]] = None
+    impact_radius: float = Field(ws.DEFAULT_IMPACT_RADIUS, ge=0)  # Re-optimized neighbourhood of the change (m)
 
     @validator('plot_shape')
     def normalize_plot_shape(cls, v: str) -> str:
@@ -90,6 +106,32 @@ class SolverRequest(BaseModel):
         allowed = {"rectangular", "square", "l-shaped", "t-shaped", "triangular", "irregular", "circular"}
         return v if v in allowed else "rectangular"
 
+    @validator('feasibility')
+    def validate_feasibility(cls, v: str) -> str:
+        if v not in fz.FEASIBILITY_POLICIES:
+            raise ValueError(f"feasibility must be one of {fz.FEASIBILITY_POLICIES}, got {v!r}")
+        return v
+
+    @validator('integrator')
+    def validate_integrator(cls, v: str) -> str:
+        if v not in INTEGRATORS:
+            raise ValueError(f"integrator must be one of {INTEGRATORS}, got {v!r}")
+        return v
+
+    @validator('top_k')
+    def validate_top_k(cls, v: int, values: Dict[str, Any]) -> int:
+        if 'batch_size' in values and v > values['batch_size']:
+            raise ValueError(f"top_k ({v}) cannot exceed batch_size ({values['batch_size']})")
+        return v
+
+class LayoutAlternative(BaseModel):
+    """A runner-up layout from a batched solve"""
+    rooms: List[Room]
+    score: float = Field(..., ge=0, le=100)
+    seed: Optional[int] = None
+    iterations: int
+    converged: bool = True
+
 class SolverResponse(BaseModel):
     """Solver response"""
     rooms: List[Room]
@@ -99,6 +141,10 @@ class SolverResponse(BaseModel):
     generation_time: float = 0.0
     converged: bool = True
     warnings: List[str] = []
+    stopped_reason: str = "max_iterations"  # max_iterations, converged, deadline or infeasible
+    feasibility: Optional[Dict[str, Any]] = None  # Pre-solve FeasibilityReport (when checked)
+    seed: Optional[int] = None  # Seed of the returned layout (batched solves)
+    alternatives: List[LayoutAlternative] = []  # Next best layouts of a batched solve (top_k > 1)
 
 # ============================================================================
 # VASTU & ROOM CONFIGURATION
@@ -190,6 +236,97 @@ OUTDOOR_VASTU_PREFERENCES = {
     "water_tank": {"preferred": [Direction.SOUTHWEST]}
 }
 
+# Free-form room type names accepted by _normalize_room_type
+ROOM_TYPE_ALIASES = {
+    "living_room": RoomType.LIVING,
+    "living": RoomType.LIVING,
+    "hall": RoomType.HALL,
+    "kitchen": RoomType.KITCHEN,
+    "master_bedroom": RoomType.MASTER_BEDROOM,
+    "bedroom": RoomType.BEDROOM,
+    "bathroom": RoomType.BATHROOM,
+    "toilet": RoomType.TOILET,
+    "pooja": RoomType.POOJA_ROOM,
+    "pooja_room": RoomType.POOJA_ROOM,
+    "dining": RoomType.DINING,
+    "entrance": RoomType.ENTRANCE,
+    "main_door": RoomType.ENTRANCE,
+    "study": RoomType.STUDY,
+    "balcony": RoomType.BALCONY,
+}
+
+# Vastu target of each direction as fractions of (plot_width, plot_length);
+# smaller x is east, smaller y is north
+DIRECTION_TARGETS = {
+    Direction.NORTHEAST: (0.25, 0.25),
+    Direction.NORTH: (0.5, 0.25),
+    Direction.NORTHWEST: (0.75, 0.25),
+    Direction.EAST: (0.25, 0.5),
+    Direction.CENTER: (0.5, 0.5),
+    Direction.WEST: (0.75, 0.5),
+    Direction.SOUTHEAST: (0.25, 0.75),
+    Direction.SOUTH: (0.5, 0.75),
+    Direction.SOUTHWEST: (0.75, 0.75),
+}
+
+# Triangle-aware targets: compass angle of each direction (0 = East, 90 = North)
+DIRECTION_ANGLES = {
+    Direction.EAST: 0,
+    Direction.NORTHEAST: 45,
+    Direction.NORTH: 90,
+    Direction.NORTHWEST: 135,
+    Direction.WEST: 180,
+    Direction.SOUTHWEST: 225,
+    Direction.SOUTH: 270,
+    Direction.SOUTHEAST: 315,
+    Direction.CENTER: None
+}
+
+# Direction of each plot ninth (see _direction_buckets), row-major from the
+# northeast corner
+DIRECTION_BUCKETS = [
+    Direction.NORTHEAST, Direction.NORTH, Direction.NORTHWEST,
+    Direction.EAST, Direction.CENTER, Direction.WEST,
+    Direction.SOUTHEAST, Direction.SOUTH, Direction.SOUTHWEST,
+]
+
+def _direction_scores(prefs: Dict[str, Any]) -> List[float]:
+    """Score change of a room with these preferences in each direction bucket"""
+    weight = float(prefs.get("weight", 0.5))
+    scores = []
+    for direction in DIRECTION_BUCKETS:
+        if direction in prefs.get("preferred", []):
+            scores.append(1.5 * weight)
+        elif direction in prefs.get("acceptable", []):
+            scores.append(0.5 * weight)
+        elif direction in prefs.get("avoid", []):
+            scores.append(-2.0 * weight)
+        else:
+            scores.append(0.0)
+    return scores
+
+# Vastu score of each room type (row, see VASTU_SCORE_ROWS) in each direction
+# bucket; the last row scores types without preferences
+VASTU_SCORE_ROWS = {key: k for k, key in enumerate([*VASTU_PREFERENCES, *OUTDOOR_VASTU_PREFERENCES])}
+VASTU_SCORE_MATRIX = np.array(
+    [_direction_scores(prefs) for prefs in [*VASTU_PREFERENCES.values(), *OUTDOOR_VASTU_PREFERENCES.values()]]
+    + [[0.0] * len(DIRECTION_BUCKETS)]
+)
+
+@lru_cache(maxsize=32)
+def _polygon_frame(polygon: Tuple[Tuple[float, float], ...]) -> Tuple[Tuple[float, float], float]:
+    """Centroid and inradius of a plot polygon (cached: constant for a plot)"""
+    points = [list(p) for p in polygon]
+    return tuple(gu.calculate_polygon_centroid(points)), gu.calculate_polygon_inradius(points)
+
+@lru_cache(maxsize=32)
+def _plot_boundary(polygon: Optional[Tuple[Tuple[float, float], ...]] = None,
+                   circle: Optional[Tuple[float, float, float]] = None) -> PlotRaster:
+    """Signed-distance grid of a plot polygon or (cx, cy, radius) circle (cached: constant for a plot)"""
+    if circle is not None:
+        return PlotRaster.from_circle(circle[:2], circle[2])
+    return PlotRaster([list(p) for p in polygon])
+
 def _is_outdoor(room_type: str) -> bool:
     try:
         rt = str(room_type).lower()
@@ -229,6 +366,88 @@ class PhysicsParams:
     boundary_force_strength: float = 3.0
     convergence_threshold: float = 0.01
     ideal_spacing: float = 1.0  # meters gap between adjacent rooms
+    # Repulsion kernel: "exact" (all pairs), "grid" (exact near field, cell monopoles
+    # beyond it) or "auto" (grid above grid_threshold rooms)
+    repulsion: str = "auto"
+    grid_threshold: int = 150
+    # Grid accuracy: cells within ceil(1 / theta) rings of a room are summed exactly
+    repulsion_theta: float = 1.0
+    # Integrator: "euler" (damped explicit Euler with fixed time_step), "fire" (FIRE
+    # minimizer) or "verlet" (damped velocity Verlet); the last two adapt dt
+    integrator: str = "euler"
+    max_time_step: float = 1.0  # dt ceiling for the adaptive integrators
+    max_step: float = 0.5  # Max distance (m) a room moves per adaptive step
+    energy_tolerance: float = 0.2  # Verlet: energy-balance error per step (relative) that halves dt
+
+INTEGRATORS = ("euler", "fire", "verlet")
+
+# FIRE coefficients (Bitzek et al. 2006)
+FIRE_MIN_STEPS = 5  # Downhill steps before dt may grow
+FIRE_DT_GROW = 1.1
+FIRE_DT_SHRINK = 0.5
+FIRE_ALPHA_START = 0.1
+FIRE_ALPHA_DECAY = 0.99
+
+# Room corner offsets in units of the half extents (top-left, top-right, bottom-right, bottom-left)
+CORNER_SIGNS = np.array([[-1.0, -1.0], [1.0, -1.0], [1.0, 1.0], [-1.0, 1.0]])
+BOUNDARY_PASSES = 4  # Corner projections per room on non-rectangular plots
+BOUNDARY_CLEARANCE = 1e-3  # Projected corners land this far (m) inside the boundary
+SWEEP_SCORE_ROOMS = 32  # Above this many rooms scoring counts overlaps by sweep and prune
+
+def _scatter_pairs(n: int, i: np.ndarray, j: np.ndarray, force: np.ndarray) -> np.ndarray:
+    """(N, 2) sums of +force onto rooms i and -force onto rooms j"""
+    out = np.empty((n, 2))
+    for axis in range(2):
+        out[:, axis] = np.bincount(i, force[:, axis], n)
+        if len(j):
+            out[:, axis] -= np.bincount(j, force[:, axis], n)
+    return out
+
+def _sweep_and_prune(lo: np.ndarray, hi: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Pairs (i < j, in lexicographic order) of boxes [lo, hi] whose interiors overlap.
+    
+    Broad phase: boxes sorted by their left edge are only tested against the
+    boxes that start before they end, O(N log N + k) for k candidate pairs.
+    """
+    n = len(lo)
+    order = np.argsort(lo[:, 0], kind="stable")
+    start = lo[order, 0]
+    count = np.maximum(np.searchsorted(start, hi[order, 0], side="left") - np.arange(n) - 1, 0)
+    a = np.repeat(np.arange(n), count)
+    b = a + 1 + np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+    i, j = order[a], order[b]
+    # Narrow phase: full interval test on both axes
+    hit = (lo[i, 0] < hi[j, 0]) & (hi[i, 0] > lo[j, 0]) & (lo[i, 1] < hi[j, 1]) & (hi[i, 1] > lo[j, 1])
+    i, j = np.minimum(i[hit], j[hit]), np.maximum(i[hit], j[hit])
+    pair_order = np.lexsort((j, i))
+    return i[pair_order], j[pair_order]
+
+@dataclass
+class LayoutSample:
+    """One seed of a batched solve: its RNG stream, room state and outcome"""
+    rng: np.random.Generator
+    seed: Optional[int] = None
+    positions: Dict[str, np.ndarray] = field(default_factory=dict)
+    velocities: Dict[str, np.ndarray] = field(default_factory=dict)
+    dimensions: Dict[str, Tuple[float, float]] = field(default_factory=dict)
+    iterations: int = 0
+    converged: bool = True
+    warnings: List[str] = field(default_factory=list)
+    score: float = 0.0
+
+@dataclass
+class StaticGrid:
+    """Fixed rooms of one sample bucketed into square cells once per simulation run:
+    sorted members per cell for the exact near field and per-cell monopoles (room
+    count at the centroid) for the far field"""
+    lo: np.ndarray
+    cell_size: np.ndarray
+    cells: int
+    order: np.ndarray  # Fixed-room indices sorted by cell
+    bounds: np.ndarray  # order[bounds[c]:bounds[c + 1]] lie in cell c
+    # Occupied cells, their (col, row), room count and centroid; indoor rooms only
+    # feel indoor sources, so there is one set of monopoles per source set
+    monopoles: Dict[bool, Tuple[np.ndarray, np.ndarray, np.ndarray]]
 
 # ============================================================================
 # GRAPH-BASED SOLVER
@@ -251,26 +470,77 @@ class GraphBasedLayoutSolver:
                  plot_width: float = 30.0, 
                  plot_length: float = 30.0,
                  plot_shape: Optional[str] = "rectangular",
-                 seed: Optional[int] = None):
+                 seed: Optional[int] = None,
+                 rng: Optional[np.random.Generator] = None,
+                 deadline_ms: Optional[float] = None,
+                 feasibility: str = "shrink",
+                 integrator: str = "euler",
+                 batch_size: int = 1,
+                 top_k: int = 1):
         self.plot_width = plot_width
         self.plot_length = plot_length
         self.plot_shape = (plot_shape or "rectangular").lower()
         self.graph = nx.Graph()
-        self.params = PhysicsParams()
+        if integrator not in INTEGRATORS:
+            raise ValueError(f"Unknown integrator: {integrator}")
+        self.params = PhysicsParams(integrator=integrator)
         self.plot_polygon = None
         self.plot_circle: Optional[Dict[str, Any]] = None  # {center: [x,y], radius: r}
+        # Plot SDF for non-rectangular plots (see _build_boundary); None clips to the rectangle
+        self.boundary: Optional[PlotRaster] = self._build_boundary()
         self.constraints: Dict[str, Any] = {}
         # Nodes that should remain fixed (used by two-phase solver)
         self.fixed_nodes: set = set()
         
-        # Random seed for reproducibility
-        if seed is not None:
-            np.random.seed(seed)
+        # Per-instance RNG: concurrent solvers never share or reseed global state
+        self.rng = rng if rng is not None else np.random.default_rng(seed)
+        self.seed = seed
+        
+        # Batch mode: batch_size seeds are simulated together and the top_k layouts returned
+        if batch_size < 1 or top_k < 1:
+            raise ValueError(f"batch_size and top_k must be at least 1, got {batch_size} and {top_k}")
+        if top_k > batch_size:
+            raise ValueError(f"top_k ({top_k}) cannot exceed batch_size ({batch_size})")
+        self.batch_size = batch_size
+        self.top_k = top_k
+        
+        # Anytime mode: the clock starts when solve() is called
+        self.deadline_ms = deadline_ms
+        self.deadline = Deadline(None)
+        self.deadline_hit = False
+        
+        # Pre-solve feasibility policy; shrunk rooms start at their minimum size
+        if feasibility not in fz.FEASIBILITY_POLICIES:
+            raise ValueError(f"Unknown feasibility policy: {feasibility}")
+        self.feasibility = feasibility
+        self.size_overrides: Dict[str, Tuple[float, float]] = {}
+        
+        # Warm start: prior geometry of an edited layout; frozen rooms keep it
+        self.warm_start: Optional[ws.WarmStart] = None
+        self.frozen: set = set()
         
         # Physics state
         self.positions: Dict[str, np.ndarray] = {}  # Room center positions
         self.velocities: Dict[str, np.ndarray] = {}  # Room velocities
         self.dimensions: Dict[str, Tuple[float, float]] = {}  # Room (width, height)
+        self.vastu_targets: Dict[str, np.ndarray] = {}  # Vastu-preferred center
+        self.vastu_weights: Dict[str, float] = {}  # Vastu pull weight (0 = none)
+        self.outdoor_flags: Dict[str, bool] = {}
+        
+        # Per-seed state; the dicts above belong to the selected sample (see _select)
+        self.samples: List[LayoutSample] = [LayoutSample(
+            rng=self.rng, seed=seed, positions=self.positions,
+            velocities=self.velocities, dimensions=self.dimensions
+        )]
+        
+        # Contiguous copies used while simulating (see _pack_state): element [b, i]
+        # is room room_ids[i] of sample samples[live[b]]
+        self.room_ids: List[str] = []
+        self.index: Dict[str, int] = {}
+        self.live = np.zeros(0, dtype=np.int64)
+        self.pos = np.zeros((0, 0, 2))
+        self.vel = np.zeros((0, 0, 2))
+        self.size = np.zeros((0, 0, 2))
         
         logger.info(f"Graph solver initialized: {plot_width}x{plot_length}m")
 
@@ -291,25 +561,7 @@ class GraphBasedLayoutSolver:
         if not room_type:
             return None
 
-        key = str(room_type).strip().lower()
-        mapping = {
-            "living_room": RoomType.LIVING,
-            "living": RoomType.LIVING,
-            "hall": RoomType.HALL,
-            "kitchen": RoomType.KITCHEN,
-            "master_bedroom": RoomType.MASTER_BEDROOM,
-            "bedroom": RoomType.BEDROOM,
-            "bathroom": RoomType.BATHROOM,
-            "toilet": RoomType.TOILET,
-            "pooja": RoomType.POOJA_ROOM,
-            "pooja_room": RoomType.POOJA_ROOM,
-            "dining": RoomType.DINING,
-            "entrance": RoomType.ENTRANCE,
-            "main_door": RoomType.ENTRANCE,
-            "study": RoomType.STUDY,
-            "balcony": RoomType.BALCONY,
-        }
-        return mapping.get(key)
+        return ROOM_TYPE_ALIASES.get(str(room_type).strip().lower())
     
     def _build_adjacency_graph(self, rooms: List[Dict[str, Any]]) -> nx.Graph:
         """Build graph with rooms as nodes and adjacency as edges"""
@@ -361,8 +613,8 @@ class GraphBasedLayoutSolver:
         specs = ROOM_SIZES.get(rt, {"width": 4.0, "height": 4.0})
         
         # Add small random variation
-        width = specs["width"] * np.random.uniform(0.95, 1.05)
-        height = specs["height"] * np.random.uniform(0.95, 1.05)
+        width = specs["width"] * self.rng.uniform(0.95, 1.05)
+        height = specs["height"] * self.rng.uniform(0.95, 1.05)
         
         return round(width, 2), round(height, 2)
     
@@ -382,19 +634,6 @@ class GraphBasedLayoutSolver:
         if self.plot_shape == "triangular":
             return self._get_vastu_target_position_triangular(room_type)
         
-        # Map direction to position
-        direction_map = {
-            Direction.NORTHEAST: np.array([self.plot_width * 0.25, self.plot_length * 0.25]),
-            Direction.NORTH: np.array([self.plot_width * 0.5, self.plot_length * 0.25]),
-            Direction.NORTHWEST: np.array([self.plot_width * 0.75, self.plot_length * 0.25]),
-            Direction.EAST: np.array([self.plot_width * 0.25, self.plot_length * 0.5]),
-            Direction.CENTER: np.array([self.plot_width * 0.5, self.plot_length * 0.5]),
-            Direction.WEST: np.array([self.plot_width * 0.75, self.plot_length * 0.5]),
-            Direction.SOUTHEAST: np.array([self.plot_width * 0.25, self.plot_length * 0.75]),
-            Direction.SOUTH: np.array([self.plot_width * 0.5, self.plot_length * 0.75]),
-            Direction.SOUTHWEST: np.array([self.plot_width * 0.75, self.plot_length * 0.75]),
-        }
-        
         # Use preferred direction, allowing entrance override via constraints
         preferred = list(vastu_pref["preferred"]) if vastu_pref else []
         if outdoor_pref and not preferred:
@@ -413,8 +652,9 @@ class GraphBasedLayoutSolver:
             pass
 
         # Use first preferred direction
-        if preferred:
-            return direction_map.get(preferred[0], np.array([self.plot_width / 2, self.plot_length / 2]))
+        if preferred and preferred[0] in DIRECTION_TARGETS:
+            fx, fy = DIRECTION_TARGETS[preferred[0]]
+            return np.array([self.plot_width * fx, self.plot_length * fy])
         
         return np.array([self.plot_width / 2, self.plot_length / 2])
 
@@ -430,8 +670,8 @@ class GraphBasedLayoutSolver:
             return np.array([self.plot_width / 2, self.plot_length / 2])
 
         # centroid and inradius
-        centroid = np.array(gu.calculate_polygon_centroid(self.plot_polygon))
-        inradius = gu.calculate_polygon_inradius(self.plot_polygon)
+        centroid, inradius = _polygon_frame(tuple((float(x), float(y)) for x, y in self.plot_polygon))
+        centroid = np.array(centroid)
         safe_radius = max(0.1, inradius * 0.7)
 
         rt = self._normalize_room_type(room_type)
@@ -446,24 +686,11 @@ class GraphBasedLayoutSolver:
         if outdoor_pref and not preferred:
             preferred = list(outdoor_pref.get("preferred", []))
 
-        # map Direction enum to angles with 0 = East, 90 = North
-        angle_map = {
-            Direction.EAST: 0,
-            Direction.NORTHEAST: 45,
-            Direction.NORTH: 90,
-            Direction.NORTHWEST: 135,
-            Direction.WEST: 180,
-            Direction.SOUTHWEST: 225,
-            Direction.SOUTH: 270,
-            Direction.SOUTHEAST: 315,
-            Direction.CENTER: None
-        }
-
         if not preferred:
             return centroid
 
         dir_enum = preferred[0]
-        angle = angle_map.get(dir_enum)
+        angle = DIRECTION_ANGLES.get(dir_enum)
         if angle is None:
             return centroid
 
@@ -485,30 +712,33 @@ class GraphBasedLayoutSolver:
             room_type = room["type"]
             
             # Get dimensions
-            width, height = self._get_room_dimensions(room_type)
+            override = self.size_overrides.get(room_id)
+            width, height = override if override else self._get_room_dimensions(room_type)
             self.dimensions[room_id] = (width, height)
             
-            # Get Vastu target with random offset
+            # Resolve the room's Vastu pull once; the simulation reuses it every step
+            rt = self._normalize_room_type(room_type)
+            vastu_pref = VASTU_PREFERENCES.get(rt) if rt else None
+            is_outdoor = _is_outdoor(room_type)
             vastu_target = self._get_vastu_target_position(room_type)
-            offset = np.random.uniform(-2, 2, 2)  # Small random offset
+            self.vastu_targets[room_id] = vastu_target
+            self.outdoor_flags[room_id] = is_outdoor
+            # Indoor types without preferences feel no pull; outdoor fixtures get a
+            # gentler anchor to avoid disturbing the indoor layout
+            self.vastu_weights[room_id] = vastu_pref["weight"] if vastu_pref else (0.4 if is_outdoor else 0.0)
+            
+            prior = self.warm_start.positions.get(room_id) if self.warm_start is not None else None
+            if prior is not None:
+                # Edited layout: known rooms start where they were (top-left corner to center)
+                self.positions[room_id] = np.array([prior[0] + width / 2, prior[1] + height / 2])
+                self.velocities[room_id] = np.zeros(2)
+                continue
+            
+            # Start at the Vastu target with a small random offset
+            offset = self.rng.uniform(-2, 2, 2)
             
             # Initialize position (ensure within bounds)
-            pos = vastu_target + offset
-            if self.plot_shape == "irregular" and self.plot_polygon:
-                pos = self._project_inside_polygon(pos, width, height)
-            elif self.plot_shape == "triangular":
-                pos[0] = max(pos[0], width/2)
-                pos[1] = max(pos[1], height/2)
-                corner = pos + np.array([width/2, height/2])
-                val = corner[0] / self.plot_width + corner[1] / self.plot_length - 1.0
-                if val > 0:
-                    grad = np.array([1.0 / self.plot_width, 1.0 / self.plot_length])
-                    alpha = val / np.dot(grad, grad)
-                    corner = corner - alpha * grad
-                    pos = corner - np.array([width/2, height/2])
-            else:
-                pos[0] = np.clip(pos[0], width/2, self.plot_width - width/2)
-                pos[1] = np.clip(pos[1], height/2, self.plot_length - height/2)
+            pos = self._project_into_plot(vastu_target + offset, np.array([width, height]))
             
             self.positions[room_id] = pos
             self.velocities[room_id] = np.zeros(2)
@@ -538,424 +768,738 @@ class GraphBasedLayoutSolver:
         
         return projection, distance
     
-    def _project_inside_polygon(self, pos: np.ndarray, width: float, height: float) -> np.ndarray:
-        """Project room center to be inside polygon"""
-        if not self.plot_polygon:
-            return pos
-
-        # If any corner is outside, project that corner inside and adjust center accordingly.
-        corners = [
-            pos + np.array([-width/2, -height/2]),
-            pos + np.array([width/2, -height/2]),
-            pos + np.array([width/2, height/2]),
-            pos + np.array([-width/2, height/2])
-        ]
-
-        for corner in corners:
-            if not gu.point_in_polygon((float(corner[0]), float(corner[1])), self.plot_polygon):
-                proj = gu.project_point_inside((float(corner[0]), float(corner[1])), self.plot_polygon)
-                proj = np.array(proj)
-                corner_offset = corner - pos
-                pos = proj - corner_offset
-                break
-
-        return pos
-
-    def _project_inside_circle(self, pos: np.ndarray, width: float, height: float) -> np.ndarray:
-        """Ensure room center keeps all corners inside circle boundary"""
-        if not self.plot_circle:
+    # ========================================================================
+    # PLOT BOUNDARY
+    # ========================================================================
+    
+    def _triangle_polygon(self) -> List[List[float]]:
+        """Triangular plots: right angle at the origin, hypotenuse from (W, 0) to (0, L)"""
+        return [[0.0, 0.0], [self.plot_width, 0.0], [0.0, self.plot_length]]
+    
+    def _build_boundary(self) -> Optional[PlotRaster]:
+        """One signed-distance grid for whichever non-rectangular plot is set"""
+        if self.plot_shape == "irregular" and self.plot_polygon:
+            return _plot_boundary(polygon=tuple((float(x), float(y)) for x, y in self.plot_polygon))
+        if self.plot_shape == "circular" and self.plot_circle:
+            center = self.plot_circle.get("center", [self.plot_width/2, self.plot_length/2])
+            radius = self.plot_circle.get("radius", min(self.plot_width, self.plot_length)/2)
+            return _plot_boundary(circle=(float(center[0]), float(center[1]), float(radius)))
+        if self.plot_shape == "triangular":
+            return _plot_boundary(polygon=tuple((x, y) for x, y in self._triangle_polygon()))
+        return None
+    
+    def _corner_penetration(self, pos: np.ndarray, size: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Depth of each room corner beyond the boundary (negative inside) and the outward
+        normal there, shapes (..., 4) and (..., 4, 2)"""
+        corners = pos[..., None, :] + CORNER_SIGNS * (size / 2)[..., None, :]
+        return self.boundary.sample(corners)
+    
+    def _project_into_plot(self, pos: np.ndarray, size: np.ndarray, passes: int = BOUNDARY_PASSES,
+                           margin: Optional[float] = 0.05) -> np.ndarray:
+        """Move room centers pos (..., 2) of the given sizes inside the plot.
+        
+        Rectangular plots clip. Otherwise each pass moves every room's deepest
+        outside corner just inside the boundary along its normal. Rooms still
+        out after the last pass (too large for where they sit) keep their center
+        at least margin inside, so the rounded output stays in the plot.
+        """
+        if self.boundary is None:
+            half = size / 2
+            return np.clip(pos, half, np.array([self.plot_width, self.plot_length]) - half)
+        
+        for _ in range(passes):
+            depth, normal = self._corner_penetration(pos, size)
+            deepest = depth.argmax(axis=-1)[..., None]
+            depth = np.take_along_axis(depth, deepest, axis=-1)[..., 0]
+            if not (depth > 0).any():
+                return pos
+            normal = np.take_along_axis(normal, deepest[..., None], axis=-2)[..., 0, :]
+            pos = pos - np.where(depth > 0, depth + BOUNDARY_CLEARANCE, 0.0)[..., None] * normal
+        if margin is None:
             return pos
-        center = np.array(self.plot_circle.get("center", [self.plot_width/2, self.plot_length/2]))
-        radius = float(self.plot_circle.get("radius", min(self.plot_width, self.plot_length)/2))
-        # Use half-diagonal to ensure rectangle fits in circle
-        half_diag = math.sqrt((width/2)**2 + (height/2)**2)
-        max_center_dist = max(0.0, radius - half_diag)
-        delta = pos - center
-        dist = np.linalg.norm(delta)
-        if dist > max_center_dist and dist > 1e-6:
-            pos = center + (delta / dist) * max_center_dist
-        return pos
+        
+        depth, normal = self.boundary.sample(pos)
+        return pos - np.maximum(depth + margin, 0.0)[..., None] * normal
     
     # ========================================================================
-    # FORCE CALCULATION
+    # BATCHED SAMPLES
     # ========================================================================
     
-    def _calculate_attractive_force(self, room1_id: str, room2_id: str, weight: float) -> np.ndarray:
-        """Calculate attractive force between adjacent rooms"""
-        pos1 = self.positions[room1_id]
-        pos2 = self.positions[room2_id]
+    def _make_samples(self) -> List[LayoutSample]:
+        """The solver's own sample plus batch_size - 1 independent seeds.
         
-        # Vector from room1 to room2
-        delta = pos2 - pos1
-        distance = np.linalg.norm(delta)
+        With a seed, sample b uses seed + b (the same layout a single solve with
+        that seed produces); without one, the extra streams are spawned from the
+        solver's RNG.
+        """
+        primary = self.samples[0]
+        extra = self.batch_size - 1
+        if self.seed is not None:
+            rngs = [np.random.default_rng(self.seed + b) for b in range(1, self.batch_size)]
+        else:
+            rngs = primary.rng.spawn(extra) if extra else []
+        samples = [LayoutSample(rng=primary.rng, seed=self.seed, positions=primary.positions,
+                                velocities=primary.velocities, dimensions=primary.dimensions)]
+        for b, rng in enumerate(rngs, start=1):
+            samples.append(LayoutSample(rng=rng, seed=None if self.seed is None else self.seed + b))
+        return samples
+    
+    def _select(self, sample: LayoutSample):
+        """Point the per-room dicts and the RNG at one sample"""
+        self.rng = sample.rng
+        self.positions = sample.positions
+        self.velocities = sample.velocities
+        self.dimensions = sample.dimensions
+    
+    def _each_sample(self):
+        """Iterate over the samples, selecting each in turn"""
+        for sample in self.samples:
+            self._select(sample)
+            yield sample
+    
+    def _initialize_samples(self, rooms: List[Dict[str, Any]]):
+        """Initialize the rooms in every sample from its own RNG stream"""
+        for _ in self._each_sample():
+            self._initialize_positions(rooms)
+    
+    def _sample_rng(self, b: int) -> np.random.Generator:
+        """RNG of the sample simulated in batch row b"""
+        return self.samples[self.live[b]].rng
+    
+    # ========================================================================
+    # PHYSICS STATE
+    # ========================================================================
+    
+    def _pack_state(self, G: nx.Graph):
+        """Stack the movable rooms of every sample into (B, N, 2) arrays (element [b, i]
+        is room room_ids[i] of sample b); graph and Vastu arrays are shared.
         
-        if distance < 0.1:
-            return np.zeros(2)
+        Only the active set is simulated: fixed rooms (the phase-1 indoor rooms
+        during phase 2) are packed separately as static repulsors and spring
+        anchors (see _pack_static), so a step costs in proportion to the rooms
+        that move.
+        """
+        all_ids = list(self.samples[0].positions.keys())
+        self.room_ids = [r for r in all_ids if r not in self.fixed_nodes]
+        self.static_ids = [r for r in all_ids if r in self.fixed_nodes]
+        self.index = {room_id: i for i, room_id in enumerate(self.room_ids)}
+        batch, n = len(self.samples), len(self.room_ids)
+        self.live = np.arange(batch)
         
-        direction = delta / distance
+        def stack(attr: str, room_ids: List[str]) -> np.ndarray:
+            return np.array(
+                [[getattr(s, attr)[r] for r in room_ids] for s in self.samples], dtype=np.float64
+            ).reshape(batch, len(room_ids), 2)
         
-        # Ideal distance: rooms barely touching with small gap
-        w1, h1 = self.dimensions[room1_id]
-        w2, h2 = self.dimensions[room2_id]
-        ideal_distance = (max(w1, w2) + max(h1, h2)) / 2 + self.params.ideal_spacing
+        self.pos = stack("positions", self.room_ids)
+        self.vel = stack("velocities", self.room_ids)
+        self.size = stack("dimensions", self.room_ids)
         
-        # Spring force: F = k * (distance - ideal_distance)
-        force_magnitude = self.params.attraction_strength * weight * (distance - ideal_distance)
+        # Adaptive integrator state per sample, fresh for every simulation run
+        self.dt = np.full(batch, self.params.time_step)
+        self.fire_alpha = np.full(batch, FIRE_ALPHA_START)
+        self.fire_downhill = np.zeros(batch, dtype=np.int64)
+        self.accel: Optional[np.ndarray] = None
         
-        return force_magnitude * direction
-    
-    def _calculate_repulsive_force(self, room1_id: str, room2_id: str) -> np.ndarray:
-        """Calculate repulsive force between non-adjacent rooms"""
-        pos1 = self.positions[room1_id]
-        pos2 = self.positions[room2_id]
+        # Adjacency weights; every other pair repels
+        self.adjacency_weight = np.zeros((n, n))
+        self.adjacent = np.zeros((n, n), dtype=bool)
+        for room1_id, room2_id, data in G.edges(data=True):
+            if room1_id not in self.index or room2_id not in self.index:
+                continue  # Edges to fixed rooms: see _pack_static
+            i, j = self.index[room1_id], self.index[room2_id]
+            self.adjacency_weight[i, j] = self.adjacency_weight[j, i] = data.get('weight', 1.0)
+            self.adjacent[i, j] = self.adjacent[j, i] = True
+        self.outdoor = np.array([self.outdoor_flags[r] for r in self.room_ids], dtype=bool)
+        # repels[i, j]: room j pushes room i. Outdoor rooms are pushed away from
+        # indoor ones without moving them.
+        self.repels = ~self.adjacent & ~(~self.outdoor[:, None] & self.outdoor[None, :])
+        np.fill_diagonal(self.repels, False)
         
-        delta = pos1 - pos2  # Repel away from each other
-        distance = np.linalg.norm(delta)
+        # Spring rest length: rooms barely touching with a small gap (sizes vary per sample)
+        w, h = self.size[..., 0], self.size[..., 1]
+        self.ideal_distance = (
+            np.maximum(w[:, :, None], w[:, None, :]) + np.maximum(h[:, :, None], h[:, None, :])
+        ) / 2 + self.params.ideal_spacing
         
-        if distance < 0.1:
-            # Too close, apply strong random push
-            return np.random.uniform(-5, 5, 2)
+        # Large programs avoid O(N^2) tensors: springs over the edge list, grid repulsion.
+        # Only the simulated rooms count: a warm start moving a few rooms stays exact
+        mode = self.params.repulsion
+        if mode not in ("exact", "grid", "auto"):
+            raise ValueError(f"Unknown repulsion mode: {mode}")
+        self.use_grid = mode == "grid" or (mode == "auto" and n > self.params.grid_threshold)
+        edge_i, edge_j = np.nonzero(np.triu(self.adjacent, k=1))
+        self.edges = (edge_i, edge_j, self.adjacency_weight[edge_i, edge_j], self.ideal_distance[:, edge_i, edge_j])
         
-        direction = delta / distance
+        # Vastu pull resolved per room by _initialize_positions
+        self.vastu_target = np.array([self.vastu_targets[r] for r in self.room_ids], dtype=np.float64).reshape(n, 2)
+        self.vastu_weight = np.array([self.vastu_weights[r] for r in self.room_ids], dtype=np.float64)
+        self.vastu_pull = self.vastu_weight > 0
         
-        # Coulomb-like repulsion: F = k / distance
-        force_magnitude = self.params.repulsion_strength * (5.0 / distance)
+        self.static_pos = stack("positions", self.static_ids)
+        self.static_size = stack("dimensions", self.static_ids)
+        self._pack_static(G)
+    
+    def _pack_static(self, G: nx.Graph):
+        """Fixed-room interaction arrays: which fixed rooms push or anchor each movable
+        room, and (grid mode) the fixed rooms of every sample bucketed once"""
+        static_index = {room_id: k for k, room_id in enumerate(self.static_ids)}
+        n, m = len(self.room_ids), len(self.static_ids)
+        weight = np.zeros((n, m))
+        adjacent = np.zeros((n, m), dtype=bool)
+        for room1_id, room2_id, data in G.edges(data=True):
+            if room1_id in static_index:
+                room1_id, room2_id = room2_id, room1_id
+            if room1_id in self.index and room2_id in static_index:
+                i, k = self.index[room1_id], static_index[room2_id]
+                weight[i, k] = data.get('weight', 1.0)
+                adjacent[i, k] = True
+        self.static_adjacent = adjacent
+        self.static_outdoor = np.array([self.outdoor_flags[r] for r in self.static_ids], dtype=bool)
+        # static_repels[i, k]: fixed room k pushes movable room i (same rule as repels)
+        self.static_repels = ~adjacent & ~(~self.outdoor[:, None] & self.static_outdoor[None, :])
         
-        return force_magnitude * direction
+        # Springs to fixed rooms: an edge list with per-sample rest lengths
+        edge_i, edge_k = np.nonzero(adjacent)
+        w, h = self.size[..., 0], self.size[..., 1]
+        sw, sh = self.static_size[..., 0], self.static_size[..., 1]
+        ideal = (
+            np.maximum(w[:, edge_i], sw[:, edge_k]) + np.maximum(h[:, edge_i], sh[:, edge_k])
+        ) / 2 + self.params.ideal_spacing
+        self.static_edges = (edge_i, edge_k, weight[edge_i, edge_k], ideal)
+        # Fixed rooms are bucketed once per sample when the movable x fixed pairs
+        # outnumber those of a grid_threshold-room program
+        mode = self.params.repulsion
+        self.use_static_grid = m > 0 and (mode == "grid" or (mode == "auto" and n * m > self.params.grid_threshold ** 2))
+        self.static_grids = [self._build_static_grid(b) for b in range(len(self.samples))] if self.use_static_grid else []
     
-    def _calculate_vastu_force(self, room_id: str, room_type: str) -> np.ndarray:
-        """Calculate force pulling room toward Vastu-preferred direction"""
-        rt = self._normalize_room_type(room_type)
-        vastu_pref = VASTU_PREFERENCES.get(rt) if rt else None
-        is_outdoor = _is_outdoor(room_type)
+    def _build_static_grid(self, b: int) -> StaticGrid:
+        """Bucket sample b's fixed rooms; the grid also spans the plot, so every movable
+        room falls in it"""
+        pos = self.static_pos[b]
+        rings = max(1, math.ceil(1.0 / self.params.repulsion_theta))
+        # Balance near pairs (~ N M (2r+1)^2 / m^2) against far cells (~ N m^2)
+        cells = max(2 * rings + 2, int(round((len(pos) * (2 * rings + 1) ** 2) ** 0.25)))
+        lo = np.minimum(pos.min(axis=0), 0.0)
+        cell_size = np.maximum(np.maximum(pos.max(axis=0), (self.plot_width, self.plot_length)) - lo, 1e-6) / cells
+        coords = np.clip(((pos - lo) / cell_size).astype(np.int64), 0, cells - 1)
+        key = coords[:, 0] * cells + coords[:, 1]
+        order = np.argsort(key, kind="stable")
+        bounds = np.searchsorted(key[order], np.arange(cells * cells + 1))
         
-        # For indoor types without preferences, no Vastu force.
-        # For outdoor types, still apply anchor-only gentle pull.
-        if not vastu_pref and not is_outdoor:
-            return np.zeros(2)
+        monopoles = {}
+        for outdoor_receiver, sources in ((False, ~self.static_outdoor), (True, np.ones(len(pos), dtype=bool))):
+            count = np.bincount(key[sources], minlength=cells * cells)
+            occupied = np.flatnonzero(count)
+            centroid = np.stack([
+                np.bincount(key[sources], pos[sources, axis], cells * cells)[occupied] for axis in range(2)
+            ], axis=1) / np.maximum(count[occupied, None], 1)
+            monopoles[outdoor_receiver] = (
+                np.stack([occupied // cells, occupied % cells], axis=1), count[occupied], centroid
+            )
+        return StaticGrid(lo=lo, cell_size=cell_size, cells=cells, order=order, bounds=bounds, monopoles=monopoles)
+    
+    def _unpack_state(self, rows: Optional[np.ndarray] = None):
+        """Write the simulated arrays (all batch rows by default) back to the samples' dicts"""
+        for b in range(len(self.live)) if rows is None else rows:
+            sample = self.samples[self.live[b]]
+            for i, room_id in enumerate(self.room_ids):
+                sample.positions[room_id] = self.pos[b, i].copy()
+                sample.velocities[room_id] = self.vel[b, i].copy()
+    
+    def _retire(self, done: np.ndarray):
+        """Write finished samples back and drop their rows from the batch"""
+        self._unpack_state(np.flatnonzero(done))
+        keep = ~done
+        self.live = self.live[keep]
+        self.pos, self.vel, self.size = self.pos[keep], self.vel[keep], self.size[keep]
+        self.ideal_distance = self.ideal_distance[keep]
+        self.edges = self.edges[:3] + (self.edges[3][keep],)
+        self.static_pos, self.static_size = self.static_pos[keep], self.static_size[keep]
+        self.static_edges = self.static_edges[:3] + (self.static_edges[3][keep],)
+        if self.static_grids:
+            self.static_grids = [grid for grid, kept in zip(self.static_grids, keep) if kept]
+        self.dt, self.fire_alpha, self.fire_downhill = self.dt[keep], self.fire_alpha[keep], self.fire_downhill[keep]
+        if self.accel is not None:
+            self.accel = self.accel[keep]
+    
+    # ========================================================================
+    # FORCE CALCULATION
+    # ========================================================================
+    
+    def _calculate_attractive_forces(self, delta: np.ndarray, distance: np.ndarray) -> np.ndarray:
+        """Springs pulling adjacent rooms toward their ideal distance"""
+        direction = delta / np.where(distance > 0, distance, 1.0)[..., None]
+        # Spring force: F = k * (distance - ideal_distance)
+        magnitude = self.params.attraction_strength * self.adjacency_weight * (distance - self.ideal_distance)
+        active = self.adjacent & (distance >= 0.1)
+        return np.where(active[..., None], magnitude[..., None] * direction, 0.0).sum(axis=2)
+    
+    def _calculate_repulsive_forces(self, delta: np.ndarray, distance: np.ndarray) -> np.ndarray:
+        """Coulomb-like repulsion between non-adjacent rooms"""
+        safe = np.where(distance >= 0.1, distance, 1.0)
+        # F = k / distance, directed away from the other room
+        magnitude = self.params.repulsion_strength * (5.0 / safe)
+        force = magnitude[..., None] * (-delta / safe[..., None])
+        forces = np.where((self.repels & (distance >= 0.1))[..., None], force, 0.0).sum(axis=2)
         
-        current_pos = self.positions[room_id]
-        target_pos = self._get_vastu_target_position(room_type)
+        # Too close: strong random push, drawn per pair in row order from the sample's RNG
+        close = np.triu(~self.adjacent & (distance < 0.1), k=1)
+        for b in np.flatnonzero(close.any(axis=(1, 2))):
+            rows, cols = np.nonzero(close[b])
+            pushes = self._sample_rng(b).uniform(-5, 5, (len(rows), 2))
+            for i, j, push in zip(rows, cols, pushes):
+                if self.repels[i, j]:
+                    forces[b, i] += push
+                if self.repels[j, i]:
+                    forces[b, j] -= push
+        return forces
+    
+    def _calculate_edge_attractive_forces(self) -> np.ndarray:
+        """Spring forces accumulated over the adjacency edge list (grid mode: no N x N tensors)"""
+        i, j, weight, ideal = self.edges
+        delta = self.pos[:, j] - self.pos[:, i]
+        distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+        active = distance >= 0.1
+        magnitude = self.params.attraction_strength * weight * (distance - ideal)
+        force = np.where(active[..., None], magnitude[..., None] * delta / np.where(active, distance, 1.0)[..., None], 0.0)
+        return np.stack([_scatter_pairs(self.pos.shape[1], i, j, f) for f in force])
+    
+    def _calculate_grid_repulsive_forces(self) -> np.ndarray:
+        """Grid repulsion (see _grid_repulsion) for every sample in the batch"""
+        return np.stack([self._grid_repulsion(b) for b in range(len(self.pos))])
+    
+    def _grid_repulsion(self, b: int) -> np.ndarray:
+        """Repulsion with exact sums over nearby grid cells and one monopole per far cell.
         
-        # Vector toward target
-        delta = target_pos - current_pos
-        distance = np.linalg.norm(delta)
+        Rooms are bucketed into a square grid over their bounding box. Pairs
+        within ceil(1 / theta) rings of cells are summed exactly (same masks and
+        random pushes as the exact kernel); every farther cell acts as its room
+        count placed at its centroid. O(N * cells + near pairs) instead of O(N^2).
+        """
+        pos = self.pos[b]
+        n = len(pos)
+        k = self.params.repulsion_strength * 5.0
+        rings = max(1, math.ceil(1.0 / self.params.repulsion_theta))
+        # Balance near pairs (~ N^2 (2r+1)^2 / m^2) against far cells (~ N m^2)
+        cells = max(2 * rings + 2, int(round((n * (2 * rings + 1) ** 2) ** 0.25)))
+        lo = pos.min(axis=0)
+        cell_size = np.maximum(pos.max(axis=0) - lo, 1e-6) / cells
+        coords = np.minimum(((pos - lo) / cell_size).astype(np.int64), cells - 1)
+        key = coords[:, 0] * cells + coords[:, 1]
+        order = np.argsort(key, kind="stable")
+        bounds = np.searchsorted(key[order], np.arange(cells * cells + 1))
         
-        if distance < 0.5:
-            return np.zeros(2)  # Already close enough
+        # Near field: every (room, room in a neighbouring cell) pair
+        rows, cols = [], []
+        for dx in range(-rings, rings + 1):
+            for dy in range(-rings, rings + 1):
+                neighbour = coords + (dx, dy)
+                src = np.flatnonzero(((neighbour >= 0) & (neighbour < cells)).all(axis=1))
+                cell = neighbour[src, 0] * cells + neighbour[src, 1]
+                start, count = bounds[cell], bounds[cell + 1] - bounds[cell]
+                offsets = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+                rows.append(np.repeat(src, count))
+                cols.append(order[np.repeat(start, count) + offsets])
+        i, j = np.concatenate(rows), np.concatenate(cols)
+        keep = i != j
+        i, j = i[keep], j[keep]
+        delta = pos[i] - pos[j]
+        distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+        active = self.repels[i, j] & (distance >= 0.1)
+        safe = np.where(active, distance, 1.0)
+        force = np.where(active[:, None], (k / safe)[:, None] * (delta / safe[:, None]), 0.0)
+        forces = _scatter_pairs(n, i, np.zeros(0, dtype=np.int64), force)
         
-        direction = delta / distance
+        # Too close: strong random push, drawn per pair in row order
+        close = (i < j) & ~self.adjacent[i, j] & (distance < 0.1)
+        if close.any():
+            ci, cj = i[close], j[close]
+            pair_order = np.lexsort((cj, ci))
+            pushes = self._sample_rng(b).uniform(-5, 5, (len(pair_order), 2))
+            for a, c, push in zip(ci[pair_order], cj[pair_order], pushes):
+                if self.repels[a, c]:
+                    forces[a] += push
+                if self.repels[c, a]:
+                    forces[c] -= push
         
-        # Stronger force if in "avoid" direction
-        if vastu_pref:
-            weight = vastu_pref["weight"]
-        else:
-            # Outdoor anchor: gentler pull to avoid disturbing indoor layout
-            weight = 0.4
-        force_magnitude = self.params.vastu_force_strength * weight
+        # Far field: indoor rooms only feel indoor rooms, outdoor rooms feel everything
+        cell_ids = np.arange(cells * cells)
+        cell_coords = np.stack([cell_ids // cells, cell_ids % cells], axis=1)
+        for receivers, sources in ((~self.outdoor, ~self.outdoor), (self.outdoor, np.ones(n, dtype=bool))):
+            r = np.flatnonzero(receivers)
+            if len(r) == 0 or not sources.any():
+                continue
+            count = np.bincount(key[sources], minlength=cells * cells)
+            occupied = np.flatnonzero(count)
+            centroid = np.stack([
+                np.bincount(key[sources], pos[sources, axis], cells * cells)[occupied] for axis in range(2)
+            ], axis=1) / count[occupied, None]
+            far = (np.abs(cell_coords[occupied][None, :, :] - coords[r][:, None, :]) > rings).any(axis=2)
+            delta = pos[r][:, None, :] - centroid[None, :, :]
+            dist2 = np.where(far, delta[..., 0] ** 2 + delta[..., 1] ** 2, 1.0)
+            forces[r] += np.where(far[..., None], (k * count[occupied] / dist2)[..., None] * delta, 0.0).sum(axis=1)
         
-        return force_magnitude * direction
+        # Adjacent rooms attract rather than repel: remove them from the monopoles
+        ei, ej = self.edges[0], self.edges[1]
+        far_edges = (np.abs(coords[ei] - coords[ej]) > rings).any(axis=1)
+        ei, ej = ei[far_edges], ej[far_edges]
+        delta = pos[ei] - pos[ej]
+        dist2 = delta[:, 0] ** 2 + delta[:, 1] ** 2
+        return forces - _scatter_pairs(n, ei, ej, (k / dist2)[:, None] * delta)
     
-    def _calculate_boundary_force(self, room_id: str) -> np.ndarray:
-        """Calculate force to keep room within plot boundaries"""
-        pos = self.positions[room_id]
-        width, height = self.dimensions[room_id]
-        force = np.zeros(2)
-
-        # Polygon boundaries
-        if self.plot_shape == "irregular" and self.plot_polygon:
-            corners = [
-                pos + np.array([-width/2, -height/2]),
-                pos + np.array([width/2, -height/2]),
-                pos + np.array([width/2, height/2]),
-                pos + np.array([-width/2, height/2])
-            ]
-            
-            for corner in corners:
-                if not self._point_in_polygon(corner):
-                    # Find nearest edge
-                    min_dist = float('inf')
-                    best_normal = np.zeros(2)
-                    
-                    n = len(self.plot_polygon)
-                    for i in range(n):
-                        edge_start = np.array(self.plot_polygon[i])
-                        edge_end = np.array(self.plot_polygon[(i + 1) % n])
-                        
-                        proj, dist = self._project_point_to_edge(corner, edge_start, edge_end)
-                        if dist < min_dist:
-                            min_dist = dist
-                            # Normal points inward
-                            edge_vec = edge_end - edge_start
-                            normal = np.array([-edge_vec[1], edge_vec[0]])
-                            normal = normal / np.linalg.norm(normal)
-                            # Check if normal points inward
-                            center = np.mean(self.plot_polygon, axis=0)
-                            if np.dot(normal, center - proj) < 0:
-                                normal = -normal
-                            best_normal = normal
-                    
-            # For irregular polygons, keep standard strength
-            force += self.params.boundary_force_strength * min_dist * best_normal
-            return force
-
-        # Circular boundaries
-        if self.plot_shape == "circular" and self.plot_circle:
-            center = np.array(self.plot_circle.get("center", [self.plot_width/2, self.plot_length/2]))
-            radius = float(self.plot_circle.get("radius", min(self.plot_width, self.plot_length)/2))
-            # Apply force for each corner exceeding radius
-            corners = [
-                pos + np.array([-width/2, -height/2]),
-                pos + np.array([width/2, -height/2]),
-                pos + np.array([width/2, height/2]),
-                pos + np.array([-width/2, height/2])
-            ]
-            for corner in corners:
-                delta = corner - center
-                dist = np.linalg.norm(delta)
-                overflow = dist - radius
-                if overflow > 0:
-                    direction = delta / (dist if dist > 1e-6 else 1.0)
-                    force -= self.params.boundary_force_strength * overflow * direction
-            return force
-
-        # Triangular boundaries
-        if self.plot_shape == "triangular":
-            # Left and top hard boundaries
-            if pos[0] - width/2 < 0:
-                force[0] += (self.params.boundary_force_strength * 5.0) * abs(pos[0] - width/2)
-            if pos[1] - height/2 < 0:
-                force[1] += (self.params.boundary_force_strength * 5.0) * abs(pos[1] - height/2)
-            # Hypotenuse boundary: (x+w/2)/W + (y+h/2)/L <= 1
-            corner = pos + np.array([width/2, height/2])
-            val = corner[0] / self.plot_width + corner[1] / self.plot_length - 1.0
-            if val > 0:
-                grad = np.array([1.0 / self.plot_width, 1.0 / self.plot_length])
-                # multiply force strength for triangular plots to prevent escape
-                force -= (self.params.boundary_force_strength * 5.0) * val * grad * max(width, height)
-            return force
-
+    def _calculate_vastu_forces(self) -> np.ndarray:
+        """Constant-magnitude pull toward each room's Vastu-preferred position"""
+        delta = self.vastu_target - self.pos
+        distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+        # Rooms within 0.5m of their target are already close enough
+        active = self.vastu_pull & (distance >= 0.5)
+        direction = delta / np.where(active, distance, 1.0)[..., None]
+        magnitude = self.params.vastu_force_strength * self.vastu_weight
+        return np.where(active[..., None], magnitude[:, None] * direction, 0.0)
+    
+    def _calculate_boundary_forces(self) -> np.ndarray:
+        """Forces pushing rooms back inside the plot boundaries"""
+        strength = self.params.boundary_force_strength
+        
+        # Non-rectangular plots: every corner beyond the boundary is pushed back
+        # along the SDF normal, in proportion to its depth
+        if self.boundary is not None:
+            if self.plot_shape == "triangular":
+                strength = strength * 5.0  # Stronger, to keep rooms out of the acute corners
+            depth, normal = self._corner_penetration(self.pos, self.size)
+            return -((strength * np.maximum(depth, 0.0))[..., None] * normal).sum(axis=-2)
+        
         # Rectangular boundaries (default)
-        if pos[0] - width/2 < 0:
-            force[0] += self.params.boundary_force_strength * abs(pos[0] - width/2)
-        if pos[0] + width/2 > self.plot_width:
-            force[0] -= self.params.boundary_force_strength * (pos[0] + width/2 - self.plot_width)
-        if pos[1] - height/2 < 0:
-            force[1] += self.params.boundary_force_strength * abs(pos[1] - height/2)
-        if pos[1] + height/2 > self.plot_length:
-            force[1] -= self.params.boundary_force_strength * (pos[1] + height/2 - self.plot_length)
-        return force
+        half = self.size / 2
+        lo = self.pos - half
+        hi = self.pos + half - np.array([self.plot_width, self.plot_length])
+        return np.where(lo < 0, strength * np.abs(lo), 0.0) - np.where(hi > 0, strength * hi, 0.0)
     
-    def _calculate_all_forces(self, G: nx.Graph) -> Dict[str, np.ndarray]:
-        """Calculate all forces for all rooms"""
-        forces = {room_id: np.zeros(2) for room_id in self.positions.keys()}
-        
-        # 1. Attractive forces (adjacent rooms)
-        for edge in G.edges(data=True):
-            room1_id, room2_id, data = edge
-            weight = data.get('weight', 1.0)
-            force = self._calculate_attractive_force(room1_id, room2_id, weight)
-            forces[room1_id] += force
-            forces[room2_id] -= force
-        
-        # 2. Repulsive forces (non-adjacent rooms)
-        room_ids = list(self.positions.keys())
-        for i, room1_id in enumerate(room_ids):
-            for room2_id in room_ids[i+1:]:
-                if not G.has_edge(room1_id, room2_id):
-                    is_outdoor_1 = bool(G.nodes[room1_id].get('is_outdoor', False))
-                    is_outdoor_2 = bool(G.nodes[room2_id].get('is_outdoor', False))
-                    force = self._calculate_repulsive_force(room1_id, room2_id)
-                    if is_outdoor_1 and not is_outdoor_2:
-                        # Push outdoor away from indoor without moving indoor
-                        forces[room1_id] += force
-                    elif is_outdoor_2 and not is_outdoor_1:
-                        forces[room2_id] -= force
-                    else:
-                        # Symmetric for indoor-indoor and outdoor-outdoor
-                        forces[room1_id] += force
-                        forces[room2_id] -= force
+    def _calculate_static_forces(self) -> np.ndarray:
+        """Springs to and repulsion from the fixed rooms (see _pack_state)"""
+        forces = np.zeros_like(self.pos)
+        if not self.static_ids:
+            return forces
+        n = self.pos.shape[1]
         
-        # 3. Vastu forces
-        for room_id in self.positions.keys():
-            room_type = G.nodes[room_id]['room_type']
-            vastu_force = self._calculate_vastu_force(room_id, room_type)
-            forces[room_id] += vastu_force
+        # Springs anchored at fixed rooms
+        i, k, weight, ideal = self.static_edges
+        if len(i):
+            delta = self.static_pos[:, k] - self.pos[:, i]
+            distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+            active = distance >= 0.1
+            magnitude = self.params.attraction_strength * weight * (distance - ideal)
+            force = np.where(active[..., None], magnitude[..., None] * delta / np.where(active, distance, 1.0)[..., None], 0.0)
+            forces += np.stack([_scatter_pairs(n, i, np.zeros(0, dtype=np.int64), f) for f in force])
         
-        # 4. Boundary forces
-        for room_id in self.positions.keys():
-            boundary_force = self._calculate_boundary_force(room_id)
-            forces[room_id] += boundary_force
+        if self.use_static_grid:
+            return forces + np.stack([self._static_grid_repulsion(b) for b in range(len(self.pos))])
         
+        # Every (movable, fixed) pair, F = k / distance away from the fixed room
+        delta = self.pos[:, :, None, :] - self.static_pos[:, None, :, :]
+        distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+        active = self.static_repels & (distance >= 0.1)
+        safe = np.where(active, distance, 1.0)
+        magnitude = self.params.repulsion_strength * (5.0 / safe)
+        forces += np.where(active[..., None], magnitude[..., None] * delta / safe[..., None], 0.0).sum(axis=2)
+        close = ~self.static_adjacent & (distance < 0.1)
+        for b in np.flatnonzero(close.any(axis=(1, 2))):
+            forces[b] += self._static_pushes(b, *np.nonzero(close[b]))
         return forces
     
-    def _physics_step(self, G: nx.Graph) -> float:
-        """Execute one physics simulation step, return max velocity"""
-        # Calculate forces
-        forces = self._calculate_all_forces(G)
-        
-        max_velocity = 0.0
-        
-        # Update velocities and positions
-        for room_id in self.positions.keys():
-            # Update velocity: v = (v + F) * damping
-            # If node is fixed (phase-1 indoor), don't update its velocity/position
-            if room_id in getattr(self, "fixed_nodes", set()):
-                # ensure velocity zeroed
-                self.velocities[room_id] = np.zeros(2)
+    def _static_pushes(self, b: int, rows: np.ndarray, cols: np.ndarray) -> np.ndarray:
+        """Strong random push off fixed rooms whose centers (nearly) coincide with a movable
+        room's, drawn per pair in (row, col) order from the sample's RNG"""
+        pushes = self._sample_rng(b).uniform(-5, 5, (len(rows), 2))
+        pushing = self.static_repels[rows, cols]
+        return _scatter_pairs(self.pos.shape[1], rows[pushing], np.zeros(0, dtype=np.int64), pushes[pushing])
+    
+    def _static_grid_repulsion(self, b: int) -> np.ndarray:
+        """Repulsion from sample b's fixed rooms through its prebuilt StaticGrid: exact
+        over the fixed rooms within ceil(1 / theta) rings of cells, monopoles beyond"""
+        grid = self.static_grids[b]
+        pos, static_pos = self.pos[b], self.static_pos[b]
+        n, cells = len(pos), grid.cells
+        k = self.params.repulsion_strength * 5.0
+        rings = max(1, math.ceil(1.0 / self.params.repulsion_theta))
+        coords = np.clip(((pos - grid.lo) / grid.cell_size).astype(np.int64), 0, cells - 1)
+        
+        # Near field: every (movable room, fixed room in a neighbouring cell) pair
+        rows, cols = [], []
+        for dx in range(-rings, rings + 1):
+            for dy in range(-rings, rings + 1):
+                neighbour = coords + (dx, dy)
+                src = np.flatnonzero(((neighbour >= 0) & (neighbour < cells)).all(axis=1))
+                cell = neighbour[src, 0] * cells + neighbour[src, 1]
+                start, count = grid.bounds[cell], grid.bounds[cell + 1] - grid.bounds[cell]
+                offsets = np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)
+                rows.append(np.repeat(src, count))
+                cols.append(grid.order[np.repeat(start, count) + offsets])
+        i, j = np.concatenate(rows), np.concatenate(cols)
+        delta = pos[i] - static_pos[j]
+        distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+        active = self.static_repels[i, j] & (distance >= 0.1)
+        safe = np.where(active, distance, 1.0)
+        force = np.where(active[:, None], (k / safe)[:, None] * (delta / safe[:, None]), 0.0)
+        forces = _scatter_pairs(n, i, np.zeros(0, dtype=np.int64), force)
+        close = ~self.static_adjacent[i, j] & (distance < 0.1)
+        if close.any():
+            pair_order = np.lexsort((j[close], i[close]))
+            forces += self._static_pushes(b, i[close][pair_order], j[close][pair_order])
+        
+        # Far field: indoor rooms only feel indoor fixed rooms, outdoor rooms feel all
+        for outdoor_receiver in (False, True):
+            r = np.flatnonzero(self.outdoor == outdoor_receiver)
+            cell_coords, count, centroid = grid.monopoles[outdoor_receiver]
+            if len(r) == 0 or len(count) == 0:
                 continue
-
-            self.velocities[room_id] = (self.velocities[room_id] + forces[room_id]) * self.params.damping
-
-            # Update position: pos = pos + v * dt
-            self.positions[room_id] += self.velocities[room_id] * self.params.time_step
-            
-            # Enforce hard boundaries
-            width, height = self.dimensions[room_id]
-            if self.plot_shape == "irregular" and self.plot_polygon:
-                self.positions[room_id] = self._project_inside_polygon(self.positions[room_id], width, height)
-            elif self.plot_shape == "circular" and self.plot_circle:
-                self.positions[room_id] = self._project_inside_circle(self.positions[room_id], width, height)
-            elif self.plot_shape == "triangular":
-                # Ensure left/top boundaries
-                self.positions[room_id][0] = max(self.positions[room_id][0], width/2)
-                self.positions[room_id][1] = max(self.positions[room_id][1], height/2)
-                # Project corner onto hypotenuse if outside
-                corner = self.positions[room_id] + np.array([width/2, height/2])
-                val = corner[0] / self.plot_width + corner[1] / self.plot_length - 1.0
-                if val > 0:
-                    grad = np.array([1.0 / self.plot_width, 1.0 / self.plot_length])
-                    alpha = val / np.dot(grad, grad)
-                    corner = corner - alpha * grad
-                    self.positions[room_id] = corner - np.array([width/2, height/2])
-                # Extra safety: if center somehow outside polygon, snap back
-                center = self.positions[room_id]
-                if self.plot_polygon and not gu.point_in_polygon((float(center[0]), float(center[1])), self.plot_polygon):
-                    proj = gu.project_point_inside((float(center[0]), float(center[1])), self.plot_polygon)
-                    # project returns a point; keep same relative offset of center
-                    self.positions[room_id] = np.array(proj)
-                # Ensure all corners are inside after snapping
-                self.positions[room_id] = self._project_inside_polygon(self.positions[room_id], width, height)
-            else:
-                self.positions[room_id][0] = np.clip(
-                    self.positions[room_id][0],
-                    width/2,
-                    self.plot_width - width/2
-                )
-                self.positions[room_id][1] = np.clip(
-                    self.positions[room_id][1],
-                    height/2,
-                    self.plot_length - height/2
-                )
-            
-            # Track max velocity for convergence check
-            velocity_magnitude = np.linalg.norm(self.velocities[room_id])
-            max_velocity = max(max_velocity, velocity_magnitude)
+            far = (np.abs(cell_coords[None, :, :] - coords[r][:, None, :]) > rings).any(axis=2)
+            delta = pos[r][:, None, :] - centroid[None, :, :]
+            dist2 = np.where(far, delta[..., 0] ** 2 + delta[..., 1] ** 2, 1.0)
+            forces[r] += np.where(far[..., None], (k * count / dist2)[..., None] * delta, 0.0).sum(axis=1)
         
-        return max_velocity
+        # Adjacent fixed rooms attract rather than repel: remove them from the monopoles
+        ei, ek = self.static_edges[0], self.static_edges[1]
+        static_coords = np.clip(((static_pos[ek] - grid.lo) / grid.cell_size).astype(np.int64), 0, cells - 1)
+        counted = (np.abs(coords[ei] - static_coords) > rings).any(axis=1) & ~(~self.outdoor[ei] & self.static_outdoor[ek])
+        ei, ek = ei[counted], ek[counted]
+        delta = pos[ei] - static_pos[ek]
+        dist2 = delta[:, 0] ** 2 + delta[:, 1] ** 2
+        return forces - _scatter_pairs(n, ei, np.zeros(0, dtype=np.int64), (k / dist2)[:, None] * delta)
+    
+    def _calculate_all_forces(self) -> np.ndarray:
+        """Net force on every movable room of every sample, (B, N, 2)"""
+        if self.use_grid:
+            forces = self._calculate_edge_attractive_forces()
+            forces += self._calculate_grid_repulsive_forces()
+        else:
+            # delta[b, i, j] = pos[b, j] - pos[b, i]
+            delta = self.pos[:, None, :, :] - self.pos[:, :, None, :]
+            distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+            forces = self._calculate_attractive_forces(delta, distance)
+            forces += self._calculate_repulsive_forces(delta, distance)
+        forces += self._calculate_static_forces()
+        forces += self._calculate_vastu_forces()
+        forces += self._calculate_boundary_forces()
+        return forces
+    
+    def _enforce_bounds(self):
+        """Hard-project the rooms of every sample inside the plot (one corner pass: the
+        boundary force and the next steps finish what it leaves)"""
+        self.pos = self._project_into_plot(self.pos, self.size, passes=1, margin=None)
     
-    def _run_simulation(self, G: nx.Graph) -> Tuple[bool, int]:
-        """Run physics simulation until convergence or max iterations"""
-        logger.info("Starting physics simulation...")
+    def _physics_step(self) -> np.ndarray:
+        """Execute one physics simulation step with the configured integrator, return
+        each sample's max velocity (over the movable rooms: fixed ones are not simulated)"""
+        if self.pos.shape[1] == 0:
+            return np.zeros(len(self.pos))
+        if self.params.integrator == "fire":
+            return self._fire_step()
+        if self.params.integrator == "verlet":
+            return self._verlet_step()
+        return self._euler_step()
+    
+    def _euler_step(self) -> np.ndarray:
+        """Damped explicit Euler step with the fixed time_step"""
+        forces = self._calculate_all_forces()
         
-        for iteration in range(self.params.max_iterations):
-            max_velocity = self._physics_step(G)
-            
-            # Check convergence
-            if max_velocity < self.params.convergence_threshold:
-                logger.info(f"Converged at iteration {iteration} (max_velocity={max_velocity:.4f})")
-                return True, iteration + 1
-            
-            if iteration % 20 == 0:
-                logger.debug(f"Iteration {iteration}: max_velocity={max_velocity:.4f}")
+        # v = (v + F) * damping; pos = pos + v * dt
+        self.vel = (self.vel + forces) * self.params.damping
+        self.pos += self.vel * self.params.time_step
+        
+        # Enforce hard boundaries
+        self._enforce_bounds()
+        
+        speed = np.sqrt(self.vel[..., 0] ** 2 + self.vel[..., 1] ** 2)
+        return speed.max(axis=1)
+    
+    def _advance(self, step: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Move rooms by a (capped) step, project them inside the plot and drop the
+        velocity the boundary absorbed.
+        
+        Returns each sample's max displacement per time_step (comparable to the
+        Euler velocity for the convergence check), the displacements and the
+        mask of rooms the boundary blocked.
+        """
+        length = np.sqrt(step[..., 0] ** 2 + step[..., 1] ** 2)
+        step = step * np.minimum(1.0, self.params.max_step / np.maximum(length, 1e-12))[..., None]
+        before = self.pos
+        self.pos = before + step
+        self._enforce_bounds()
+        moved = self.pos - before
+        # A room pressed against the boundary keeps only the motion it actually made
+        blocked = np.abs(moved - step).max(axis=-1) > 1e-9
+        self.vel[blocked] = (moved / self.dt[:, None, None])[blocked]
+        speed = np.sqrt(moved[..., 0] ** 2 + moved[..., 1] ** 2).max(axis=1) / self.params.time_step
+        return speed, moved, blocked
+    
+    def _fire_step(self) -> np.ndarray:
+        """FIRE: inertial descent that steers velocity along the force, speeds up while
+        going downhill and stops dead (with a smaller dt) as soon as it overshoots"""
+        force, vel = self._calculate_all_forces(), self.vel
+        
+        # Power, force and velocity norms of each sample
+        power = np.sum(force * vel, axis=(1, 2))
+        f_norm = np.sqrt(np.sum(force * force, axis=(1, 2)))
+        v_norm = np.sqrt(np.sum(vel * vel, axis=(1, 2)))
+        downhill = power > 0
+        steer = (downhill & (f_norm > 0))[:, None, None]
+        mixed = (1 - self.fire_alpha)[:, None, None] * vel + (
+            (self.fire_alpha * v_norm)[:, None, None] * force / np.where(f_norm > 0, f_norm, 1.0)[:, None, None]
+        )
+        vel = np.where(steer, mixed, np.where(downhill[:, None, None], vel, 0.0))
+        
+        # Downhill streaks grow dt and decay alpha; going uphill shrinks dt and resets
+        self.fire_downhill = np.where(downhill, self.fire_downhill + 1, 0)
+        grow = downhill & (self.fire_downhill > FIRE_MIN_STEPS)
+        self.dt = np.where(grow, np.minimum(self.dt * FIRE_DT_GROW, self.params.max_time_step),
+                           np.where(downhill, self.dt, self.dt * FIRE_DT_SHRINK))
+        self.fire_alpha = np.where(grow, self.fire_alpha * FIRE_ALPHA_DECAY,
+                                   np.where(downhill, self.fire_alpha, FIRE_ALPHA_START))
+        
+        # Semi-implicit Euler (unit mass)
+        dt = self.dt[:, None, None]
+        self.vel = vel + force * dt
+        return self._advance(self.vel * dt)[0]
+    
+    def _verlet_step(self) -> np.ndarray:
+        """Velocity Verlet with friction and energy monitoring.
+        
+        Each step checks the work-energy balance of the freely moving rooms: the
+        kinetic energy change should match the (trapezoidal) work done by the
+        forces. A large mismatch means dt was too long for the local stiffness,
+        so dt is halved and the velocities quenched; otherwise dt grows.
+        """
+        if self.accel is None:
+            self.accel = self._calculate_all_forces()
+        dt = self.dt[:, None, None]
+        vel = self.vel.copy()
+        
+        speed, moved, blocked = self._advance(vel * dt + 0.5 * self.accel * dt * dt)
+        accel = self._calculate_all_forces()
+        mean_accel = 0.5 * (self.accel + accel)
+        self.accel = accel
+        new_vel = self.vel + mean_accel * dt
+        
+        free = ~blocked[..., None]
+        kinetic_before = 0.5 * np.sum(np.where(free, vel ** 2, 0.0), axis=(1, 2))
+        kinetic_after = 0.5 * np.sum(np.where(free, new_vel ** 2, 0.0), axis=(1, 2))
+        work = np.sum(np.where(free, mean_accel * moved, 0.0), axis=(1, 2))
+        error = np.abs(kinetic_after - kinetic_before - work) / np.maximum(np.maximum(kinetic_before, kinetic_after), 1e-9)
+        
+        # Same friction per unit time as the Euler damping per time_step; rooms
+        # moving against their force (overshoot) are stopped
+        new_vel *= (self.params.damping ** (self.dt / self.params.time_step))[:, None, None]
+        overshoot = np.sum(new_vel * accel, axis=-1) < 0
+        new_vel[overshoot] = 0.0
+        unstable = error > self.params.energy_tolerance
+        new_vel[unstable] *= 0.5
+        floor = self.params.time_step * 0.01
+        self.dt = np.where(unstable, np.maximum(self.dt * 0.5, floor),
+                           np.where(overshoot.any(axis=1), np.maximum(self.dt * 0.8, floor),
+                                    np.minimum(self.dt * 1.1, self.params.max_time_step)))
+        self.vel = new_vel
+        return speed
+    
+    def _run_simulation(self, G: nx.Graph) -> Tuple[np.ndarray, np.ndarray]:
+        """Run physics simulation of all samples until each converges or max iterations.
+        
+        Samples leave the batch as they converge. Returns per-sample converged
+        flags and iteration counts.
+        """
+        logger.info(f"Starting physics simulation ({len(self.samples)} samples)...")
+        self._pack_state(G)
+        converged = np.zeros(len(self.samples), dtype=bool)
+        iterations = np.full(len(self.samples), self.params.max_iterations)
+        try:
+            for iteration in range(self.params.max_iterations):
+                if self.deadline.expired():
+                    logger.info(f"Deadline reached at iteration {iteration}")
+                    self.deadline_hit = True
+                    iterations[self.live] = iteration
+                    return converged, iterations
+        
+                max_velocity = self._physics_step()
+        
+                # Check convergence
+                done = max_velocity < self.params.convergence_threshold
+                if done.any():
+                    for b in np.flatnonzero(done):
+                        logger.info(f"Sample {self.live[b]} converged at iteration {iteration} "
+                                    f"(max_velocity={max_velocity[b]:.4f})")
+                    converged[self.live[done]] = True
+                    iterations[self.live[done]] = iteration + 1
+                    self._retire(done)
+                    if len(self.live) == 0:
+                        return converged, iterations
+        
+                if iteration % 20 == 0:
+                    logger.debug(f"Iteration {iteration}: max_velocity={max_velocity.max():.4f}")
         
-        logger.warning(f"Did not converge after {self.params.max_iterations} iterations")
-        return False, self.params.max_iterations
+            logger.warning(f"{len(self.live)} samples did not converge after {self.params.max_iterations} iterations")
+            return converged, iterations
+        finally:
+            self._unpack_state()
     
     # ========================================================================
     # OVERLAP RESOLUTION
     # ========================================================================
     
-    def _check_overlap(self, room1_id: str, room2_id: str) -> bool:
-        """Check if two rooms overlap"""
-        pos1 = self.positions[room1_id]
-        pos2 = self.positions[room2_id]
-        w1, h1 = self.dimensions[room1_id]
-        w2, h2 = self.dimensions[room2_id]
-        
-        # Convert center positions to corner positions
-        x1 = pos1[0] - w1/2
-        y1 = pos1[1] - h1/2
-        x2 = pos2[0] - w2/2
-        y2 = pos2[1] - h2/2
-        
-        return (x1 < x2 + w2 and x1 + w1 > x2 and
-                y1 < y2 + h2 and y1 + h1 > y2)
-    
     def _resolve_overlaps(self) -> int:
-        """Post-process to resolve any remaining overlaps"""
+        """Post-process to resolve any remaining overlaps.
+        
+        Each pass finds the overlapping pairs with a sweep-and-prune over the
+        rooms' x-intervals, accumulates the separation push of every pair and
+        applies them together (Jacobi), then moves the pushed rooms back inside
+        the plot. Pairs are handled in room order, so passes are reproducible.
+        Returns the number of overlapping pairs left.
+        """
         max_iterations = 20
-        overlap_count = 0
+        room_ids = list(self.positions.keys())
+        n = len(room_ids)
+        pos = np.array([self.positions[r] for r in room_ids], dtype=np.float64).reshape(n, 2)
+        size = np.array([self.dimensions[r] for r in room_ids], dtype=np.float64).reshape(n, 2)
+        # Rooms frozen by a warm start never move: the other room of a pair takes the whole push
+        frozen = np.array([r in self.frozen for r in room_ids], dtype=bool)
         
+        i, j = _sweep_and_prune(pos - size / 2, pos + size / 2)
         for iteration in range(max_iterations):
-            overlaps_resolved = 0
-            room_ids = list(self.positions.keys())
+            if len(i) == 0:
+                break
+            if self.deadline.expired():
+                self.deadline_hit = True
+                break
             
-            for i, room1_id in enumerate(room_ids):
-                for room2_id in room_ids[i+1:]:
-                    if self._check_overlap(room1_id, room2_id):
-                        overlaps_resolved += 1
-                        
-                        # Calculate separation vector
-                        pos1 = self.positions[room1_id]
-                        pos2 = self.positions[room2_id]
-                        delta = pos1 - pos2
-                        distance = np.linalg.norm(delta)
-                        
-                        if distance < 0.1:
-                            # Random push if centers coincide
-                            delta = np.random.uniform(-1, 1, 2)
-                            distance = np.linalg.norm(delta)
-                        
-                        direction = delta / distance
-                        
-                        # Calculate overlap amount
-                        w1, h1 = self.dimensions[room1_id]
-                        w2, h2 = self.dimensions[room2_id]
-                        required_separation = (max(w1, w2) + max(h1, h2)) / 2
-                        
-                        # Push apart
-                        push = (required_separation - distance) / 2
-                        self.positions[room1_id] += direction * push
-                        self.positions[room2_id] -= direction * push
-                        
-                        # Enforce boundaries
-                        for room_id in [room1_id, room2_id]:
-                            w, h = self.dimensions[room_id]
-                            if self.plot_shape == "irregular" and self.plot_polygon:
-                                self.positions[room_id] = self._project_inside_polygon(self.positions[room_id], w, h)
-                            elif self.plot_shape == "triangular":
-                                self.positions[room_id][0] = max(self.positions[room_id][0], w/2)
-                                self.positions[room_id][1] = max(self.positions[room_id][1], h/2)
-                                corner = self.positions[room_id] + np.array([w/2, h/2])
-                                val = corner[0] / self.plot_width + corner[1] / self.plot_length - 1.0
-                                if val > 0:
-                                    grad = np.array([1.0 / self.plot_width, 1.0 / self.plot_length])
-                                    alpha = val / np.dot(grad, grad)
-                                    corner = corner - alpha * grad
-                                    self.positions[room_id] = corner - np.array([w/2, h/2])
-                            else:
-                                self.positions[room_id][0] = np.clip(
-                                    self.positions[room_id][0], w/2, self.plot_width - w/2
-                                )
-                                self.positions[room_id][1] = np.clip(
-                                    self.positions[room_id][1], h/2, self.plot_length - h/2
-                                )
+            # Separation vectors; random push if centers coincide
+            delta = pos[i] - pos[j]
+            distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
+            coincide = distance < 0.1
+            if coincide.any():
+                delta[coincide] = self.rng.uniform(-1, 1, (int(coincide.sum()), 2))
+                distance = np.sqrt(delta[:, 0] ** 2 + delta[:, 1] ** 2)
             
-            overlap_count = overlaps_resolved
-            if overlaps_resolved == 0:
-                break
+            # Push each pair apart by half the missing separation
+            required_separation = (np.maximum(size[i, 0], size[j, 0]) + np.maximum(size[i, 1], size[j, 1])) / 2
+            push = (required_separation - distance) / 2
+            step = (push / distance)[:, None] * delta
+            if frozen.any():
+                share_i = np.where(frozen[i], 0.0, np.where(frozen[j], 2.0, 1.0))[:, None]
+                share_j = np.where(frozen[j], 0.0, np.where(frozen[i], 2.0, 1.0))[:, None]
+                pos += _scatter_pairs(n, i, i[:0], share_i * step) - _scatter_pairs(n, j, j[:0], share_j * step)
+            else:
+                pos += _scatter_pairs(n, i, j, step)
+            
+            # Enforce boundaries
+            moved = np.unique(np.concatenate([i, j]))
+            moved = moved[~frozen[moved]]
+            pos[moved] = self._project_into_plot(pos[moved], size[moved])
+            i, j = _sweep_and_prune(pos - size / 2, pos + size / 2)
         
+        for k, room_id in enumerate(room_ids):
+            self.positions[room_id] = pos[k].copy()
+        
+        overlap_count = len(i)
         if overlap_count > 0:
             logger.warning(f"Could not resolve all overlaps ({overlap_count} remaining)")
         
@@ -970,155 +1514,232 @@ class GraphBasedLayoutSolver:
         Uses the same orientation convention as `_get_vastu_target_position`:
         smaller y => north, smaller x => east.
         """
-        fx = pos[0] / self.plot_width if self.plot_width > 0 else 0.5
-        fy = pos[1] / self.plot_length if self.plot_length > 0 else 0.5
-
-        # Near center tolerance
-        if abs(fx - 0.5) < 0.15 and abs(fy - 0.5) < 0.15:
-            return Direction.CENTER
-
-        # Column buckets
-        if fx < 0.33:
-            col = "left"  # maps to EAST in this coordinate convention
-        elif fx > 0.66:
-            col = "right"  # maps to WEST
-        else:
-            col = "center"
+        return DIRECTION_BUCKETS[int(self._direction_buckets(np.asarray(pos, dtype=np.float64)))]
 
-        # Row buckets
-        if fy < 0.33:
-            row = "top"  # NORTH
-        elif fy > 0.66:
-            row = "bottom"  # SOUTH
-        else:
-            row = "center"
+    def _direction_buckets(self, pos: np.ndarray) -> np.ndarray:
+        """Index into DIRECTION_BUCKETS of room centers pos (..., 2).
 
-        if row == "top":
-            if col == "left":
-                return Direction.NORTHEAST
-            elif col == "center":
-                return Direction.NORTH
-            else:
-                return Direction.NORTHWEST
-        elif row == "bottom":
-            if col == "left":
-                return Direction.SOUTHEAST
-            elif col == "center":
-                return Direction.SOUTH
-            else:
-                return Direction.SOUTHWEST
-        else:
-            if col == "left":
-                return Direction.EAST
-            elif col == "right":
-                return Direction.WEST
-            else:
-                return Direction.CENTER
-
-    def _calculate_score(self, G: nx.Graph) -> float:
-        """Calculate quality score (0-100)"""
-        score = 100.0
+        Column and row are the plot thirds (0.33 / 0.66 of the width and
+        length) counted by comparison; the near-center tolerance (within 0.15
+        of the middle on both axes) lies inside the middle ninth.
+        """
+        fx = pos[..., 0] / self.plot_width if self.plot_width > 0 else np.full(pos.shape[:-1], 0.5)
+        fy = pos[..., 1] / self.plot_length if self.plot_length > 0 else np.full(pos.shape[:-1], 0.5)
+        col = (fx >= 0.33).astype(np.int64) + (fx > 0.66)
+        row = (fy >= 0.33).astype(np.int64) + (fy > 0.66)
+        return 3 * row + col
+
+    def _vastu_score_row(self, room_type: Any) -> int:
+        """Row of VASTU_SCORE_MATRIX for a room type (indoor via enum, outdoor via string map)"""
+        rt = self._normalize_room_type(room_type)
+        if rt in VASTU_PREFERENCES:
+            return VASTU_SCORE_ROWS[rt]
+        key = str(room_type).lower()
+        if _is_outdoor(room_type) and key in OUTDOOR_VASTU_PREFERENCES:
+            return VASTU_SCORE_ROWS[key]
+        return len(VASTU_SCORE_MATRIX) - 1
+
+    def _calculate_score(self, G: nx.Graph) -> np.ndarray:
+        """Quality score (0-100) of every sample, (B,); each term is evaluated for the whole batch"""
+        room_ids = list(self.samples[0].positions.keys())
+        index = {room_id: i for i, room_id in enumerate(room_ids)}
+        batch, n = len(self.samples), len(room_ids)
+        pos = np.array([[s.positions[r] for r in room_ids] for s in self.samples], dtype=np.float64).reshape(batch, n, 2)
+        size = np.array([[s.dimensions[r] for r in room_ids] for s in self.samples], dtype=np.float64).reshape(batch, n, 2)
+        w, h = size[..., 0], size[..., 1]
+        # Top-left corners
+        x, y = pos[..., 0] - w/2, pos[..., 1] - h/2
+        score = np.full(batch, 100.0)
         
-        # 1. Penalty for overlaps
-        overlap_count = 0
-        room_ids = list(self.positions.keys())
-        for i, room1_id in enumerate(room_ids):
-            for room2_id in room_ids[i+1:]:
-                if self._check_overlap(room1_id, room2_id):
-                    overlap_count += 1
-                    score -= 15  # Heavy penalty per overlap
+        # 1. Penalty for overlaps (same boxes as _resolve_overlaps; sweep and prune for large programs)
+        lo, hi = pos - size / 2, pos + size / 2
+        if n > SWEEP_SCORE_ROOMS:
+            overlaps = np.array([len(_sweep_and_prune(lo[b], hi[b])[0]) for b in range(batch)])
+        else:
+            overlap = ((lo[:, :, None] < hi[:, None, :]) & (hi[:, :, None] > lo[:, None, :])).all(axis=-1)
+            overlaps = np.triu(overlap, k=1).sum(axis=(1, 2))
+        score -= 15 * overlaps  # Heavy penalty per overlap
         
         # 2. Penalty for poor adjacency (connected rooms too far)
-        for edge in G.edges():
-            room1_id, room2_id = edge
-            distance = np.linalg.norm(self.positions[room1_id] - self.positions[room2_id])
-            if distance > 10:  # Rooms should be within 10m
-                score -= (distance - 10) * 0.5
+        if G.number_of_edges():
+            edge_i, edge_j = np.array([[index[a], index[b]] for a, b in G.edges()]).T
+            delta = pos[:, edge_i] - pos[:, edge_j]
+            distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+            # Rooms should be within 10m
+            score -= np.where(distance > 10, (distance - 10) * 0.5, 0.0).sum(axis=1)
         
         # 3. Penalty for rooms out of bounds
-        for room_id, pos in self.positions.items():
-            w, h = self.dimensions[room_id]
-            
-            if self.plot_shape == "irregular" and self.plot_polygon:
-                # Check all corners
-                corners = [
-                    pos + np.array([-w/2, -h/2]),
-                    pos + np.array([w/2, -h/2]),
-                    pos + np.array([w/2, h/2]),
-                    pos + np.array([-w/2, h/2])
-                ]
-                
-                for corner in corners:
-                    if not self._point_in_polygon(corner):
-                        # Find distance to nearest edge
-                        min_dist = float('inf')
-                        n = len(self.plot_polygon)
-                        for i in range(n):
-                            edge_start = np.array(self.plot_polygon[i])
-                            edge_end = np.array(self.plot_polygon[(i + 1) % n])
-                            _, dist = self._project_point_to_edge(corner, edge_start, edge_end)
-                            min_dist = min(min_dist, dist)
-                        
-                        score -= min(10, min_dist * 2)
-            
-            elif self.plot_shape == "triangular":
-                # Left/top bounds
-                if pos[0] - w/2 < 0 or pos[1] - h/2 < 0:
-                    score -= 10
-                # Hypotenuse overflow
-                corner = pos + np.array([w/2, h/2])
-                val = corner[0] / self.plot_width + corner[1] / self.plot_length - 1.0
-                if val > 0:
-                    score -= min(10, val * 100)
-            
-            else:
-                # Rectangular bounds
-                if (pos[0] - w/2 < 0 or pos[0] + w/2 > self.plot_width or
-                    pos[1] - h/2 < 0 or pos[1] + h/2 > self.plot_length):
-                    score -= 10
-
-        # 4. Vastu direction compliance and zoning bonuses
-        for room_id, pos in self.positions.items():
-            room_type_raw = G.nodes[room_id].get('room_type')
-            rt = self._normalize_room_type(room_type_raw)
-            is_outdoor = _is_outdoor(room_type_raw)
-
-            # Get preferences (indoor via enum, outdoor via string map)
-            prefs: Optional[Dict[str, Any]] = None
-            if rt:
-                prefs = VASTU_PREFERENCES.get(rt)
-            if is_outdoor and prefs is None:
-                prefs = OUTDOOR_VASTU_PREFERENCES.get(str(room_type_raw).lower(), None)
-
-            if not prefs:
-                continue
-
-            direction = self._infer_direction_from_pos(pos)
-            weight = float(prefs.get("weight", 0.5)) if isinstance(prefs, dict) else 0.5
-            preferred = set(prefs.get("preferred", [])) if isinstance(prefs, dict) else set()
-            acceptable = set(prefs.get("acceptable", [])) if isinstance(prefs, dict) else set()
-            avoid = set(prefs.get("avoid", [])) if isinstance(prefs, dict) else set()
-
-            if direction in preferred:
-                score += 1.5 * weight
-            elif direction in acceptable:
-                score += 0.5 * weight
-            elif direction in avoid:
-                score -= 2.0 * weight
-
+        if self.plot_shape == "irregular" and self.plot_polygon:
+            # Every corner outside the polygon, by its exact distance to the nearest edge
+            outside = self.boundary.measure(pos[..., None, :] + CORNER_SIGNS * size[..., None, :] / 2)[0]
+            score -= np.minimum(10, np.maximum(outside, 0.0) * 2).sum(axis=(1, 2))
+        
+        elif self.plot_shape == "triangular":
+            # Left/top bounds
+            score -= 10 * ((x < 0) | (y < 0)).sum(axis=1)
+            # Hypotenuse overflow
+            val = (pos[..., 0] + w/2) / self.plot_width + (pos[..., 1] + h/2) / self.plot_length - 1.0
+            score -= np.where(val > 0, np.minimum(10, val * 100), 0.0).sum(axis=1)
+        
+        else:
+            # Rectangular bounds
+            outside = (x < 0) | (pos[..., 0] + w/2 > self.plot_width) | (y < 0) | (pos[..., 1] + h/2 > self.plot_length)
+            score -= 10 * outside.sum(axis=1)
+        
+        # 4. Vastu direction compliance and zoning bonuses: each room's row of the
+        # [room type x direction] matrix, looked up at its direction bucket
+        rows = np.array([self._vastu_score_row(G.nodes[room_id].get('room_type')) for room_id in room_ids], dtype=np.int64)
+        score += VASTU_SCORE_MATRIX[rows, self._direction_buckets(pos)].sum(axis=1)
+        
         # 5. Aspect ratio penalty for unrealistic elongated rooms
-        for room_id, (w, h) in self.dimensions.items():
-            if w and h and min(w, h) > 0:
-                ratio = max(w, h) / min(w, h)
-                if ratio > 2.2:
-                    score -= (ratio - 2.2) * 3.0
+        short, long = np.minimum(w, h), np.maximum(w, h)
+        ratio = long / np.where(short > 0, short, 1.0)
+        score -= np.where((short > 0) & (ratio > 2.2), (ratio - 2.2) * 3.0, 0.0).sum(axis=1)
         
-        return max(0, min(100, score))
+        return np.clip(score, 0, 100)
+    
+    # ========================================================================
+    # FEASIBILITY PRE-CHECK
+    # ========================================================================
+    
+    def _room_footprints(self, rooms: List[Dict[str, Any]]) -> List[fz.RoomFootprint]:
+        """Preferred and minimum sizes (from ROOM_SIZES) of the requested rooms"""
+        footprints = []
+        for room in rooms:
+            rt = self._normalize_room_type(room["type"])
+            specs = ROOM_SIZES.get(rt, {"width": 4.0, "height": 4.0})
+            preferred = (specs["width"], specs["height"])
+            min_area = specs.get("min_area", preferred[0] * preferred[1])
+            minimum = fz.scale_to_area(*preferred, min_area) if min_area < preferred[0] * preferred[1] else preferred
+            vastu_pref = VASTU_PREFERENCES.get(rt) if rt else None
+            zone = vastu_pref["preferred"][0].value if vastu_pref and len(vastu_pref["preferred"]) == 1 else None
+            footprints.append(fz.RoomFootprint(room["id"], room["type"], preferred, minimum, zone))
+        return footprints
+    
+    def _infeasible_response(self, report: fz.FeasibilityReport, warnings: List[str], elapsed: float) -> SolverResponse:
+        """Early exit: no layout, just the report"""
+        logger.info(f"Infeasible room program: {'; '.join(report.issues) or 'rooms exceed the plot at preferred size'}")
+        issues = report.issues or [
+            f"Rooms do not fit the plot at their preferred sizes "
+            f"({report.preferred_area:.1f} m² requested, plot has {report.plot_area:.1f} m²)"
+        ]
+        return SolverResponse(
+            rooms=[],
+            score=0.0,
+            iterations=0,
+            solver_type="graph",
+            generation_time=round(elapsed, 3),
+            converged=False,
+            warnings=warnings + issues + report.warnings,
+            stopped_reason="infeasible",
+            feasibility=report.to_dict()
+        )
+    
+    def _result_rooms(self, rooms: List[Dict[str, Any]], sample: LayoutSample) -> List[Room]:
+        """Response rooms (top-left corner positions) of one sample"""
+        result_rooms = []
+        for room_data in rooms:
+            room_id = room_data["id"]
+            pos = sample.positions[room_id]
+            width, height = sample.dimensions[room_id]
+            
+            # Convert center position to corner position
+            x = pos[0] - width / 2
+            y = pos[1] - height / 2
+            
+            room = Room(
+                id=room_id,
+                name=room_data["name"],
+                type=room_data["type"],
+                x=round(x, 2),
+                y=round(y, 2),
+                width=round(width, 2),
+                height=round(height, 2),
+                direction=room_data.get("direction")
+            )
+            room.calculate_area()
+            result_rooms.append(room)
+        return result_rooms
     
     # ========================================================================
     # MAIN SOLVE METHOD
     # ========================================================================
     
+    def _solve_two_phase(self, rooms: List[Dict[str, Any]],
+                         outdoor_list: set) -> Tuple[nx.Graph, np.ndarray, np.ndarray]:
+        """Place indoor rooms first, then outdoor fixtures around the fixed house.
+        
+        Returns the scoring graph and per-sample converged flags and iteration counts.
+        """
+        def _is_room_outdoor(room: Dict[str, Any]) -> bool:
+            # Mark outdoor based on explicit list (id or type) or by type heuristic
+            if _is_outdoor(room.get("type", "")):
+                return True
+            if room.get("id") in outdoor_list or room.get("type") in outdoor_list:
+                return True
+            return False
+
+        indoor_rooms = [r for r in rooms if not _is_room_outdoor(r)]
+        outdoor_rooms = [r for r in rooms if _is_room_outdoor(r)]
+        batch = len(self.samples)
+
+        # Phase 1: indoor-only placement
+        if indoor_rooms:
+            G_indoor = self._build_adjacency_graph(indoor_rooms)
+            self._initialize_samples(indoor_rooms)
+            converged, iterations = self._run_simulation(G_indoor)
+            for sample in self._each_sample():
+                overlap_count = self._resolve_overlaps()
+                if overlap_count > 0:
+                    sample.warnings.append(f"Phase-1: {overlap_count} indoor overlaps remain")
+            # Freeze indoor nodes for phase 2
+            self.fixed_nodes = set(r["id"] for r in indoor_rooms)
+            # If there are no outdoor rooms, use the indoor graph for scoring
+            G = G_indoor
+        else:
+            converged, iterations = np.ones(batch, dtype=bool), np.zeros(batch, dtype=np.int64)
+
+        # Phase 2: place outdoor fixtures into remaining space (if any)
+        if outdoor_rooms:
+            # initialize outdoor room positions (will not overwrite indoor positions)
+            self._initialize_samples(outdoor_rooms)
+            # build full graph (indoor nodes will be present and fixed)
+            G = self._build_adjacency_graph(rooms)
+            converged2, iterations2 = self._run_simulation(G)
+            # merge iteration counts
+            iterations = iterations + iterations2
+            for sample, phase_converged in zip(self._each_sample(), converged2):
+                if not phase_converged:
+                    sample.warnings.append("Phase-2: outdoor placement did not fully converge")
+                overlap_count2 = self._resolve_overlaps()
+                if overlap_count2 > 0:
+                    sample.warnings.append(f"Phase-2: {overlap_count2} overlaps remain after outdoor placement")
+        else:
+            # no outdoor rooms, ensure we at least had a graph run above
+            if not indoor_rooms:
+                G = self._build_adjacency_graph(rooms)
+                self._initialize_samples(rooms)
+                converged, iterations = self._run_simulation(G)
+        return G, converged, iterations
+    
+    def _solve_warm_start(self, rooms: List[Dict[str, Any]]) -> Tuple[nx.Graph, np.ndarray, np.ndarray]:
+        """Re-solve an edited layout: rooms of the prior layout start where they were,
+        new rooms at their Vastu targets, and one simulation moves only the rooms
+        near the change (indoor and outdoor together); the others stay fixed and
+        are never pushed by overlap resolution."""
+        G = self._build_adjacency_graph(rooms)
+        self._initialize_samples(rooms)
+        # New rooms start alike in every sample up to their random offset; the primary one decides
+        primary = self.samples[0]
+        ids = [room["id"] for room in rooms]
+        width, height = np.array([primary.dimensions[r] for r in ids], dtype=np.float64).reshape(len(ids), 2).T
+        center = np.array([primary.positions[r] for r in ids], dtype=np.float64).reshape(len(ids), 2)
+        self.frozen = self.warm_start.frozen_rooms(ids, center[:, 0] - width / 2, center[:, 1] - height / 2, width, height)
+        self.fixed_nodes = set(self.frozen)
+        logger.info(f"Warm start: re-optimizing {len(ids) - len(self.frozen)} of {len(ids)} rooms")
+        converged, iterations = self._run_simulation(G)
+        return G, converged, iterations
+    
     def solve(self, request: SolverRequest) -> SolverResponse:
         """
         Main entry point for graph-based solver.
@@ -1126,6 +1747,10 @@ class GraphBasedLayoutSolver:
         """
         import time
         start_time = time.time()
+        self.deadline = Deadline(self.deadline_ms)
+        self.deadline_hit = False
+        self.fixed_nodes = set()
+        self.frozen = set()
         
         warnings = []
         # Ensure graph reference exists for scoring phase
@@ -1163,63 +1788,51 @@ class GraphBasedLayoutSolver:
                     self.plot_circle = {"center": [self.plot_width/2, self.plot_length/2], "radius": min(self.plot_width, self.plot_length)/2}
                     logger.info("Inferred circular plot from dimensions")
             
-            # Two-phase solving: place indoor rooms first, then outdoor fixtures
-            outdoor_list = set(request.outdoor_fixtures or [])
-
-            def _is_room_outdoor(room: Dict[str, Any]) -> bool:
-                # Mark outdoor based on explicit list (id or type) or by type heuristic
-                if _is_outdoor(room.get("type", "")):
-                    return True
-                if room.get("id") in outdoor_list or room.get("type") in outdoor_list:
-                    return True
-                return False
-
-            indoor_rooms = [r for r in request.rooms if not _is_room_outdoor(r)]
-            outdoor_rooms = [r for r in request.rooms if _is_room_outdoor(r)]
-
-            # Phase 1: indoor-only placement
-            if indoor_rooms:
-                G_indoor = self._build_adjacency_graph(indoor_rooms)
-                self._initialize_positions(indoor_rooms)
-                converged, iterations = self._run_simulation(G_indoor)
-                overlap_count = self._resolve_overlaps()
-                if overlap_count > 0:
-                    warnings.append(f"Phase-1: {overlap_count} indoor overlaps remain")
-                # Freeze indoor nodes for phase 2
-                self.fixed_nodes = set(r["id"] for r in indoor_rooms)
-                # If there are no outdoor rooms, use the indoor graph for scoring
-                G = G_indoor
-            else:
-                converged, iterations = True, 0
-
-            # Phase 2: place outdoor fixtures into remaining space (if any)
-            if outdoor_rooms:
-                # initialize outdoor room positions (will not overwrite indoor positions)
-                self._initialize_positions(outdoor_rooms)
-                # build full graph (indoor nodes will be present and fixed)
-                G = self._build_adjacency_graph(request.rooms)
-                converged2, iterations2 = self._run_simulation(G)
-                # merge iteration counts
-                iterations = iterations + (iterations2 if 'iterations2' in locals() else 0)
-                if not converged2:
-                    warnings.append("Phase-2: outdoor placement did not fully converge")
-                overlap_count2 = self._resolve_overlaps()
-                if overlap_count2 > 0:
-                    warnings.append(f"Phase-2: {overlap_count2} overlaps remain after outdoor placement")
-            else:
-                # no outdoor rooms, ensure we at least had a graph run above
-                if not indoor_rooms:
-                    G = self._build_adjacency_graph(request.rooms)
-                    self._initialize_positions(request.rooms)
-                    converged, iterations = self._run_simulation(G)
+            self.boundary = self._build_boundary()
+            self.warm_start = ws.WarmStart.from_request(request.rooms, request.prior_layout, request.locked_room_ids,
+                                                        request.changed_room_ids, request.impact_radius)
             
-            if not converged:
-                warnings.append("Physics simulation did not fully converge")
+            # Cheap lower bounds first: never simulate a program that cannot fit
+            report = None
+            self.size_overrides = {}
+            if self.feasibility != "ignore":
+                footprints = self._room_footprints(request.rooms)
+                polygon = self.plot_polygon if self.plot_shape == "irregular" else None
+                if self.plot_shape == "triangular":
+                    polygon = self._triangle_polygon()
+                report = fz.analyze(footprints, self.plot_width, self.plot_length,
+                                    polygon=polygon, circle=self.plot_circle if self.plot_shape == "circular" else None,
+                                    raster=self.boundary if polygon else None,
+                                    max_fill=fz.MAX_FILL if self.feasibility == "pack" else 1.0)
+                if not report.feasible or (self.feasibility == "report" and not report.fits_preferred):
+                    return self._infeasible_response(report, warnings, time.time() - start_time)
+                if self.feasibility in ("shrink", "pack"):
+                    self.size_overrides = {f.id: f.minimum for f in footprints if f.id in report.shrink}
+                    if self.size_overrides:
+                        warnings.append(f"Shrunk {len(self.size_overrides)} rooms to their minimum size to fit the plot")
+                warnings.extend(report.warnings)
+            if self.warm_start is not None:
+                # Rooms of the prior layout keep their sizes
+                self.size_overrides.update(self.warm_start.sizes)
+            
+            # Every seed of the batch goes through the same phases; the simulations
+            # run as one (B, N, 2) tensor, overlap resolution per sample
+            self.samples = self._make_samples()
+            batch = len(self.samples)
+            if self.warm_start is not None:
+                G, converged, iterations = self._solve_warm_start(request.rooms)
+            else:
+                G, converged, iterations = self._solve_two_phase(request.rooms, set(request.outdoor_fixtures or []))
             
-            # Resolve any remaining overlaps
-            overlap_count = self._resolve_overlaps()
-            if overlap_count > 0:
-                warnings.append(f"{overlap_count} room overlaps could not be resolved")
+            for sample, sample_converged, sample_iterations in zip(self._each_sample(), converged, iterations):
+                sample.converged, sample.iterations = bool(sample_converged), int(sample_iterations)
+                if not sample.converged:
+                    sample.warnings.append("Physics simulation did not fully converge")
+                
+                # Resolve any remaining overlaps
+                overlap_count = self._resolve_overlaps()
+                if overlap_count > 0:
+                    sample.warnings.append(f"{overlap_count} room overlaps could not be resolved")
             
             # Calculate score
             # Guard against uninitialized graph reference
@@ -1227,43 +1840,51 @@ class GraphBasedLayoutSolver:
                 # Build a graph from whatever rooms we have positions for
                 rooms_for_graph = request.rooms if request.rooms else []
                 G = self._build_adjacency_graph(rooms_for_graph)
-            score = self._calculate_score(G)
+            scores = self._calculate_score(G)
+            for sample, score in zip(self.samples, scores):
+                sample.score = float(score)
             
-            # Build response
-            result_rooms = []
-            for room_data in request.rooms:
-                room_id = room_data["id"]
-                pos = self.positions[room_id]
-                width, height = self.dimensions[room_id]
-                
-                # Convert center position to corner position
-                x = pos[0] - width / 2
-                y = pos[1] - height / 2
-                
-                room = Room(
-                    id=room_id,
-                    name=room_data["name"],
-                    type=room_data["type"],
-                    x=round(x, 2),
-                    y=round(y, 2),
-                    width=round(width, 2),
-                    height=round(height, 2),
-                    direction=room_data.get("direction")
+            # Best first; ties keep the lower sample (the requested seed)
+            ranked = [self.samples[b] for b in np.argsort(-scores, kind="stable")[:self.top_k]]
+            best = ranked[0]
+            self._select(best)
+            
+            warnings = warnings + best.warnings
+            if self.deadline_hit:
+                stopped_reason = "deadline"
+                warnings.append("Deadline reached; returning the best layout so far")
+            elif best.converged:
+                stopped_reason = "converged"
+            else:
+                stopped_reason = "max_iterations"
+            
+            alternatives = [
+                LayoutAlternative(
+                    rooms=self._result_rooms(request.rooms, sample),
+                    score=round(sample.score, 2),
+                    seed=sample.seed,
+                    iterations=sample.iterations,
+                    converged=sample.converged
                 )
-                room.calculate_area()
-                result_rooms.append(room)
+                for sample in ranked[1:]
+            ]
             
             generation_time = time.time() - start_time
-            logger.info(f"Graph solver complete: {generation_time:.2f}s, score={score:.1f}")
+            logger.info(f"Graph solver complete: {generation_time:.2f}s, score={best.score:.1f}"
+                        + (f" (best of {batch} samples)" if batch > 1 else ""))
             
             return SolverResponse(
-                rooms=result_rooms,
-                score=round(score, 2),
-                iterations=iterations,
+                rooms=self._result_rooms(request.rooms, best),
+                score=round(best.score, 2),
+                iterations=best.iterations,
                 solver_type="graph",
                 generation_time=round(generation_time, 3),
-                converged=converged,
-                warnings=warnings
+                converged=best.converged,
+                warnings=warnings,
+                stopped_reason=stopped_reason,
+                feasibility=report.to_dict() if report is not None else None,
+                seed=best.seed,
+                alternatives=alternatives
             )
         
         except Exception as e:
@@ -1284,6 +1905,11 @@ def solve_floor_plan(request: SolverRequest) -> SolverResponse:
         plot_width=request.plot_width,
         plot_length=request.plot_length,
         plot_shape=getattr(request, "plot_shape", "rectangular"),
-        seed=request.seed
+        seed=request.seed,
+        deadline_ms=request.deadline_ms,
+        feasibility=request.feasibility,
+        integrator=request.integrator,
+        batch_size=request.batch_size,
+        top_k=request.top_k
     )
     return solver.solve(request)
\ No newline at end of file
@@ -7,6 +7,7 @@ import numpy as np
 import logging
 import copy
 from shapely.geometry import box, Point, Polygon
+from shapely.geometry.polygon import orient
 from shapely import affinity
 from .phi_grid import PhiGrid
 
@@ -237,19 +238,68 @@ def normalize_vector(x: float, y: float) -> Tuple[float, float]:
         return (0.0, 0.0)
     return (x/mag, y/mag)
 
+def _positive_mean(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Mean of max(0, y) over an interval along which y runs linearly from p to q."""
+    mixed = (p > 0) != (q > 0)
+    return np.where(mixed, np.maximum(p, q) ** 2 / (2 * np.abs(p - q) + ~mixed),
+                    np.where(p > 0, (p + q) / 2, 0.0))
+
+
+def box_polygon_overlap(lo: np.ndarray, hi: np.ndarray, edges: np.ndarray) -> np.ndarray:
+    """Area of each axis-aligned box [lo, hi] (N, 2) inside a polygon given by polygon_edges.
+
+    Green's theorem over the oriented edges: each edge adds the signed area
+    between itself, clamped to the box's rows, and the bottom of the box over
+    the part of its x-span inside the box's columns.
+    """
+    x_min, x_max, ax, ay, slope, direction = edges.T
+    u = np.maximum(x_min, lo[:, :1])
+    v = np.minimum(x_max, hi[:, :1])
+    # clamp(y, y0, y1) - y0 == max(0, y - y0) - max(0, y - y1), both rows at once
+    rows = np.stack([lo[:, 1:], hi[:, 1:]])
+    mean = _positive_mean(ay + slope * (u - ax) - rows, ay + slope * (v - ax) - rows)
+    return (direction * np.maximum(0.0, v - u) * (mean[0] - mean[1])).sum(axis=1)
+
+
+def polygon_edges(polygon: Polygon) -> np.ndarray:
+    """Edge table (E, 6) of a polygon's rings for box_polygon_overlap.
+
+    Columns: x-span (min, max), start point, slope and the sign the edge's
+    trapezoid takes in the area, with the exterior counter-clockwise and holes
+    clockwise. Vertical edges have no x-span and add nothing.
+    """
+    polygon = orient(polygon, 1.0)
+    rings = [np.asarray(ring.coords) for ring in (polygon.exterior, *polygon.interiors)]
+    a = np.concatenate([ring[:-1] for ring in rings])
+    b = np.concatenate([ring[1:] for ring in rings])
+    run = b[:, 0] - a[:, 0]
+    slope = np.divide(b[:, 1] - a[:, 1], run, out=np.zeros_like(run), where=run != 0)
+    return np.column_stack([np.minimum(a[:, 0], b[:, 0]), np.maximum(a[:, 0], b[:, 0]), a, slope, -np.sign(run)])
+
+
 class GraphSolver:
-    """Force-directed graph solver using physics-based optimization."""
+    """Force-directed graph solver using physics-based optimization.
+
+    The working state is an (N, 2) array of room centroids. Each room keeps the
+    half extents of its bounding box and the offset from its centroid to the box
+    center, so rectangular rooms never touch shapely while solving: forces,
+    overlaps, gaps and boundary overflow are all broadcast over the boxes.
+    Polygons are only built for non-rectangular rooms (their pair and boundary
+    terms) and for the RoomStates the solver returns.
+    """
     
     def __init__(self,
                 room_polygons: List[Polygon],
                 boundary_polygon: Polygon,
                 adjacency_graph: Dict[int, List[int]],
-                params: Optional[GraphSolverParams] = None):
+                params: Optional[GraphSolverParams] = None,
+                rng: Optional[np.random.Generator] = None):
         """Initialize solver with room shapes and constraints."""
         self.room_polygons = room_polygons
         self.boundary_polygon = boundary_polygon
         self.adjacency_graph = adjacency_graph
         self.params = params or GraphSolverParams()
+        self.rng = rng if rng is not None else np.random.default_rng()
         self.best_state = None
         self.best_energy = float('inf')
         
@@ -263,8 +313,8 @@ class GraphSolver:
         self.rooms = []
         for i, poly in enumerate(room_polygons):
             # Random position near center
-            x = center_x + np.random.normal(0, width/6)
-            y = center_y + np.random.normal(0, height/6)
+            x = center_x + self.rng.normal(0, width/6)
+            y = center_y + self.rng.normal(0, height/6)
             # translate polygon to initial random position
             placed_poly = affinity.translate(poly, x, y)
             room = RoomState(
@@ -275,129 +325,122 @@ class GraphSolver:
                 polygon=placed_poly
             )
             self.rooms.append(room)
+        
+        # Array state: centroids, boxes around them, and which rooms need shapely
+        n = len(self.rooms)
+        self.initial_center = np.array([[r.polygon.centroid.x, r.polygon.centroid.y] for r in self.rooms]).reshape(n, 2)
+        room_bounds = np.array([r.polygon.bounds for r in self.rooms]).reshape(n, 4)
+        self.half = (room_bounds[:, 2:] - room_bounds[:, :2]) / 2
+        self.box_offset = (room_bounds[:, :2] + room_bounds[:, 2:]) / 2 - self.initial_center
+        self.area = np.array([r.polygon.area for r in self.rooms])
+        self.shaped = np.array([not r.polygon.equals(r.polygon.envelope) for r in self.rooms], dtype=bool)
+        self.shaped_ids = np.flatnonzero(self.shaped).tolist()
+        self.pairs = np.triu_indices(n, k=1)
+        self.adjacent = np.zeros((n, n), dtype=bool)
+        for i, neighbors in adjacency_graph.items():
+            self.adjacent[i, list(neighbors)] = True
+        self.adjacent_pairs = self.adjacent[self.pairs]
+        self.boundary_box = np.array(bounds) if boundary_polygon.equals(boundary_polygon.envelope) else None
+        self.boundary_edges = polygon_edges(boundary_polygon)
+        centroid = boundary_polygon.centroid
+        self.boundary_center = np.array([centroid.x, centroid.y])
+    
+    def _boxes(self, center: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Bounding boxes (lo, hi) of the rooms at the given centroids."""
+        mid = center + self.box_offset
+        return mid - self.half, mid + self.half
+    
+    def _shaped_polygons(self, center: np.ndarray) -> Dict[int, Polygon]:
+        """Non-rectangular rooms moved to the given centroids."""
+        return {i: affinity.translate(self.rooms[i].polygon, *(center[i] - self.initial_center[i]))
+                for i in self.shaped_ids}
     
-    def compute_forces(self, state: List[RoomState]) -> List[Tuple[float, float]]:
-        """Compute net force on each room."""
-        forces = [(0.0, 0.0) for _ in state]
+    def boundary_overflow(self, center: np.ndarray) -> np.ndarray:
+        """Area of each room outside the boundary, 0 for contained rooms."""
+        lo, hi = self._boxes(center)
+        if self.boundary_box is not None:
+            inside = np.minimum(hi, self.boundary_box[2:]) - np.maximum(lo, self.boundary_box[:2])
+            overflow = self.area - np.maximum(0.0, inside).prod(axis=1)
+        else:
+            overflow = self.area - box_polygon_overlap(lo, hi, self.boundary_edges)
+        overflow[overflow <= 1e-9 * self.area] = 0.0  # Rounding of rooms flush with the boundary
+        for i, poly in self._shaped_polygons(center).items():
+            overflow[i] = 0.0 if self.boundary_polygon.contains(poly) else poly.difference(self.boundary_polygon).area
+        return overflow
+    
+    def compute_forces(self, center: np.ndarray, overflow: Optional[np.ndarray] = None) -> np.ndarray:
+        """Compute net force (N, 2) on each room at the given centroids."""
         params = self.params
+        if overflow is None:
+            overflow = self.boundary_overflow(center)
         
-        # Room-room repulsion and adjacency forces
-        for i, room in enumerate(state):
-            room_centroid = room.polygon.centroid
-            
-            for j, other in enumerate(state):
-                if i == j:
-                    continue
-                    
-                other_centroid = other.polygon.centroid
-                
-                # Get vector from other to room
-                dx = room_centroid.x - other_centroid.x
-                dy = room_centroid.y - other_centroid.y
-                dist = np.sqrt(dx*dx + dy*dy)
-                
-                if dist < 1e-6:
-                    continue
-                    
-                # Normalized direction
-                dx, dy = dx/dist, dy/dist
-                
-                # Repulsion force
-                if dist < params.repulsion_radius:
-                    magnitude = params.alpha_r * (
-                        (params.repulsion_radius/dist)**params.repulsion_exponent - 1
-                    )
-                    forces[i] = (
-                        forces[i][0] + magnitude * dx,
-                        forces[i][1] + magnitude * dy
-                    )
-                
-                # Adjacency attraction
-                if j in self.adjacency_graph.get(i, []):
-                    magnitude = -params.alpha_a * dist
-                    forces[i] = (
-                        forces[i][0] + magnitude * dx,
-                        forces[i][1] + magnitude * dy
-                    )
+        # Room-room repulsion and adjacency forces, along the vector from other to room.
+        # Adjacency pulls with alpha_a * dist along the unit vector, i.e. alpha_a * delta.
+        dx = center[:, None, 0] - center[None, :, 0]
+        dy = center[:, None, 1] - center[None, :, 1]
+        dist = np.sqrt(dx * dx + dy * dy)
+        apart = dist >= 1e-6
+        safe = dist + ~apart
+        repulsion = params.alpha_r * ((params.repulsion_radius / safe) ** params.repulsion_exponent - 1) / safe
+        scale = np.where(apart & (dist < params.repulsion_radius), repulsion, 0.0)
+        scale -= params.alpha_a * (apart & self.adjacent)
+        forces = np.column_stack([(scale * dx).sum(axis=1), (scale * dy).sum(axis=1)])
         
-        # Boundary containment force
-        for i, room in enumerate(state):
-            if not self.boundary_polygon.contains(room.polygon):
-                boundary_centroid = self.boundary_polygon.centroid
-                room_centroid = room.polygon.centroid
-                
-                # Push toward boundary center
-                dx = boundary_centroid.x - room_centroid.x
-                dy = boundary_centroid.y - room_centroid.y
-                dist = np.sqrt(dx*dx + dy*dy)
-                
-                if dist > 1e-6:
-                    dx, dy = dx/dist, dy/dist
-                    magnitude = params.alpha_b
-                    forces[i] = (
-                        forces[i][0] + magnitude * dx,
-                        forces[i][1] + magnitude * dy
-                    )
+        # Boundary containment force: rooms sticking out are pushed toward the boundary center
+        to_center = self.boundary_center - center
+        dist = np.sqrt(to_center[:, 0] ** 2 + to_center[:, 1] ** 2)
+        push = (overflow > 0) & (dist > 1e-6)
+        forces[push] += params.alpha_b * to_center[push] / dist[push, None]
         
         return forces
     
-    def update_state(self, state: List[RoomState], forces: List[Tuple[float, float]],
-                   dt: float) -> List[RoomState]:
-        """Update room positions based on forces."""
-        new_state = []
-        for room, (fx, fy) in zip(state, forces):
-            # Apply damping
-            fx *= (1 - self.params.mu)
-            fy *= (1 - self.params.mu)
-            
-            # Update position using shapely translate
-            new_polygon = affinity.translate(room.polygon, fx * dt, fy * dt)
-            new_centroid = new_polygon.centroid
-            
-            # Create new state
-            new_room = RoomState(
+    def update_state(self, center: np.ndarray, forces: np.ndarray, dt: float) -> np.ndarray:
+        """Move the room centroids along the damped forces."""
+        return center + forces * (1 - self.params.mu) * dt
+    
+    def compute_energy(self, center: np.ndarray, overflow: Optional[np.ndarray] = None) -> float:
+        """Compute total system energy (lower is better)."""
+        if overflow is None:
+            overflow = self.boundary_overflow(center)
+        i, j = self.pairs
+        lo, hi = self._boxes(center)
+        
+        # Room-room overlap and gap, from the boxes or shapely for non-rectangular rooms
+        # Per-axis extent of each pair's intersection, negative by the gap where they are apart
+        extent = np.minimum(hi[i], hi[j]) - np.maximum(lo[i], lo[j])
+        overlap = np.maximum(0.0, extent).prod(axis=1)
+        gap = np.sqrt((np.maximum(0.0, -extent) ** 2).sum(axis=1))
+        if self.shaped_ids:
+            polygons = self._shaped_polygons(center)
+            for k in np.flatnonzero(self.shaped[i] | self.shaped[j]):
+                a, b = (polygons.get(m) or box(*lo[m], *hi[m]) for m in (i[k], j[k]))
+                overlap[k], gap[k] = a.intersection(b).area, a.distance(b)
+        
+        # Overlap penalty, adjacency penalty for required pairs and a small reward for separation
+        adjacency = np.where(self.adjacent_pairs, gap * 10, -np.log1p(gap))
+        return float(overlap.sum() * 1000 + adjacency.sum() + overflow.sum() * 1000)
+    
+    def export_state(self, center: np.ndarray) -> List[RoomState]:
+        """RoomStates with the polygons moved to the given centroids."""
+        return [
+            RoomState(
                 id=room.id,
                 type=room.type,
                 width=room.width,
                 height=room.height,
-                polygon=new_polygon,
+                polygon=affinity.translate(room.polygon, *(center[i] - self.initial_center[i])),
                 theta=room.theta
             )
-            new_state.append(new_room)
-            
-        return new_state
-    
-    def compute_energy(self, state: List[RoomState]) -> float:
-        """Compute total system energy (lower is better)."""
-        energy = 0.0
-        
-        # Room-room overlap and adjacency energy
-        for i, room in enumerate(state):
-            for j, other in enumerate(state[i+1:], i+1):
-                # Overlap penalty
-                if room.polygon.intersects(other.polygon):
-                    energy += room.polygon.intersection(other.polygon).area * 1000
-                
-                # Adjacency reward/penalty
-                dist = room.polygon.distance(other.polygon)
-                if j in self.adjacency_graph.get(i, []):
-                    energy += dist * 10  # Penalize non-adjacent required rooms
-                else:
-                    energy -= np.log1p(dist)  # Small reward for separation
-        
-        # Boundary containment
-        for room in state:
-            if not self.boundary_polygon.contains(room.polygon):
-                energy += room.polygon.difference(self.boundary_polygon).area * 1000
-
-        return energy
+            for i, room in enumerate(self.rooms)
+        ]
     
     def solve(self, max_iterations: int = 1000) -> SolverState:
         """Run force-directed optimization."""
-        current_state = self.rooms
-        current_energy = self.compute_energy(current_state)
+        current_state = self.initial_center
+        overflow = self.boundary_overflow(current_state)
+        current_energy = self.compute_energy(current_state, overflow)
         
-        self.best_state = current_state
+        best_center = current_state
         self.best_energy = current_energy
         
         dt = self.params.dt
@@ -406,13 +449,14 @@ class GraphSolver:
         
         while iter_count < max_iterations and stall_count < 100:
             # Compute and apply forces
-            forces = self.compute_forces(current_state)
+            forces = self.compute_forces(current_state, overflow)
             new_state = self.update_state(current_state, forces, dt)
-            new_energy = self.compute_energy(new_state)
+            overflow = self.boundary_overflow(new_state)
+            new_energy = self.compute_energy(new_state, overflow)
             
             # Update best solution
             if new_energy < self.best_energy:
-                self.best_state = new_state
+                best_center = new_state
                 self.best_energy = new_energy
                 stall_count = 0
             else:
@@ -428,6 +472,7 @@ class GraphSolver:
                 dt *= 0.99
         
         # Return best state found with metrics
+        self.best_state = self.export_state(best_center)
         converged = stall_count < 100
         metrics = {
             'graph_energy': self.best_energy,
@@ -7,6 +7,7 @@ import numpy as np
 from dataclasses import dataclass
 from enum import Enum
 import logging
+import shapely
 from shapely.geometry import Point as ShapelyPoint
 from shapely.geometry import Polygon as ShapelyPolygon
 from shapely.geometry import box as shapely_box
@@ -92,10 +93,8 @@ class PhiGrid:
         y = np.linspace(self.ymin, self.ymax, self.ny)
         self.X, self.Y = np.meshgrid(x, y)
         
-        # Build mask using shapely contains
-        points = np.column_stack((self.X.flatten(), self.Y.flatten()))
-        mask = np.array([self.plot_shapely.contains(ShapelyPoint(px, py)) 
-                        for px, py in points]).reshape(self.ny, self.nx)
+        # Build mask using shapely contains, vectorized over the grid points
+        mask = shapely.contains_xy(self.plot_shapely, self.X, self.Y)
         self.mask = mask
         
         # For each room type, compute potential field
@@ -151,7 +151,7 @@ def rooms_have_aligned_edges(poly1: Polygon, poly2: Polygon, tolerance: float =
     return False
 
 def propose_move(current: List[RoomState], req: Dict,
-                params: SAParams) -> List[RoomState]:
+                params: SAParams, rng: np.random.Generator) -> List[RoomState]:
     """Generate candidate state by applying random move.
     
     Available moves:
@@ -175,7 +175,7 @@ def propose_move(current: List[RoomState], req: Dict,
         }
 
     # Select random room
-    room_idx = np.random.randint(len(current))
+    room_idx = int(rng.integers(len(current)))
     room = new_state[room_idx]
 
     # Choose move type based on probabilities
@@ -187,23 +187,23 @@ def propose_move(current: List[RoomState], req: Dict,
         move_probs = np.ones_like(move_probs) / len(move_probs)
     else:
         move_probs = move_probs / s
-    move_type = np.random.choice(move_keys, p=move_probs)
+    move_type = move_keys[rng.choice(len(move_keys), p=move_probs)]
 
     if move_type == 'translate':
         # Random translation
-        dx = np.random.normal(0, params.trans_sigma)
-        dy = np.random.normal(0, params.trans_sigma)
+        dx = rng.normal(0, params.trans_sigma)
+        dy = rng.normal(0, params.trans_sigma)
         room.polygon = affinity.translate(room.polygon, xoff=dx, yoff=dy)
 
     elif move_type == 'rotate' and params.allow_rotations:
         # Random rotation around centroid (angle in radians -> degrees for shapely)
-        angle = np.random.normal(0, np.pi/6)
+        angle = rng.normal(0, np.pi/6)
         angle_deg = np.degrees(angle)
         room.polygon = affinity.rotate(room.polygon, angle_deg, origin='centroid')
 
     elif move_type == 'resize':
         # Random scaling while preserving area
-        scale_x = np.random.uniform(params.resize_min, params.resize_max)
+        scale_x = rng.uniform(params.resize_min, params.resize_max)
         scale_y = 1.0 / scale_x
         room.polygon = affinity.scale(room.polygon, xfact=scale_x, yfact=scale_y, origin='centroid')
 
@@ -211,8 +211,8 @@ def propose_move(current: List[RoomState], req: Dict,
         # Jump to a random valid location inside the plot
         bounds = req['plot'].bounds
         for _ in range(10):
-            x = np.random.uniform(bounds[0], bounds[2])
-            y = np.random.uniform(bounds[1], bounds[3])
+            x = rng.uniform(bounds[0], bounds[2])
+            y = rng.uniform(bounds[1], bounds[3])
             if req['plot'].contains(ShapelyPoint(x, y)):
                 room.polygon = affinity.translate(
                     room.polygon,
@@ -339,7 +339,8 @@ def deterministic_local_improve(state: List[RoomState], req: Dict,
     return improved
 
 def run_sa(initial_state: SolverState, req: Dict, phi: PhiGrid,
-           params: Optional[SAParams] = None) -> SolverState:
+           params: Optional[SAParams] = None,
+           rng: Optional[np.random.Generator] = None) -> SolverState:
     """Run simulated annealing to improve layout.
     
     Args:
@@ -347,11 +348,13 @@ def run_sa(initial_state: SolverState, req: Dict, phi: PhiGrid,
         req: Solver request with rooms, plot, etc.
         phi: Vastu potential field
         params: Optional SA parameters
+        rng: Random generator for moves and acceptance (fresh one if omitted)
         
     Returns:
         Improved SolverState
     """
     params = params or SAParams()
+    rng = rng if rng is not None else np.random.default_rng()
     
     # Initialize state
     current = [r.copy() for r in initial_state.rooms]
@@ -379,12 +382,12 @@ def run_sa(initial_state: SolverState, req: Dict, phi: PhiGrid,
                 logger.info(f"New best energy after local improve: {best_energy:.2f}")
         
         # Generate candidate state
-        candidate = propose_move(current, req, params)
+        candidate = propose_move(current, req, params, rng)
         candidate_energy = compute_energy(candidate, req, phi, params)
         
         # Metropolis acceptance criterion
         delta_e = candidate_energy - current_energy
-        if delta_e < 0 or np.random.random() < np.exp(-delta_e / temperature):
+        if delta_e < 0 or rng.random() < np.exp(-delta_e / temperature):
             current = candidate
             current_energy = candidate_energy
             
@@ -13,6 +13,8 @@ from typing import List, Dict, Any
 import math
 import logging
 
+from ..utils.deadline import Deadline
+
 logger = logging.getLogger(__name__)
 
 try:
@@ -34,6 +36,7 @@ def solve_floor_plan(request) -> Dict[str, Any]:
 
     Args:
         request: object with attributes rooms (list of dicts), plot_width, plot_length
+            and optionally deadline_ms (time budget for the whole call)
 
     Returns:
         dict-like response similar to other solvers: {"rooms": [...], "score": x, "iterations": 0}
@@ -41,6 +44,7 @@ def solve_floor_plan(request) -> Dict[str, Any]:
     if cp_model is None:
         raise RuntimeError("OR-Tools is not installed. Install with: pip install ortools")
 
+    deadline = Deadline(getattr(request, "deadline_ms", None))
     rooms = request.rooms
     plot_w_cm = _to_cm(request.plot_width)
     plot_h_cm = _to_cm(request.plot_length)
@@ -101,7 +105,9 @@ def solve_floor_plan(request) -> Dict[str, Any]:
 
     # Solve
     solver = cp_model.CpSolver()
-    solver.parameters.max_time_in_seconds = 20.0
+    # Honour the request's time budget (minus model-building time), capped at 20s
+    remaining = deadline.remaining()
+    solver.parameters.max_time_in_seconds = 20.0 if remaining is None else min(20.0, max(0.01, remaining))
     solver.parameters.num_search_workers = 8
     solver.parameters.maximize = False
 
@@ -0,0 +1,107 @@
+"""
+Warm-start (incremental) re-solves shared by the constraint and graph solvers.
+
+When a user edits a layout (drags a room, adds or removes one), solving from
+scratch redraws every room size and reshuffles the whole plan. Instead the
+request carries the prior layout (top-left position and size per room id, as
+the solvers return it), the rooms the user locked and the rooms that changed,
+and only the neighbourhood of the change is re-optimized:
+- changed rooms: listed in changed_room_ids, new (absent from the prior
+  layout) or removed (in the prior layout only, their old footprint counts)
+- every room whose footprint lies within impact_radius of a changed one
+Locked rooms and all rooms outside the radius keep their prior geometry and
+only act on the free ones. Without any change every unlocked room is free,
+starting from its prior position (a plain warm start).
+
+Each solver places new rooms its own way, then asks WarmStart.frozen_rooms
+which rooms to hold.
+"""
+from typing import List, Dict, Any, Optional, Set, Tuple
+from dataclasses import dataclass
+import numpy as np
+
+DEFAULT_IMPACT_RADIUS = 4.0  # Rooms within this gap (m) of a changed room are re-optimized
+
+
+@dataclass
+class WarmStart:
+    """Prior geometry of an edited layout and what changed"""
+    positions: Dict[str, Tuple[float, float]]  # Prior top-left corner per room id
+    sizes: Dict[str, Tuple[float, float]]  # Prior (width, height) per room id
+    locked: Set[str]  # Rooms that must keep their prior geometry
+    changed: Set[str]  # Rooms the user edited
+    impact_radius: float = DEFAULT_IMPACT_RADIUS
+
+    @classmethod
+    def from_request(cls,
+                     rooms: List[Dict[str, Any]],
+                     prior_layout: Optional[List[Dict[str, Any]]],
+                     locked_room_ids: Optional[List[str]] = None,
+                     changed_room_ids: Optional[List[str]] = None,
+                     impact_radius: float = DEFAULT_IMPACT_RADIUS) -> Optional["WarmStart"]:
+        """Parse the warm-start fields of a solver request; None without a prior layout"""
+        if not prior_layout:
+            if locked_room_ids:
+                raise ValueError("locked_room_ids requires a prior_layout")
+            return None
+        if impact_radius < 0:
+            raise ValueError(f"impact_radius must be non-negative, got {impact_radius}")
+        positions, sizes = {}, {}
+        for entry in prior_layout:
+            try:
+                room_id = entry["id"]
+                positions[room_id] = (float(entry["x"]), float(entry["y"]))
+                sizes[room_id] = (float(entry["width"]), float(entry["height"]))
+            except (KeyError, TypeError, ValueError):
+                raise ValueError(f"prior_layout entries need id, x, y, width and height, got {entry!r}")
+        ids = {room["id"] for room in rooms}
+        locked = set(locked_room_ids or ())
+        missing = sorted(locked - (ids & set(positions)))
+        if missing:
+            raise ValueError(f"Locked rooms must be requested and present in prior_layout: {missing}")
+        return cls(positions, sizes, locked, set(changed_room_ids or ()) & ids, impact_radius)
+
+    def frozen_rooms(self, ids: List[str], x: np.ndarray, y: np.ndarray,
+                     width: np.ndarray, height: np.ndarray) -> Set[str]:
+        """Rooms to hold, given every requested room's starting box (top-left x, y and size):
+        the prior one for known rooms, the solver's initial placement for new ones"""
+        requested = set(ids)
+        new = [room_id not in self.positions for room_id in ids]
+        removed = [room_id for room_id in self.positions if room_id not in requested]
+        seeds = np.array([room_id in self.changed or is_new for room_id, is_new in zip(ids, new)], dtype=bool)
+        if not seeds.any() and not removed:
+            return set(self.locked)
+
+        lo = np.stack([x, y], axis=1).astype(np.float64).reshape(len(ids), 2)
+        hi = lo + np.stack([width, height], axis=1).reshape(len(ids), 2)
+        removed_lo = np.array([self.positions[r] for r in removed], dtype=np.float64).reshape(-1, 2)
+        removed_hi = removed_lo + np.array([self.sizes[r] for r in removed], dtype=np.float64).reshape(-1, 2)
+        near = within_radius(lo, hi, np.concatenate([lo[seeds], removed_lo]), np.concatenate([hi[seeds], removed_hi]),
+                             self.impact_radius)
+        return {room_id for room_id, free, is_new in zip(ids, near, new)
+                if room_id in self.locked or not (free or is_new)}
+
+
+def within_radius(lo: np.ndarray, hi: np.ndarray, seed_lo: np.ndarray, seed_hi: np.ndarray,
+                  radius: float) -> np.ndarray:
+    """Mask of boxes [lo, hi] (N, 2) within radius (gap distance) of any seed box.
+
+    Window query over the boxes sorted by their left edge: a box can only be
+    within reach of a seed if its left edge lies between the seed's left edge
+    minus radius and the widest box, and the seed's right edge plus radius.
+    O(N log N + candidates) instead of all N x seeds pairs.
+    """
+    near = np.zeros(len(lo), dtype=bool)
+    if not len(lo) or not len(seed_lo):
+        return near
+    order = np.argsort(lo[:, 0], kind="stable")
+    left = lo[order, 0]
+    widest = float((hi[:, 0] - lo[:, 0]).max())
+    start = np.searchsorted(left, seed_lo[:, 0] - radius - widest, side="left")
+    stop = np.searchsorted(left, seed_hi[:, 0] + radius, side="right")
+    count = stop - start
+    seed = np.repeat(np.arange(len(seed_lo)), count)
+    candidate = order[np.repeat(start, count) + np.arange(count.sum()) - np.repeat(np.cumsum(count) - count, count)]
+    gap = np.maximum(0.0, np.maximum(seed_lo[seed] - hi[candidate], lo[candidate] - seed_hi[seed]))
+    near[candidate[gap[:, 0] ** 2 + gap[:, 1] ** 2 <= radius ** 2]] = True
+    return near
@@ -0,0 +1,327 @@
+import numpy as np
+import pytest
+
+from backend.app.solvers.constraint_solver import (
+    DIRECTION_CODES,
+    AdjacencyIndex,
+    Direction,
+    EdgeIndex,
+    EnhancedConstraintSolver,
+    IncrementalMetrics,
+    LayoutState,
+    MOVE_PRIOR,
+    MOVE_TYPES,
+    MoveScheduler,
+    SolverRequest,
+    SpatialIndex,
+    circulation_penalty,
+    pairwise_overlap_gap,
+    solve_floor_plan,
+)
+
+
+ROOMS = [
+    {"id": "r1", "name": "Living", "type": "living"},
+    {"id": "r2", "name": "Kitchen", "type": "kitchen"},
+    {"id": "r3", "name": "Master", "type": "master_bedroom"},
+    {"id": "r4", "name": "Bedroom", "type": "bedroom"},
+    {"id": "r5", "name": "Bath", "type": "bathroom"},
+    {"id": "r6", "name": "Dining", "type": "dining"},
+    {"id": "r7", "name": "Pooja", "type": "pooja_room"},
+]
+
+
+def test_incremental_metrics_match_full_recompute():
+    solver = EnhancedConstraintSolver(plot_width=20.0, plot_length=18.0, seed=3)
+    state = LayoutState.from_rooms([
+        {"x": 1.0 + 2.5 * i, "y": 0.5 + 1.7 * i, "width": 4.0, "height": 3.5, **r}
+        for i, r in enumerate(ROOMS)
+    ])
+    before = solver._calculate_metrics(state).to_dict()
+    scorer = IncrementalMetrics(solver, state)
+
+    state.save(2)
+    state.save(4)
+    state.x[2] += 3.0
+    state.width[4], state.height[4] = 2.0, 5.0
+    updated = scorer.update(state, [2, 4])
+    assert updated.to_dict() == solver._calculate_metrics(state).to_dict()
+
+    # Rejecting the move restores both the layout and the cached terms
+    state.undo()
+    scorer.revert()
+    assert state.x[2] == 6.0 and state.width[4] == 4.0
+    assert scorer.current.to_dict() == before
+
+
+def test_solver_runs_with_consistency_check():
+    solver = EnhancedConstraintSolver(
+        plot_width=20.0, plot_length=18.0, optimization_level=1, seed=5, verify_incremental=True
+    )
+    res = solver.solve(SolverRequest(rooms=ROOMS, plot_width=20.0, plot_length=18.0, optimization_level=1))
+
+    assert len(res.rooms) == len(ROOMS)
+    assert 0 <= res.score <= 100
+
+
+def test_pairwise_kernel_matches_scalar_checks():
+    rng = np.random.default_rng(11)
+    n = 25
+    x, y = rng.uniform(0, 15, n), rng.uniform(0, 15, n)
+    w, h = rng.uniform(2, 6, n), rng.uniform(2, 6, n)
+    overlap, gap = pairwise_overlap_gap(x, y, w, h)
+
+    for i in range(n):
+        for j in range(n):
+            if i == j:
+                assert overlap[i, j] == 0 and gap[i, j] == 0
+                continue
+            expected = 0.0
+            if x[i] < x[j] + w[j] and x[i] + w[i] > x[j] and y[i] < y[j] + h[j] and y[i] + h[i] > y[j]:
+                x_overlap = min(x[i] + w[i], x[j] + w[j]) - max(x[i], x[j])
+                y_overlap = min(y[i] + h[i], y[j] + h[j]) - max(y[i], y[j])
+                expected = max(0, x_overlap) * max(0, y_overlap)
+            x_gap = max(0, min(abs(x[i] + w[i] - x[j]), abs(x[j] + w[j] - x[i])))
+            y_gap = max(0, min(abs(y[i] + h[i] - y[j]), abs(y[j] + h[j] - y[i])))
+            assert overlap[i, j] == expected
+            assert gap[i, j] == min(x_gap, y_gap)
+
+
+
+def test_circulation_penalty_counts_aligned_edges_across_the_plot():
+    # A, B side by side 0.2 m apart, C 0.3 m above A (and diagonally 0.2 m from B), D far
+    # above B but with its left edge 0.3 m from A's and C's right edges
+    x, y = np.array([0.0, 4.2, 0.0, 4.3]), np.array([0.0, 0.0, 3.3, 20.0])
+    w, h = np.array([4.0, 3.0, 4.0, 2.0]), np.array([3.0, 3.0, 2.0, 2.0])
+    _, gap = pairwise_overlap_gap(x, y, w, h)
+    penalty = circulation_penalty(gap)
+
+    # (0.5 - gap) * 20 per pair whose facing edges are within 0.5 m, however far apart the rooms are
+    expected = np.zeros((4, 4))
+    expected[0, 1] = expected[1, 2] = 6.0
+    expected[0, 2] = expected[0, 3] = expected[2, 3] = 4.0
+    assert np.allclose(penalty, expected + expected.T)
+
+    # The incremental scorer finds D's aligned-edge pairs wherever D moves along B's column
+    solver = EnhancedConstraintSolver(plot_width=20.0, plot_length=24.0, seed=3)
+    state = LayoutState.from_rooms([
+        {"x": x[i], "y": y[i], "width": w[i], "height": h[i], **r} for i, r in enumerate(ROOMS[:4])
+    ])
+    assert solver._calculate_metrics(state).circulation_score == pytest.approx(100 - 24.0)
+    scorer = IncrementalMetrics(solver, state)
+    for new_x, new_y in [(4.3, 12.0), (5.0, 12.0), (4.3, 20.0)]:
+        state.save(3)
+        state.x[3], state.y[3] = new_x, new_y
+        assert scorer.update(state, [3]).to_dict() == solver._calculate_metrics(state).to_dict()
+        scorer.commit()
+    assert scorer.current.circulation_score == pytest.approx(100 - 24.0)
+
+def test_multi_chain_is_reproducible_across_pool_and_sequential():
+    request = SolverRequest(rooms=ROOMS, plot_width=20.0, plot_length=18.0, optimization_level=1, seed=9, chains=3)
+
+    def run(max_workers):
+        solver = EnhancedConstraintSolver(
+            plot_width=20.0, plot_length=18.0, optimization_level=1, seed=9, chains=3, max_workers=max_workers
+        )
+        return solver.solve(request)
+
+    pooled, sequential = run(None), run(1)
+
+    assert len(pooled.chain_histories) == 3
+    assert pooled.convergence_history in pooled.chain_histories
+    assert [r.model_dump() for r in pooled.rooms] == [r.model_dump() for r in sequential.rooms]
+    assert pooled.chain_histories == sequential.chain_histories
+
+
+def test_unseeded_chains_derive_from_the_solver_rng():
+    request = SolverRequest(rooms=ROOMS, plot_width=20.0, plot_length=18.0, optimization_level=1, chains=2)
+
+    def run(max_workers):
+        solver = EnhancedConstraintSolver(
+            plot_width=20.0, plot_length=18.0, optimization_level=1, chains=2, max_workers=max_workers,
+            rng=np.random.default_rng(5)
+        )
+        tasks = solver._chain_tasks(request.rooms)
+        assert [t.seed.entropy for t in tasks] == [5, 5] and tasks[0].seed.spawn_key != tasks[1].seed.spawn_key
+        return solver.solve(request)
+
+    pooled, sequential = run(None), run(1)
+    assert [r.model_dump() for r in pooled.rooms] == [r.model_dump() for r in sequential.rooms]
+    assert pooled.chain_histories == sequential.chain_histories
+
+
+def test_parallel_tempering_strategy():
+    request = SolverRequest(
+        rooms=ROOMS, plot_width=20.0, plot_length=18.0, optimization_level=1, seed=4, strategy="tempering"
+    )
+
+    def run():
+        return EnhancedConstraintSolver(
+            plot_width=20.0, plot_length=18.0, optimization_level=1, seed=4, strategy="tempering"
+        ).solve(request)
+
+    first, second = run(), run()
+
+    assert len(first.rooms) == len(ROOMS)
+    assert 0 <= first.metrics["swap_acceptance_rate"] <= 1
+    assert first.metrics["tempering_replicas"] == 4
+    # Level 1 budgets 50 move evaluations across the 4 replicas, not 50 lockstep steps
+    assert 0 < first.metrics["move_evaluations"] <= 48
+    assert first.metrics["move_evaluations"] % 4 == 0
+    assert first.score == second.score
+    assert first.convergence_history == second.convergence_history
+
+
+def test_spatial_index_move_and_remove():
+    index = SpatialIndex(cell_size=5.0)
+    index.insert_bounds(0, 1.0, 1.0, 3.0, 3.0)
+    index.insert_bounds(1, 12.0, 12.0, 3.0, 3.0)
+
+    assert index.query_bounds(2.0, 2.0, 1.0, 1.0) == {0}
+    index.move(0, (1.0, 1.0, 3.0, 3.0), (11.0, 11.0, 3.0, 3.0))
+    assert index.query_bounds(2.0, 2.0, 1.0, 1.0) == set()
+    assert index.query_bounds(12.5, 12.5, 1.0, 1.0) == {0, 1}
+
+    index.remove(1, (12.0, 12.0, 3.0, 3.0))
+    index.remove(0, (11.0, 11.0, 3.0, 3.0))
+    assert index.grid == {}
+
+
+def test_edge_index_finds_facing_edges():
+    edges = EdgeIndex(bucket_size=0.5)
+    edges.insert_bounds(0, 0.0, 0.0, 4.0, 3.0)
+    edges.insert_bounds(1, 4.3, 20.0, 2.0, 2.0)
+    edges.insert_bounds(2, 10.0, 10.0, 2.0, 2.0)
+
+    # Right edge at 4.0 faces room 1's left edge at 4.3, 17 m away along y
+    assert edges.query_bounds(0.0, 0.0, 4.0, 3.0) == {1}
+    edges.move(1, (4.3, 20.0, 2.0, 2.0), (5.3, 20.0, 2.0, 2.0))
+    assert edges.query_bounds(0.0, 0.0, 4.0, 3.0) == set()
+    assert edges.query_bounds(7.0, 12.4, 3.2, 1.0) == {1, 2}
+
+    for i, bounds in enumerate([(0.0, 0.0, 4.0, 3.0), (5.3, 20.0, 2.0, 2.0), (10.0, 10.0, 2.0, 2.0)]):
+        edges.remove(i, bounds)
+    assert edges.edges == ({}, {}, {}, {})
+
+
+def test_incremental_metrics_track_random_moves():
+    rng = np.random.default_rng(2)
+    rooms = [dict(r, id=f"{r['id']}-{k}") for k in range(4) for r in ROOMS]
+    solver = EnhancedConstraintSolver(plot_width=24.0, plot_length=24.0, seed=1)
+    state = LayoutState.from_rooms([
+        {"x": rng.uniform(0, 20), "y": rng.uniform(0, 20), "width": 3.5, "height": 3.0, **r} for r in rooms
+    ])
+    scorer = IncrementalMetrics(solver, state)
+
+    for step in range(200):
+        changed = rng.choice(len(state), size=2, replace=False).tolist()
+        for i in changed:
+            state.save(i)
+            state.x[i] = rng.uniform(0, 21)
+            state.y[i] = rng.uniform(0, 21)
+        updated = scorer.update(state, changed)
+        assert updated.to_dict() == solver._calculate_metrics(state).to_dict()
+        if step % 3:
+            state.commit()
+            scorer.commit()
+        else:
+            state.undo()
+            scorer.revert()
+            assert scorer.current.to_dict() == solver._calculate_metrics(state).to_dict()
+
+    assert scorer.rebuild(state).to_dict() == scorer.current.to_dict()
+
+
+def test_adjacency_index_scores_every_room_of_a_type():
+    types = ["bedroom", "bedroom", "bathroom", "bathroom"]
+    x = np.array([0.0, 20.0, 3.0, 40.0])
+    y = np.zeros(4)
+    size = np.ones(4)
+
+    index = AdjacencyIndex.compile(types)
+    # bedroom/bathroom: both bedrooms are scored against both bathrooms
+    assert len(index.group_starts) == 2 and len(index.first) == 4
+
+    # Bedroom 0 is within 4m of a bathroom (full 15), bedroom 1 is 17m from
+    # its nearest one (15 * 4 / 17); the preference averages the two
+    expected = (15.0 + 15.0 * 4.0 / 17.0) / 2
+    assert abs(index.score(x, y, size, size) - expected) < 1e-12
+
+    # A lone pair scores exactly as a single ideal/distance falloff
+    single = AdjacencyIndex.compile(["kitchen", "dining"])
+    assert single.score(np.array([0.0, 10.0]), np.zeros(2), size[:2], size[:2]) == 30.0 * 0.5
+
+
+def test_concurrent_solves_are_reproducible():
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run(seed):
+        request = SolverRequest(rooms=ROOMS, plot_width=20.0, plot_length=18.0, optimization_level=1, seed=seed)
+        return solve_floor_plan(request)
+
+    sequential = [run(seed) for seed in (1, 2, 1, 2)]
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        threaded = list(pool.map(run, (1, 2, 1, 2)))
+
+    for a, b in zip(sequential, threaded):
+        assert [r.model_dump() for r in a.rooms] == [r.model_dump() for r in b.rooms]
+        assert a.convergence_history == b.convergence_history
+    assert sequential[0].convergence_history == sequential[2].convergence_history
+
+
+def test_direction_region_table_is_shared_per_plot():
+    a = EnhancedConstraintSolver(plot_width=30.0, plot_length=24.0)
+    b = EnhancedConstraintSolver(plot_width=30.0, plot_length=24.0)
+    assert a.region_table is b.region_table
+    assert a.region_table.shape == (9, 4)
+
+    assert a._get_direction_region(Direction.SOUTHWEST) == (20.0, 16.0, 10.0, 8.0)
+    assert tuple(a.region_table[DIRECTION_CODES[Direction.NORTH]]) == (10.0, 0.0, 10.0, 8.0)
+    assert a._get_room_direction(21.0, 17.0, 4.0, 3.0) == Direction.SOUTHWEST
+
+
+def test_move_scheduler_reweights_operators_online():
+    scheduler = MoveScheduler(np.random.default_rng(0), window=20)
+    assert np.allclose(scheduler.probabilities(), 0.05 + 0.8 * np.array(MOVE_PRIOR))
+
+    # Swaps keep failing while resizes keep improving the score
+    for _ in range(20):
+        scheduler.record(MOVE_TYPES.index("swap"), -1.0, False)
+        scheduler.record(MOVE_TYPES.index("resize"), 0.5, True)
+    p = scheduler.probabilities()
+    assert abs(p.sum() - 1.0) < 1e-12 and p.min() >= 0.05
+    assert p.argmax() == MOVE_TYPES.index("resize")
+    assert p[MOVE_TYPES.index("swap")] < MOVE_PRIOR[MOVE_TYPES.index("swap")]
+
+    stats = scheduler.stats()
+    assert stats["move_swap_acceptance"] == 0.0 and stats["move_resize_mean_gain"] == 0.5
+
+    res = EnhancedConstraintSolver(plot_width=20.0, plot_length=18.0, optimization_level=1, seed=2).solve(
+        SolverRequest(rooms=ROOMS, plot_width=20.0, plot_length=18.0, optimization_level=1)
+    )
+    assert {f"move_{name}_probability" for name in MOVE_TYPES} <= set(res.metrics)
+
+
+def test_batched_candidates_score_like_incremental_updates():
+    rooms = [dict(r, id=f"{r['id']}-{k}") for k in range(2) for r in ROOMS]
+    l_shape = [[0, 0], [24, 0], [24, 10], [12, 10], [12, 24], [0, 24]]
+    for polygon in (None, l_shape):
+        solver = EnhancedConstraintSolver(plot_width=24.0, plot_length=24.0, plot_polygon=polygon, seed=4, batch_size=12)
+        state = solver._initial_state(rooms)
+        scorer = IncrementalMetrics(solver, state)
+
+        for move_type in ("translate", "resize", "rotate"):
+            candidates = solver._propose_batch(state, move_type, 1.5)
+            totals = scorer.score_moves(state, *candidates)
+            for k, (i, x, y, w, h) in enumerate(zip(*candidates)):
+                state.save(int(i))
+                state.x[i], state.y[i], state.width[i], state.height[i] = x, y, w, h
+                assert abs(scorer.update(state, [int(i)]).total_score - totals[k]) < 1e-9
+                state.undo()
+                scorer.revert()
+
+    request = SolverRequest(rooms=ROOMS, plot_width=20.0, plot_length=18.0, optimization_level=1, batch_size=8)
+    res = EnhancedConstraintSolver(
+        plot_width=20.0, plot_length=18.0, optimization_level=1, seed=2, batch_size=8, verify_incremental=True
+    ).solve(request)
+    assert len(res.rooms) == len(ROOMS)
@@ -0,0 +1,52 @@
+from backend.app.solvers import constraint_solver, graph_solver
+from backend.app.utils.deadline import Deadline
+
+
+ROOMS = [
+    {"id": f"r{i}", "name": f"Room {i}", "type": t}
+    for i, t in enumerate(["living", "kitchen", "master_bedroom", "bedroom", "bathroom", "dining"] * 4)
+]
+
+
+def test_deadline_helper():
+    assert not Deadline(None).expired() and Deadline(None).remaining() is None
+    assert Deadline(0).expired() and Deadline(0).remaining() == 0.0
+    assert 0 < Deadline(60_000).remaining() <= 60.0
+
+
+def test_constraint_solver_returns_best_so_far_at_deadline():
+    request = constraint_solver.SolverRequest(
+        rooms=ROOMS, plot_width=30.0, plot_length=30.0, optimization_level=3, seed=1, deadline_ms=1
+    )
+    res = constraint_solver.solve_floor_plan(request)
+
+    assert res.stopped_reason == "deadline"
+    assert len(res.rooms) == len(ROOMS)
+    # Level 3 budgets 500 iterations; the response reports how many actually ran
+    assert res.iterations < 500
+
+    unbounded = constraint_solver.solve_floor_plan(request.model_copy(update={"deadline_ms": None}))
+    assert unbounded.stopped_reason in ("max_iterations", "converged")
+    assert 0 < unbounded.iterations <= 500
+    if unbounded.stopped_reason == "max_iterations":
+        assert unbounded.iterations == 500
+
+
+def test_constraint_solver_counts_iterations_of_tempering_and_chains():
+    for extra in ({"strategy": "tempering"}, {"chains": 2}):
+        request = constraint_solver.SolverRequest(
+            rooms=ROOMS, plot_width=30.0, plot_length=30.0, optimization_level=3, seed=1, deadline_ms=1, **extra
+        )
+        res = constraint_solver.solve_floor_plan(request)
+
+        assert res.stopped_reason == "deadline"
+        assert res.iterations < 500
+
+
+def test_graph_solver_returns_best_so_far_at_deadline():
+    request = graph_solver.SolverRequest(rooms=ROOMS, plot_width=30.0, plot_length=30.0, seed=1, deadline_ms=1)
+    res = graph_solver.solve_floor_plan(request)
+
+    assert res.stopped_reason == "deadline"
+    assert not res.converged
+    assert len(res.rooms) == len(ROOMS)
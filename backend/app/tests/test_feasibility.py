@@ -0,0 +1,89 @@
+from backend.app.solvers import constraint_solver, graph_solver
+from backend.app.solvers.feasibility import MAX_FILL, RoomFootprint, analyze
+
+
+def _room(room_id, preferred, minimum, zone=None):
+    return RoomFootprint(room_id, "room", preferred, minimum, zone)
+
+
+def test_area_and_footprint_lower_bounds():
+    rooms = [_room("a", (5.0, 5.0), (4.0, 4.0)), _room("b", (5.0, 5.0), (4.0, 4.0))]
+
+    # 32 m² at minimum size cannot fit in 30 m²
+    report = analyze(rooms, 6.0, 5.0)
+    assert not report.feasible and not report.fits_preferred and report.shrink == []
+
+    # Fits only when rooms shrink; the one with more slack goes first
+    rooms.append(_room("c", (6.0, 5.0), (3.0, 3.0)))
+    report = analyze(rooms, 10.0, 7.5)
+    assert report.feasible and not report.fits_preferred
+    assert report.shrink[0] == "c" and report.min_area == 41.0
+
+    # A room longer than the plot in both orientations is infeasible regardless of area
+    report = analyze([_room("long", (12.0, 2.0), (11.0, 2.0))], 10.0, 10.0)
+    assert not report.feasible and "long" in report.issues[0]
+
+
+def test_fill_limit_is_the_same_for_fits_and_shrink():
+    rooms = [_room("a", (5.0, 4.0), (3.0, 3.0)), _room("b", (4.0, 4.0), (3.0, 3.0))]
+
+    # 36 m² of 42 m²: fits as requested, only the packing heuristic would shrink
+    report = analyze(rooms, 7.0, 6.0)
+    assert report.fits_preferred and report.shrink == [] and "86%" in report.warnings[0]
+    packed = analyze(rooms, 7.0, 6.0, max_fill=MAX_FILL)
+    assert not packed.fits_preferred and packed.shrink == ["a"]
+
+
+def test_inscribed_circle_and_polygon_bounds():
+    circle = {"center": [5.0, 5.0], "radius": 5.0}
+    assert analyze([_room("a", (7.0, 7.0), (7.0, 7.0))], 10.0, 10.0, circle=circle).feasible
+    assert not analyze([_room("a", (7.5, 7.5), (7.5, 7.5))], 10.0, 10.0, circle=circle).feasible
+
+    l_shape = [[0, 0], [20, 0], [20, 6], [6, 6], [6, 20], [0, 20]]
+    report = analyze([_room("a", (5.0, 5.0), (4.0, 4.0), zone="northeast")], 20.0, 20.0, polygon=l_shape)
+    assert report.feasible and 2.5 <= report.inscribed_radius <= 3.0 and report.mandatory_zones == 1
+    # Only the minimum size is known to fit inside the arms
+    assert report.shrink == ["a"] and not report.warnings
+
+
+ROOMS = [{"id": f"r{i}", "name": f"Room {i}", "type": t}
+         for i, t in enumerate(["living", "kitchen", "master_bedroom", "bedroom", "dining"] * 2)]
+
+
+def test_solvers_return_immediately_when_infeasible():
+    res = constraint_solver.solve_floor_plan(
+        constraint_solver.SolverRequest(rooms=ROOMS, plot_width=8.0, plot_length=8.0, seed=1)
+    )
+    assert res.stopped_reason == "infeasible" and res.rooms == [] and res.iterations == 0
+    assert res.feasibility["min_area"] > res.feasibility["plot_area"]
+
+    res = graph_solver.solve_floor_plan(graph_solver.SolverRequest(rooms=ROOMS, plot_width=8.0, plot_length=8.0, seed=1))
+    assert res.stopped_reason == "infeasible" and res.rooms == [] and not res.feasibility["feasible"]
+
+
+def test_shrink_policy_starts_rooms_at_minimum_size():
+    request = constraint_solver.SolverRequest(
+        rooms=ROOMS, plot_width=13.0, plot_length=13.0, optimization_level=1, seed=1
+    )
+    res = constraint_solver.solve_floor_plan(request)
+    assert res.stopped_reason != "infeasible" and len(res.rooms) == len(ROOMS)
+    assert res.feasibility["shrink"] and res.warnings[0].startswith("Shrunk")
+
+    report_only = constraint_solver.solve_floor_plan(request.model_copy(update={"feasibility": "report"}))
+    assert report_only.stopped_reason == "infeasible"
+
+    ignored = constraint_solver.solve_floor_plan(request.model_copy(update={"feasibility": "ignore"}))
+    assert ignored.feasibility is None and len(ignored.rooms) == len(ROOMS)
+
+
+def test_nearly_full_plot_keeps_preferred_sizes_unless_packing():
+    for module in (constraint_solver, graph_solver):
+        request = module.SolverRequest(rooms=ROOMS[:5], plot_width=10.5, plot_length=10.0, seed=1, feasibility="report")
+        report_only = module.solve_floor_plan(request)
+        assert report_only.stopped_reason != "infeasible" and report_only.feasibility["fits_preferred"]
+
+        shrunk = module.solve_floor_plan(request.model_copy(update={"feasibility": "shrink"}))
+        assert shrunk.feasibility["shrink"] == [] and not shrunk.warnings[0].startswith("Shrunk")
+
+        packed = module.solve_floor_plan(request.model_copy(update={"feasibility": "pack"}))
+        assert packed.feasibility["shrink"] and packed.warnings[0].startswith("Shrunk")
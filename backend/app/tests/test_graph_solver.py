@@ -0,0 +1,232 @@
+import numpy as np
+import pytest
+
+from backend.app.solvers.graph_solver import (
+    CORNER_SIGNS, Direction, GraphBasedLayoutSolver, SolverRequest, _sweep_and_prune, solve_floor_plan
+)
+from backend.app.utils import geometry_utils as gu
+
+
+ROOMS = [
+    {"id": "r1", "name": "Living", "type": "living"},
+    {"id": "r2", "name": "Kitchen", "type": "kitchen"},
+    {"id": "r3", "name": "Dining", "type": "dining"},
+    {"id": "r4", "name": "Master", "type": "master_bedroom"},
+    {"id": "r5", "name": "Bath", "type": "bathroom"},
+    {"id": "r6", "name": "Pooja", "type": "pooja_room"},
+    {"id": "o1", "name": "Garden", "type": "garden"},
+]
+
+
+def test_vectorized_forces_match_pairwise_reference():
+    solver = GraphBasedLayoutSolver(plot_width=12.0, plot_length=10.0, seed=3)
+    G = solver._build_adjacency_graph(ROOMS)
+    solver._initialize_positions(ROOMS)
+    solver._pack_state(G)
+    forces = solver._calculate_all_forces()[0]
+
+    p = solver.params
+    pos = solver.pos[0]
+    expected = np.zeros_like(pos)
+    for i, a in enumerate(solver.room_ids):
+        for j, b in enumerate(solver.room_ids):
+            if i == j:
+                continue
+            delta = pos[j] - pos[i]
+            d = np.linalg.norm(delta)
+            (w1, h1), (w2, h2) = solver.dimensions[a], solver.dimensions[b]
+            if G.has_edge(a, b):
+                ideal = (max(w1, w2) + max(h1, h2)) / 2 + p.ideal_spacing
+                expected[i] += p.attraction_strength * G.edges[a, b]["weight"] * (d - ideal) * delta / d
+            elif not (G.nodes[b]["is_outdoor"] and not G.nodes[a]["is_outdoor"]):
+                expected[i] -= p.repulsion_strength * 5.0 / d * delta / d
+        if solver.vastu_pull[i]:
+            delta = solver.vastu_target[i] - pos[i]
+            d = np.linalg.norm(delta)
+            if d >= 0.5:
+                expected[i] += p.vastu_force_strength * solver.vastu_weight[i] * delta / d
+        (w, h), (x, y) = solver.dimensions[a], pos[i]
+        expected[i, 0] += p.boundary_force_strength * (max(0, w / 2 - x) - max(0, x + w / 2 - 12.0))
+        expected[i, 1] += p.boundary_force_strength * (max(0, h / 2 - y) - max(0, y + h / 2 - 10.0))
+
+    assert np.allclose(forces, expected, rtol=1e-12, atol=1e-12)
+    # The garden is pushed off the house, the house is not pushed by the garden
+    assert solver.repels[solver.index["o1"], solver.index["r1"]]
+    assert not solver.repels[solver.index["r1"], solver.index["o1"]]
+
+
+def test_irregular_plot_keeps_rooms_inside_polygon():
+    l_shape = [[0, 0], [24, 0], [24, 10], [12, 10], [12, 24], [0, 24]]
+    res = solve_floor_plan(SolverRequest(
+        rooms=ROOMS[:6], plot_width=24.0, plot_length=24.0, plot_shape="irregular",
+        constraints={"plot_polygon": l_shape}, seed=1
+    ))
+
+    assert len(res.rooms) == 6
+    for r in res.rooms:
+        assert gu.point_in_polygon((r.x + r.width / 2, r.y + r.height / 2), l_shape)
+
+
+def test_circular_plot_keeps_room_corners_inside_circle():
+    for seed in range(3):
+        res = solve_floor_plan(SolverRequest(rooms=ROOMS, plot_width=20.0, plot_length=20.0,
+                                             plot_shape="circular", seed=seed))
+        assert len(res.rooms) == 7
+        for r in res.rooms:
+            for x in (r.x, r.x + r.width):
+                for y in (r.y, r.y + r.height):
+                    assert np.hypot(x - 10.0, y - 10.0) <= 10.0 + 0.01
+
+
+def test_grid_repulsion_approximates_exact_kernel():
+    types = [r["type"] for r in ROOMS]
+    rooms = [{"id": f"r{i}", "name": f"R{i}", "type": types[i % len(types)]} for i in range(200)]
+    solver = GraphBasedLayoutSolver(plot_width=110.0, plot_length=110.0, seed=5)
+    G = solver._build_adjacency_graph(rooms)
+    solver._initialize_positions(rooms)
+    for room_id in solver.positions:
+        solver.positions[room_id] = solver.rng.uniform(0, 110, 2)
+    solver._pack_state(G)
+    assert solver.use_grid  # Above grid_threshold rooms
+
+    delta = solver.pos[:, None, :, :] - solver.pos[:, :, None, :]
+    distance = np.sqrt(delta[..., 0] ** 2 + delta[..., 1] ** 2)
+    exact = solver._calculate_repulsive_forces(delta, distance)
+    grid = solver._calculate_grid_repulsive_forces()
+    err = np.linalg.norm(grid - exact, axis=-1) / np.linalg.norm(exact, axis=-1)
+    assert np.median(err) < 0.01 and err.max() < 0.1
+
+    springs = solver._calculate_attractive_forces(delta, distance)
+    assert np.allclose(solver._calculate_edge_attractive_forces(), springs, atol=1e-9)
+
+
+def test_fixed_rooms_act_as_static_repulsors():
+    types = [r["type"] for r in ROOMS]
+    rooms = [{"id": f"r{i}", "name": f"R{i}", "type": types[i % len(types)]} for i in range(200)]
+    solver = GraphBasedLayoutSolver(plot_width=110.0, plot_length=110.0, seed=5)
+    solver.params.repulsion = "exact"
+    G = solver._build_adjacency_graph(rooms)
+    solver._initialize_positions(rooms)
+    for room_id in solver.positions:
+        solver.positions[room_id] = solver.rng.uniform(0, 110, 2)
+    solver._pack_state(G)
+    everything = solver._calculate_all_forces()
+
+    # Only the movable rooms are simulated, and they feel the same forces
+    solver.fixed_nodes = {r["id"] for r in rooms[:180]}
+    solver._pack_state(G)
+    assert solver.pos.shape == (1, 20, 2) and solver.room_ids == [r["id"] for r in rooms[180:]]
+    assert np.allclose(solver._calculate_all_forces(), everything[:, 180:], rtol=1e-9, atol=1e-9)
+
+    # In grid mode the fixed ones are bucketed once per sample
+    exact = solver._calculate_static_forces()
+    solver.params.repulsion = "grid"
+    solver._pack_state(G)
+    assert solver.use_static_grid and len(solver.static_grids) == 1
+    err = np.linalg.norm(solver._calculate_static_forces() - exact, axis=-1) / np.linalg.norm(exact, axis=-1)
+    assert np.median(err) < 0.01 and err.max() < 0.1
+
+
+def test_vastu_targets_are_resolved_at_initialization():
+    solver = GraphBasedLayoutSolver(plot_width=20.0, plot_length=16.0, seed=1)
+    solver.constraints = {"house_facing": "west"}
+    rooms = ROOMS + [
+        {"id": "e1", "name": "Door", "type": "entrance"},
+        {"id": "s1", "name": "Store", "type": "store"},
+    ]
+    solver._initialize_positions(rooms)
+
+    assert solver.vastu_weights == {"r1": 0.6, "r2": 0.9, "r3": 0.5, "r4": 0.8, "r5": 0.7, "r6": 1.0,
+                                    "o1": 0.4, "e1": 0.9, "s1": 0.0}
+    assert solver.outdoor_flags["o1"] and not solver.outdoor_flags["r1"]
+    assert solver.vastu_targets["r6"].tolist() == [5.0, 4.0]  # Pooja: northeast
+    assert solver.vastu_targets["e1"].tolist() == [15.0, 8.0]  # Entrance follows house_facing
+
+
+def test_adaptive_integrators_converge_in_fewer_steps():
+    def run(integrator):
+        request = SolverRequest(rooms=ROOMS[:6], plot_width=20.0, plot_length=18.0, seed=1, integrator=integrator)
+        return solve_floor_plan(request)
+
+    euler, fire, verlet = run("euler"), run("fire"), run("verlet")
+    assert not euler.converged and euler.iterations == 100
+    assert fire.converged and fire.iterations < euler.iterations
+    assert fire.stopped_reason == "converged"
+    assert len(verlet.rooms) == 6 and verlet.iterations <= euler.iterations
+
+    with pytest.raises(ValueError):
+        SolverRequest(rooms=ROOMS, integrator="rk4")
+
+
+def test_batch_returns_the_best_of_independent_seeds():
+    def request(**kwargs):
+        return SolverRequest(rooms=ROOMS, plot_width=18.0, plot_length=14.0, **kwargs)
+
+    batch = solve_floor_plan(request(seed=2, batch_size=3, top_k=3))
+    singles = {seed: solve_floor_plan(request(seed=seed)) for seed in (2, 3, 4)}
+
+    layouts = [(batch.seed, batch.score, batch.rooms)] + [(a.seed, a.score, a.rooms) for a in batch.alternatives]
+    assert len({r.score for r in singles.values()}) == 3
+    assert [seed for seed, _, _ in layouts] == sorted(singles, key=lambda seed: -singles[seed].score)
+    for seed, score, rooms in layouts:
+        # Each sample is exactly the layout a single solve with its seed produces
+        assert score == singles[seed].score and rooms == singles[seed].rooms
+    assert batch.iterations == singles[batch.seed].iterations
+
+    assert solve_floor_plan(request(seed=2, batch_size=3)).alternatives == []
+    with pytest.raises(ValueError):
+        request(batch_size=2, top_k=3)
+    with pytest.raises(ValueError):
+        request(batch_size=257)
+
+
+def test_direction_buckets_split_the_plot_into_ninths():
+    solver = GraphBasedLayoutSolver(plot_width=30.0, plot_length=20.0)
+    points = np.array([[2, 2], [15, 2], [28, 2], [2, 10], [15, 10], [28, 10], [2, 18], [15, 18], [28, 18]], dtype=float)
+    expected = [Direction.NORTHEAST, Direction.NORTH, Direction.NORTHWEST, Direction.EAST, Direction.CENTER,
+                Direction.WEST, Direction.SOUTHEAST, Direction.SOUTH, Direction.SOUTHWEST]
+    assert [solver._infer_direction_from_pos(p) for p in points] == expected
+    assert solver._direction_buckets(points).tolist() == list(range(9))
+
+
+def test_vectorized_score_measures_corners_outside_polygon():
+    l_shape = [[0, 0], [24, 0], [24, 10], [12, 10], [12, 24], [0, 24]]
+    edges = [(np.array(a, dtype=float), np.array(b, dtype=float)) for a, b in zip(l_shape, l_shape[1:] + l_shape[:1])]
+    solver = GraphBasedLayoutSolver(plot_width=24.0, plot_length=24.0, seed=4)
+    solver.batch_size = 4
+    solver.samples = solver._make_samples()
+    solver._initialize_samples(ROOMS)
+    G = solver._build_adjacency_graph(ROOMS)
+    rng = np.random.default_rng(0)
+    for sample in solver.samples:
+        for room_id in sample.positions:
+            sample.positions[room_id] = rng.uniform(2, 22, 2)
+            sample.dimensions[room_id] = tuple(rng.uniform(0.5, 2.0, 2))
+    rectangle = solver._calculate_score(G)
+    solver.plot_shape, solver.plot_polygon = "irregular", l_shape
+    solver.boundary = solver._build_boundary()
+    irregular = solver._calculate_score(G)
+
+    for b, sample in enumerate(solver.samples):
+        penalty = 0.0
+        for room_id, pos in sample.positions.items():
+            for corner in pos + CORNER_SIGNS * np.array(sample.dimensions[room_id]) / 2:
+                if not gu.point_in_polygon(tuple(corner), l_shape):
+                    penalty += min(10, 2 * min(solver._project_point_to_edge(corner, *edge)[1] for edge in edges))
+        assert 0 < irregular[b] <= rectangle[b] < 100
+        assert irregular[b] == pytest.approx(rectangle[b] - penalty, abs=1e-9)
+    assert (irregular < rectangle).sum() >= 2
+
+
+def test_sweep_and_prune_finds_every_overlapping_pair():
+    rng = np.random.default_rng(0)
+    center = rng.uniform(0, 30, (200, 2))
+    half = rng.uniform(0.5, 3.0, (200, 2))
+    # Boxes sharing a left edge and boxes that only touch do not break the sweep
+    center[1], half[1] = center[0] + (0.0, 1.0), half[0]
+    center[2], half[2] = center[0] + (2 * half[0, 0], 0.0), half[0]
+    lo, hi = center - half, center + half
+
+    i, j = _sweep_and_prune(lo, hi)
+    brute = np.triu((lo[:, None] < hi[None, :]).all(axis=2) & (hi[:, None] > lo[None, :]).all(axis=2), k=1)
+    assert list(zip(i, j)) == list(zip(*np.nonzero(brute)))
@@ -0,0 +1,54 @@
+import numpy as np
+from shapely.geometry import Polygon, box
+
+from backend.app.solvers.impl.graph_solver_impl import GraphSolver, box_polygon_overlap, polygon_edges
+
+
+L_SHAPE = Polygon([(0, 0), (12, 0), (12, 6), (6, 6), (6, 12), (0, 12)])
+
+
+def test_box_polygon_overlap_matches_shapely():
+    rng = np.random.default_rng(0)
+    # Clockwise exterior with a hole: the edge table orients the rings itself
+    plot = Polygon(L_SHAPE.exterior.coords[::-1], [[(1, 1), (1, 3), (3, 3), (3, 1)]])
+    lo = rng.uniform(-2, 12, (300, 2))
+    hi = lo + rng.uniform(0.1, 5, (300, 2))
+    lo[0], hi[0] = (0, 0), (6, 6)  # Flush with the boundary, around the hole
+
+    expected = [box(*a, *b).intersection(plot).area for a, b in zip(lo, hi)]
+    assert np.allclose(box_polygon_overlap(lo, hi, polygon_edges(plot)), expected, rtol=0, atol=1e-9)
+
+
+def test_array_state_matches_shapely_reference():
+    rooms = [box(0, 0, 4, 3), box(0, 0, 3, 3), box(0, 0, 2, 4), Polygon([(0, 0), (3, 0), (0, 3)]), box(0, 0, 2, 2)]
+    adjacency = {0: [1, 2], 1: [3], 2: [4], 3: [], 4: []}
+    solver = GraphSolver(rooms, L_SHAPE, adjacency, rng=np.random.default_rng(3))
+    center = solver.initial_center + np.random.default_rng(4).normal(0, 2, solver.initial_center.shape)
+    state = solver.export_state(center)
+    assert solver.shaped.tolist() == [False, False, False, True, False]
+
+    p = solver.params
+    forces = np.zeros_like(center)
+    energy = 0.0
+    for i, room in enumerate(state):
+        for j, other in enumerate(state):
+            delta = np.subtract(room.polygon.centroid.coords[0], other.polygon.centroid.coords[0])
+            dist = np.linalg.norm(delta)
+            if i == j or dist < 1e-6:
+                continue
+            if dist < p.repulsion_radius:
+                forces[i] += p.alpha_r * ((p.repulsion_radius / dist) ** p.repulsion_exponent - 1) * delta / dist
+            if j in adjacency[i]:
+                forces[i] -= p.alpha_a * delta
+            if j > i:
+                gap = room.polygon.distance(other.polygon)
+                energy += room.polygon.intersection(other.polygon).area * 1000
+                energy += gap * 10 if j in adjacency[i] else -np.log1p(gap)
+        if not L_SHAPE.contains(room.polygon):
+            to_center = np.subtract(L_SHAPE.centroid.coords[0], room.polygon.centroid.coords[0])
+            forces[i] += p.alpha_b * to_center / np.linalg.norm(to_center)
+            energy += room.polygon.difference(L_SHAPE).area * 1000
+
+    assert (solver.boundary_overflow(center) > 0).any()
+    assert np.allclose(solver.compute_forces(center), forces, rtol=1e-9, atol=1e-9)
+    assert np.isclose(solver.compute_energy(center), energy, rtol=1e-9)
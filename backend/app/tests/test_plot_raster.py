@@ -0,0 +1,126 @@
+import numpy as np
+
+from backend.app.solvers.constraint_solver import SolverRequest, solve_floor_plan
+from backend.app.utils import geometry_utils as gu
+from backend.app.utils.plot_raster import PlotRaster
+
+
+L_SHAPE = [[0, 0], [20, 0], [20, 8], [9, 8], [9, 18], [0, 18]]
+TRIANGLE = [[0, 0], [24, 0], [0, 16]]
+
+
+def _sample_points(polygon, n=2000, seed=0):
+    rng = np.random.default_rng(seed)
+    pts = np.asarray(polygon, dtype=float)
+    lo, hi = pts.min(axis=0) - 3, pts.max(axis=0) + 3
+    return rng.uniform(lo, hi, size=(n, 2))
+
+
+def test_raster_matches_exact_polygon_math():
+    for polygon in (L_SHAPE, TRIANGLE):
+        raster = PlotRaster(polygon, resolution=0.5)
+        for x, y in _sample_points(polygon):
+            assert raster.contains(x, y) == gu.point_in_polygon((x, y), polygon)
+            px, py = raster.project(x, y)
+            ex, ey = gu.project_point_inside((x, y), polygon)
+            assert abs(px - ex) < 1e-9 and abs(py - ey) < 1e-9
+
+
+def test_raster_signed_distance_and_exact_mode():
+    raster = PlotRaster(L_SHAPE, resolution=0.25)
+    assert raster.distance(4.0, 4.0) < 0
+    assert raster.distance(15.0, 15.0) > 0
+    # Sampled at the cell center: within half a cell diagonal of the true distance
+    assert abs(raster.distance(15.0, 12.0) - 4.0) <= raster.resolution
+
+    exact = PlotRaster(L_SHAPE, exact=True)
+    assert exact.inside is None
+    assert exact.contains(4.0, 4.0) and not exact.contains(15.0, 15.0)
+    assert exact.project(15.0, 15.0) == gu.project_point_inside((15.0, 15.0), L_SHAPE)
+
+
+
+def test_nearest_edges_match_a_full_sort():
+    # Many vertices: the per-cell edge ranking is folded edge by edge, never stacked
+    t = np.linspace(0, 2 * np.pi, 120, endpoint=False)
+    r = 10 + 3 * np.sin(5 * t)
+    raster = PlotRaster(np.column_stack([r * np.cos(t), r * np.sin(t)]).tolist(), resolution=1.0)
+
+    ys = raster.origin[1] + (np.arange(raster.shape[0]) + 0.5) * raster.resolution
+    xs = raster.origin[0] + (np.arange(raster.shape[1]) + 0.5) * raster.resolution
+    gx, gy = np.meshgrid(xs, ys)
+    distances = np.stack([raster._edge_distance(gx, gy, k) for k in range(120)])
+    order = np.argsort(distances, axis=0, kind="stable")[:PlotRaster.CANDIDATE_EDGES]
+    assert np.array_equal(np.moveaxis(order, 0, -1), raster.nearest_edges)
+    assert np.array_equal(np.abs(raster.signed_distance), distances.min(axis=0))
+
+
+def test_gradient_on_ridges_does_not_depend_on_edge_order():
+    raster = PlotRaster(L_SHAPE)
+    ys = raster.origin[1] + (np.arange(raster.shape[0]) + 0.5) * raster.resolution
+    xs = raster.origin[0] + (np.arange(raster.shape[1]) + 0.5) * raster.resolution
+    gx, gy = np.meshgrid(xs, ys)
+    distances = np.stack([raster._edge_distance(gx, gy, k) for k in range(len(L_SHAPE))])
+    ranked = np.sort(distances, axis=0)
+    ridge = ranked[1] - ranked[0] <= 1e-9
+
+    # Off the ridges: the nearest edge's normal, as a full per-edge stack gives it
+    nearest = raster._boundary_normal(gx, gy, raster.inside, distances.argmin(axis=0))[1]
+    assert np.allclose(raster.gradient[~ridge], nearest[~ridge], rtol=0, atol=1e-12)
+
+    # Bisector of the (0, 0) corner: both edges' normals, whichever ranked first
+    diagonal = np.arange(4, 14)
+    assert ridge[diagonal, diagonal].all()
+    assert np.allclose(raster.gradient[diagonal, diagonal], -np.sqrt(0.5), rtol=0, atol=1e-12)
+    rolled = PlotRaster(L_SHAPE[3:] + L_SHAPE[:3])
+    assert np.allclose(rolled.gradient, raster.gradient, rtol=0, atol=1e-12)
+
+def test_sample_interpolates_distance_and_gradient():
+    for raster in (PlotRaster(L_SHAPE), PlotRaster(TRIANGLE), PlotRaster.from_circle((10.0, 10.0), 8.0)):
+        exact = PlotRaster(raster.polygon, exact=True)
+        points = _sample_points(raster.polygon).reshape(40, 50, 2)
+        distance, gradient = raster.sample(points)
+        true_distance, true_gradient = exact.sample(points)
+        assert distance.shape == (40, 50) and gradient.shape == (40, 50, 2)
+        assert np.allclose(np.linalg.norm(gradient, axis=-1), 1.0)
+
+        # Near the boundary: within a cell of the true distance, and well beyond a
+        # cell the sign (inside/outside) is always right
+        near = np.abs(true_distance) < 2.0
+        assert np.abs(distance - true_distance)[near].max() < raster.resolution
+        assert (np.sign(distance) == np.sign(true_distance))[np.abs(true_distance) > raster.resolution].all()
+        # Along the edges the gradient is the outward normal
+        along = near & (np.sum(gradient * true_gradient, axis=-1) > np.cos(np.radians(10)))
+        assert along[near].mean() > 0.9
+
+    # Beyond the padded grid the distance keeps growing
+    raster = PlotRaster(L_SHAPE)
+    assert raster.sample(np.array([40.0, 4.0]))[0] > raster.sample(np.array([30.0, 4.0]))[0] > 9.0
+
+
+def test_circle_raster_traces_the_circle():
+    raster = PlotRaster.from_circle((10.0, 10.0), 8.0)
+    assert len(raster.polygon) == PlotRaster.CIRCLE_SEGMENTS
+    distance, gradient = raster.sample(np.array([[10.0, 13.0], [10.0, 19.0], [16.0, 10.0]]))
+    assert np.allclose(distance, [-5.0, 1.0, -2.0], atol=0.05)
+    assert np.allclose(gradient[1:], [[0.0, 1.0], [1.0, 0.0]], atol=0.05)
+
+
+def test_solver_results_match_with_and_without_raster():
+    rooms = [
+        {"id": "r1", "name": "Living", "type": "living"},
+        {"id": "r2", "name": "Kitchen", "type": "kitchen"},
+        {"id": "r3", "name": "Bedroom", "type": "bedroom"},
+        {"id": "r4", "name": "Bath", "type": "bathroom"},
+    ]
+
+    def run(exact):
+        request = SolverRequest(
+            rooms=rooms, plot_width=20.0, plot_length=18.0, plot_polygon=L_SHAPE,
+            optimization_level=1, seed=6, exact_geometry=exact
+        )
+        return solve_floor_plan(request)
+
+    raster, exact = run(False), run(True)
+    assert [r.model_dump() for r in raster.rooms] == [r.model_dump() for r in exact.rooms]
+    assert raster.score == exact.score
@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from backend.app.solvers import constraint_solver, graph_solver
+from backend.app.solvers.warm_start import WarmStart, within_radius
+
+
+ROOMS = [
+    {"id": "r1", "name": "Living", "type": "living"},
+    {"id": "r2", "name": "Kitchen", "type": "kitchen"},
+    {"id": "r3", "name": "Master", "type": "master_bedroom"},
+    {"id": "r4", "name": "Bedroom", "type": "bedroom"},
+    {"id": "r5", "name": "Bath", "type": "bathroom"},
+    {"id": "r6", "name": "Dining", "type": "dining"},
+    {"id": "r7", "name": "Pooja", "type": "pooja_room"},
+    {"id": "r8", "name": "Study", "type": "study"},
+]
+
+
+def test_within_radius_matches_brute_force():
+    rng = np.random.default_rng(0)
+    lo = rng.uniform(0, 50, (300, 2))
+    hi = lo + rng.uniform(1, 6, (300, 2))
+    seed_lo = rng.uniform(0, 50, (4, 2))
+    seed_hi = seed_lo + rng.uniform(1, 6, (4, 2))
+
+    gap = np.maximum(0.0, np.maximum(seed_lo[None] - hi[:, None], lo[:, None] - seed_hi[None]))
+    brute = (np.sqrt((gap ** 2).sum(axis=-1)) <= 3.0).any(axis=1)
+    assert brute.sum() > 4
+    assert within_radius(lo, hi, seed_lo, seed_hi, 3.0).tolist() == brute.tolist()
+
+
+def test_frozen_rooms_are_locked_or_far_from_the_change():
+    prior = [{"id": f"r{i}", "x": 10.0 * i, "y": 0.0, "width": 4.0, "height": 4.0} for i in range(5)]
+    rooms = [{"id": p["id"]} for p in prior[1:]] + [{"id": "new"}]
+    warm = WarmStart.from_request(rooms, prior, locked_room_ids=["r2"], changed_room_ids=["r2"], impact_radius=7.0)
+    ids = ["r1", "r2", "r3", "r4", "new"]
+    x = np.array([10.0, 20.0, 30.0, 40.0, 41.0])
+    size = np.full(5, 4.0)
+
+    # r0 was removed (r1 is near its old footprint), r2 is locked, r4 is near the new room
+    assert warm.frozen_rooms(ids, x, np.zeros(5), size, size) == {"r2"}
+    # A 6 m gap is out of reach of a 5 m radius
+    warm.impact_radius = 5.0
+    assert warm.frozen_rooms(ids, x, np.zeros(5), size, size) == {"r1", "r2", "r3"}
+    # Nothing changed: a plain warm start of every unlocked room
+    unchanged = WarmStart.from_request(rooms[:4], prior[1:], locked_room_ids=["r2"])
+    assert unchanged.frozen_rooms(ids[:4], x[:4], np.zeros(4), size[:4], size[:4]) == {"r2"}
+
+    with pytest.raises(ValueError):
+        WarmStart.from_request(rooms, prior, locked_room_ids=["new"])
+    with pytest.raises(ValueError):
+        WarmStart.from_request(rooms, [{"id": "r1", "x": 0.0}])
+    assert WarmStart.from_request(rooms, None) is None
+
+
+@pytest.mark.parametrize("module", [graph_solver, constraint_solver])
+def test_edit_re_solves_only_the_neighbourhood(module):
+    def request(**kwargs):
+        return module.SolverRequest(rooms=ROOMS, plot_width=40.0, plot_length=40.0, **kwargs)
+
+    prior = [room.model_dump() for room in module.solve_floor_plan(request(seed=1)).rooms]
+    dragged = next(p for p in prior if p["id"] == "r3")
+    dragged["x"] = min(dragged["x"] + 2.0, 40.0 - dragged["width"])
+    res = module.solve_floor_plan(request(seed=2, prior_layout=prior, locked_room_ids=["r3"],
+                                          changed_room_ids=["r3"], impact_radius=2.0))
+
+    # The dragged room stays where the user put it, rooms beyond the radius keep their geometry
+    lo = np.array([[p["x"], p["y"]] for p in prior])
+    hi = lo + np.array([[p["width"], p["height"]] for p in prior])
+    k = prior.index(dragged)
+    near = within_radius(lo, hi, lo[k:k + 1], hi[k:k + 1], 2.0)
+    assert near[k] and (~near).any()
+    after = {room.id: room for room in res.rooms}
+    assert set(after) == {r["id"] for r in ROOMS}
+    for p, free in zip(prior, near):
+        if p["id"] == "r3" or not free:
+            room = after[p["id"]]
+            assert (room.x, room.y, room.width, room.height) == (p["x"], p["y"], p["width"], p["height"])
@@ -0,0 +1,28 @@
+"""
+Wall-clock time budget shared by the solver loops.
+
+A Deadline is created once per request from ``deadline_ms`` and checked by
+every optimization loop. Checks are a single monotonic clock read, cheap
+enough to run every iteration. A Deadline built without a budget never
+expires. CLOCK_MONOTONIC is system-wide, so a pickled Deadline stays valid in
+process-pool workers.
+"""
+from typing import Optional
+import time
+
+
+class Deadline:
+    """Absolute monotonic-clock deadline (None = unbounded)"""
+
+    def __init__(self, deadline_ms: Optional[float] = None):
+        self.budget_ms = deadline_ms
+        self._end = time.monotonic() + deadline_ms / 1000.0 if deadline_ms is not None else None
+
+    def expired(self) -> bool:
+        return self._end is not None and time.monotonic() >= self._end
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None when unbounded"""
+        if self._end is None:
+            return None
+        return max(0.0, self._end - time.monotonic())